@@ -11,27 +11,36 @@ see http://diagrams.bitplan.com/render/txt/0xe1f1d160.txt
 import configparser
 import getpass
 import logging
+import multiprocessing
 import os
 import re
 import sys
-from collections import Counter
+import threading
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 from basemkit.yamlable import lod_storable
-from bs4 import UnicodeDammit
 from lodstorage.sql import SQLDB
 from lodstorage.storageconfig import StorageConfig, StoreMode
 from wikibot3rd.smw import SMWClient
 from wikibot3rd.wikiclient import WikiClient
-from wikibot3rd.wikipush import WikiPush
 from wikibot3rd.wikiuser import WikiUser
 
-from scan.entity import EntityManager
+from scan.encoding import TextFileDecoder
+from scan.entity import BatchStore, EntityManager
+from scan.fulltext import FullTextIndex
 from scan.logger import Logger
+from scan.ocrindex import OcrDirectoryIndex
 from scan.pdf import PDFExtractor
+from scan.smw_pager import SMWPager
+from scan.sqlpool import SQLConnectionPool
+from scan.textcache import TextCache
+from scan.textstore import LazyText, TextStore
+from scan.wiki_session import WikiSessionCache
 
 
 class Wiki(object):
@@ -39,6 +48,26 @@ class Wiki(object):
     Semantic Mediawiki access proxy
     """
 
+    # process wide cache of logged in sessions - see getSessions
+    sessions = None
+    sessionsLock = threading.Lock()
+
+    @classmethod
+    def getSessions(cls) -> WikiSessionCache:
+        """
+        get the process wide cache of logged in wiki sessions
+
+        Return:
+            WikiSessionCache: the session cache
+        """
+        with cls.sessionsLock:
+            if cls.sessions is None:
+                cls.sessions = WikiSessionCache(
+                    clientFactory=Wiki.login,
+                    maxIdle=DMSStorage.getSessionMaxIdle(),
+                )
+        return cls.sessions
+
     @staticmethod
     def getSMW(wikiId: str):
         """
@@ -50,8 +79,7 @@ class Wiki(object):
         Return:
             SMWClient: the SMWClient with the given id
         """
-        wikiClient = Wiki.get(wikiId)
-        smw = SMWClient(wikiClient.getSite())
+        smw = Wiki.getSessions().get(wikiId).getSMW()
         return smw
 
     @staticmethod
@@ -59,6 +87,20 @@ class Wiki(object):
         """
         get the Wiki Client with the given wikiId
 
+        Args:
+            wikiId: the wiki id of the client
+
+        Return:
+            WikiClient: the WikiClient with the given id
+        """
+        wikiClient = Wiki.getSessions().get(wikiId).wikiClient
+        return wikiClient
+
+    @staticmethod
+    def login(wikiId: str):
+        """
+        create a new Wiki Client with the given wikiId and login
+
         Args:
             wikiId: the wiki id of the client
 
@@ -118,6 +160,10 @@ class DMSStorage:
 
     profile = True
     withShowProgress = True
+    # the root directory of the .dms cache - None for the home directory
+    cacheRootDir = None
+    # the configured (cacheRootDir, TextCache, TextFileDecoder) - see getTextServices
+    textServices = None
 
     @classmethod
     def get_config(cls):
@@ -137,8 +183,7 @@ class DMSStorage:
             em.fromCache()
         else:
             if em.config.mode is StoreMode.SQL:
-                sqlDB = DMSStorage.getSqlDB()
-                em.initSQLDB(sqlDB)
+                DMSStorage.ensureTable(em, force=True)
 
     @staticmethod
     def getStorageConfig(debug: bool = False, mode="sql") -> StorageConfig:
@@ -147,20 +192,22 @@ class DMSStorage:
 
         Args:
             debug(bool): if True show debug information
-            mode(str): sql or json
+            mode(str): sql, json or binary - a JSON mode config for a binary LoD file cache
 
         Return:
             StorageConfig: the storage configuration to be used
         """
         if mode == "sql":
             config = StorageConfig.getSQL(debug=debug)
-        elif mode == "json":
+        elif mode == "json" or mode == "binary":
             config = StorageConfig.getJSON()
         elif mode == "jsonpickle":
             config = StorageConfig.getJsonPickle(debug=debug)
         else:
             raise Exception(f"invalid mode {mode}")
         config.cacheDirName = "dms"
+        if DMSStorage.cacheRootDir is not None:
+            config.cacheRootDir = DMSStorage.cacheRootDir
         cachedir = config.getCachePath()
         config.profile = DMSStorage.profile
         config.withShowProgress = DMSStorage.withShowProgress
@@ -180,16 +227,160 @@ class DMSStorage:
         scandir = config.get("dms", "scan_inbox")
         return scandir
 
+    @classmethod
+    def getCollectWorkers(cls) -> int:
+        """
+        get the number of folders to crawl concurrently when collecting an archive
+
+        Returns:
+            int: the configured collect_workers - default: 8
+        """
+        config = cls.get_config()
+        workers = config.getint("dms", "collect_workers", fallback=8)
+        return workers
+
+    @classmethod
+    def getSessionMaxIdle(cls) -> Optional[float]:
+        """
+        get the number of seconds after which an unused wiki session is evicted
+
+        Returns:
+            float: the configured session_max_idle - default: None for never
+        """
+        config = cls.get_config()
+        maxIdle = config.getfloat("dms", "session_max_idle", fallback=None)
+        return maxIdle
+
+    @classmethod
+    def getOcrWorkers(cls) -> int:
+        """
+        get the number of processes to extract OCR texts with when collecting an archive
+
+        Returns:
+            int: the configured ocr_workers - default: the number of CPUs
+        """
+        config = cls.get_config()
+        workers = config.getint("dms", "ocr_workers", fallback=os.cpu_count() or 1)
+        return workers
+
+    @classmethod
+    def getOcrChunkSize(cls) -> int:
+        """
+        get the number of documents handed to an OCR worker process at once
+
+        Returns:
+            int: the configured ocr_chunksize - default: 4
+        """
+        config = cls.get_config()
+        chunksize = config.getint("dms", "ocr_chunksize", fallback=4)
+        return chunksize
+
+    @classmethod
+    def getPdfWorkers(cls) -> int:
+        """
+        get the number of processes to extract the pages of a large PDF with
+
+        Returns:
+            int: the configured pdf_workers - default: the number of CPUs
+        """
+        config = cls.get_config()
+        workers = config.getint("dms", "pdf_workers", fallback=os.cpu_count() or 1)
+        return workers
+
+    @classmethod
+    def getTextServices(cls) -> tuple:
+        """
+        get the configured text cache and text file decoder - they are needed
+        per file and page so the config is only read again when the cacheRootDir changes
+
+        Returns:
+            tuple: (cacheRootDir, TextCache, TextFileDecoder)
+        """
+        textServices = cls.textServices
+        if textServices is None or textServices[0] != cls.cacheRootDir:
+            config = cls.get_config()
+            maxSizeMB = config.getint("dms", "text_cache_size_mb", fallback=1024)
+            textCache = None
+            if maxSizeMB > 0:
+                cacheDir = config.get("dms", "text_cache_dir", fallback=None)
+                if cacheDir is None:
+                    cacheDir = DMSStorage.getStorageConfig(mode="sql").getCachePath()
+                dbFile = os.path.join(os.path.expanduser(cacheDir), "textcache.db")
+                textCache = TextCache.getCache(dbFile, maxSize=maxSizeMB * 1024 * 1024)
+            normalize = config.getboolean(
+                "dms", "normalize_text_encoding", fallback=False
+            )
+            decoder = TextFileDecoder(textCache, normalize=normalize)
+            textServices = (cls.cacheRootDir, textCache, decoder)
+            cls.textServices = textServices
+        return textServices
+
+    @classmethod
+    def getTextCache(cls) -> Optional[TextCache]:
+        """
+        get the central cache of the extracted texts
+
+        Returns:
+            TextCache: the cache in the configured text_cache_dir - default: the
+            dms cache directory - None if text_cache_size_mb is set to 0
+        """
+        textCache = cls.getTextServices()[1]
+        return textCache
+
+    @classmethod
+    def getTextDecoder(cls) -> TextFileDecoder:
+        """
+        get the decoder for text files in legacy encodings
+
+        Returns:
+            TextFileDecoder: the decoder remembering the encodings in the text cache -
+            with normalize_text_encoding the UTF-8 texts of legacy files are cached as well
+        """
+        decoder = cls.getTextServices()[2]
+        return decoder
+
     @staticmethod
-    def getSqlDB():
+    def getPool() -> SQLConnectionPool:
         """
-        get the SQlite database connection
+        get the connection pool of the SQlite database
         """
         config = DMSStorage.getStorageConfig(mode="sql")
-        # https://stackoverflow.com/a/48234567/1497139
-        sqlDB = SQLDB(config.cacheFile, check_same_thread=False)
+        pool = SQLConnectionPool.getPool(config.cacheFile)
+        return pool
+
+    @staticmethod
+    def getSqlDB() -> SQLDB:
+        """
+        get the SQlite database connection of the current thread
+
+        the connection is pooled and must not be closed - see closeSqlDB
+        """
+        sqlDB = DMSStorage.getPool().getSQLDB()
         return sqlDB
 
+    @staticmethod
+    def closeSqlDB():
+        """
+        close all pooled SQLite database connections e.g. on shutdown
+        """
+        SQLConnectionPool.closeAll()
+
+    @staticmethod
+    def ensureTable(em: EntityManager, force: bool = False):
+        """
+        make sure the table of the given entity manager exists
+        so that records can be appended to it
+
+        Args:
+            em(EntityManager): the entity manager
+            force(bool): if True (re)create the table without checking
+        """
+        if force or not em.isCached():
+            with DMSStorage.getPool().writeLock:
+                sqlDB = DMSStorage.getSqlDB()
+                em.initSQLDB(sqlDB)
+                em.storeMeta(sqlDB, rowCount=0)
+
     @staticmethod
     def getDatetime(fullpath: str):
         """
@@ -279,7 +470,7 @@ class Document:
     types: str = ""  # e.g. "pdf,txt" (comma-separated file types available)
 
     # Content
-    ocrText: Optional[str] = None  # Extracted OCR text from document
+    ocrText: Optional[str] = None  # Extracted OCR text from document - see LazyText
 
     # Internal fields for string representation
     fields: list = field(
@@ -323,15 +514,44 @@ class Document:
             file(str): the file
             withOcr(bool): if true get the OCRText
         """
+        fullpath = f"{Folder.getFullpath(folderPath,local)}/{file}"
+        stat = os.stat(fullpath)
+        self.fromStat(folderPath, file, stat, local=local, withOcr=withOcr)
+
+    def fromDirEntry(self, folderPath, entry: os.DirEntry, local=False, withOcr=False):
+        """
+        initialize me from the given directory entry e.g. from os.scandir
+
+        Args:
+            folderPath(str): the directory
+            entry(os.DirEntry): the directory entry of the file
+            withOcr(bool): if true get the OCRText
+        """
+        self.fromStat(
+            folderPath, entry.name, entry.stat(), local=local, withOcr=withOcr
+        )
+
+    def fromStat(
+        self, folderPath, file, stat: os.stat_result, local=False, withOcr=False
+    ):
+        """
+        initialize me from the given stat result without any further file system access
+
+        Args:
+            folderPath(str): the directory
+            file(str): the file
+            stat(os.stat_result): the stat result of the file
+            withOcr(bool): if true get the OCRText
+        """
         self.folderPath = folderPath
         self.name = file
         self.fullpath = f"{Folder.getFullpath(self.folderPath,local)}/{file}"
-        self.size = os.path.getsize(self.fullpath)
-        self.lastModified = DMSStorage.getDatetime(self.fullpath)
+        self.size = stat.st_size
+        self.lastModified = datetime.fromtimestamp(stat.st_mtime)
         self.created = self.lastModified
-        self.timestampStr = DMSStorage.getTimeStr(self.fullpath)
-        self.fileName = Path(self.fullpath).name
-        self.basename = Path(self.fullpath).stem
+        self.timestampStr = self.lastModified.strftime("%Y-%m-%d %H:%M:%S")
+        self.fileName = os.path.basename(self.fullpath)
+        self.basename = os.path.splitext(self.fileName)[0]
         self.pageTitle = f"{self.basename}"
 
         self.categories = f"{datetime.now().year}"
@@ -348,12 +568,15 @@ class Document:
             delim = ","
         return text
 
-    def getPDFText(self) -> str:
+    def getPDFText(self, useCache: bool = True) -> str:
         """Gets text content from PDF, using cached text file if available.
 
         First checks for an existing .txt file with the same base name as the PDF.
         If found, returns its contents. Otherwise, extracts text from the PDF file.
 
+        Args:
+            useCache: If True, uses/creates a .txt cache file next to the PDF
+
         Returns:
             str: The text content of the PDF, or None if not a PDF file.
         """
@@ -361,12 +584,13 @@ class Document:
         if not self.fullpath.lower().endswith(".pdf"):
             return None
 
-        # Try to extract text using PDFExtractor with caching enabled
-        return PDFExtractor.getPDFText(self.fullpath, useCache=True)
+        # Try to extract text using PDFExtractor
+        return PDFExtractor.getPDFText(self.fullpath, useCache=useCache)
 
     def get_text_head(self, max_lines: int = 9) -> str:
         """
-        Get the first few lines of the document's text content.
+        Get the first few lines of the document's text content - if the text
+        is not loaded yet only its head is read.
 
         Args:
             max_lines: Maximum number of lines to return
@@ -374,35 +598,77 @@ class Document:
         Returns:
             String with the first few lines of text
         """
-        if not self.ocrText:
-            self.getOcrText()
-
         if self.ocrText:
-            lines = self.ocrText.split("\n")
-            return "\n".join(lines[:max_lines] if len(lines) >= max_lines else lines)
+            text = self.ocrText
+        else:
+            text = self.readTextHead(max_lines=max_lines)
+
+        if text:
+            return PDFExtractor.limitText(text, max_lines=max_lines)
 
         return ""
 
+    def readTextHeadFromFile(self, fileName: str, max_lines: int) -> str:
+        """
+        read the first lines of the given text file
+        """
+        text = DMSStorage.getTextDecoder().readHead(fileName, max_lines)
+        return text
+
+    def readTextHead(
+        self, max_lines: int = None, max_chars: int = None, max_pages: int = 1
+    ) -> str:
+        """
+        Reads the head of the document's text without extracting the full text.
+
+        The search order is the one of getOcrText: the text files in the base and
+        hidden .ocr directory, the cached text of an unchanged PDF from the central
+        text cache and finally the first pages of the PDF - nothing is cached.
+
+        Args:
+            max_lines: the maximum number of lines - None for no limit
+            max_chars: the maximum number of characters - None for no limit
+            max_pages: the maximum number of PDF pages to extract - None for no limit
+
+        Returns:
+            str: the head of the text or None if no text could be found
+        """
+        text = None
+        parent = str(Path(self.fullpath).parent.absolute())
+        ocrDir = os.path.join(parent, ".ocr")
+        ocrFileName = OcrDirectoryIndex.getTextFile(
+            parent, self.basename
+        ) or OcrDirectoryIndex.getTextFile(ocrDir, self.basename)
+        if ocrFileName is None:
+            pageFiles = OcrDirectoryIndex.getPageFiles(ocrDir, self.basename, 2)
+            ocrFileName = pageFiles[0] if pageFiles else None
+        if ocrFileName is not None:
+            text = (
+                self.readTextFromFile(ocrFileName)
+                if max_lines is None
+                else self.readTextHeadFromFile(ocrFileName, max_lines)
+            )
+        if text is None and self.fullpath.lower().endswith(".pdf"):
+            textCache = DMSStorage.getTextCache()
+            if textCache is not None and os.path.isfile(self.fullpath):
+                text = textCache.get(self.fullpath, onlyKnown=True)
+        if text is None and self.fullpath.lower().endswith(".pdf"):
+            text = PDFExtractor.getTextHead(
+                self.fullpath,
+                max_lines=max_lines,
+                max_chars=max_chars,
+                max_pages=max_pages,
+            )
+        if text is not None:
+            text = PDFExtractor.limitText(text, max_lines, max_chars)
+        return text
+
     def readTextFromFile(self, fileName: str) -> str:
         """
-        read text from the given fileName
+        read text from the given fileName - the encoding is detected once per file version
         """
-        try:
-            with open(fileName, "r") as textFile:
-                return textFile.read()
-        except UnicodeDecodeError as _ude:
-            # print(f"couldn't decode {fileName}")
-            with open(fileName, "rb") as file:
-                content = file.read()
-                suggestion = UnicodeDammit(content)
-                encoding = suggestion.original_encoding
-                if encoding is None:
-                    encoding = "utf-8"
-                try:
-                    text = content.decode(encoding)
-                except Exception as ex:
-                    raise (ex)
-                return text
+        text = DMSStorage.getTextDecoder().read(fileName)
+        return text
 
     def readMultiPageOcrText(self, ocrDirectory: str) -> str:
         """
@@ -414,26 +680,14 @@ class Document:
         Returns:
             Combined text from all pages, or None if no pages found
         """
-        page = 1
-        maxPages = 1000
-        combinedText = None
-
-        # Check if first page exists
-        pageFileName = f"{ocrDirectory}/{self.basename}_p{page:03d}.txt"
-        if os.path.isfile(pageFileName):
+        pageTexts = []
+        for pageFileName in OcrDirectoryIndex.getPageFiles(
+            str(ocrDirectory), self.basename
+        ):
             pageText = self.readTextFromFile(pageFileName)
             if pageText is not None:
-                combinedText = pageText
-
-                # Read remaining pages
-                for page in range(2, maxPages):
-                    pageFileName = f"{ocrDirectory}/{self.basename}_p{page:03d}.txt"
-                    if not os.path.isfile(pageFileName):
-                        break
-                    nextPage = self.readTextFromFile(pageFileName)
-                    if nextPage is not None:
-                        combinedText += nextPage
-
+                pageTexts.append(pageText)
+        combinedText = "".join(pageTexts) if pageTexts else None
         return combinedText
 
     def getOcrTextFromPath(self, ocrPath: str, withMultiPage: bool = False) -> str:
@@ -442,6 +696,7 @@ class Document:
 
         Checks for a single-page text file (basename.txt). If not found and
         `withMultiPage` is True, it attempts to read multi-page OCR text.
+        The text files are looked up in the cached index of the directory.
 
         Args:
             ocrPath: The directory path (str) to search for OCR text.
@@ -451,51 +706,128 @@ class Document:
             The OCR text string if found, otherwise None.
         """
         ocr_text = None
-        if os.path.isdir(ocrPath):
-            ocrFileName = f"{ocrPath}/{self.basename}.txt"
-            if os.path.isfile(ocrFileName):
-                ocr_text = self.readTextFromFile(ocrFileName)
-            elif withMultiPage:
-                ocr_text = self.readMultiPageOcrText(ocrPath)
+        ocrFileName = OcrDirectoryIndex.getTextFile(str(ocrPath), self.basename)
+        if ocrFileName is not None:
+            ocr_text = self.readTextFromFile(ocrFileName)
+        elif withMultiPage:
+            ocr_text = self.readMultiPageOcrText(ocrPath)
         return ocr_text
 
-    def getOcrText(self):
+    def readOcrText(self, useCache: bool = True) -> str:
         """
-        Retrieves the OCR text for the document following a specific search order.
+        Reads the OCR text for the document from the archive following a specific search order.
 
         The search priority is:
         1. Base directory (strict: only single-page OCR).
         2. Hidden .ocr directory (permissive: with multi-page fallback).
         3. Direct extraction from the source file (e.g., PDF).
 
+        Args:
+            useCache: If True, extracted PDF texts are cached as .txt files next to the PDF
+
         Returns:
             The retrieved OCR text string, or None if no text could be found.
         """
+        ocr_text = self.readSidecarText()
+        if ocr_text is None:
+            ocr_text = self.getPDFText(useCache=useCache)
+        return ocr_text
+
+    def readSidecarText(self) -> str:
+        """
+        Reads the OCR text for the document from the text files in the base
+        directory (single-page only) or the hidden .ocr directory (with multi-page fallback).
+
+        Returns:
+            The OCR text string of the text files, or None if there are none.
+        """
         parent = Path(self.fullpath).parent.absolute()
         ocr_text = self.getOcrTextFromPath(parent, withMultiPage=False)
         if ocr_text is None:
             ocr_text = self.getOcrTextFromPath(parent / ".ocr", withMultiPage=True)
-        if ocr_text is None:
-            ocr_text = self.getPDFText()
+        return ocr_text
+
+    def getOcrText(self):
+        """
+        Retrieves the OCR text for the document in the search order of readOcrText -
+        the texts extracted from PDFs are kept in the central text cache so that
+        only new or changed PDFs are extracted and no .txt files are written to the archive.
+
+        Returns:
+            The retrieved OCR text string, or None if no text could be found.
+        """
+        textCache = DMSStorage.getTextCache()
+        if textCache is None:
+            ocr_text = self.readOcrText()
+        else:
+            # the text files are read first so that added or edited ones take effect
+            ocr_text = self.readSidecarText()
+            if ocr_text is None:
+                ocr_text = textCache.getText(
+                    self.fullpath, lambda: self.getPDFText(useCache=False)
+                )
         self.ocrText = ocr_text
         return self.ocrText
 
+    @staticmethod
+    def ofPath(fullpath: str) -> "Document":
+        """
+        get a document for the file with the given path without reading the file
+
+        Args:
+            fullpath(str): the full path of the document's file
+
+        Returns:
+            Document: the document with its fullpath and basename set
+        """
+        doc = Document()
+        doc.fullpath = fullpath
+        doc.basename = os.path.splitext(os.path.basename(fullpath))[0]
+        return doc
+
+    @staticmethod
+    def extractOcrText(fullpath: str) -> str:
+        """
+        get the OCR text of the file with the given path
+
+        this is the picklable entry point for worker processes
+        which only need to receive the path
+
+        Args:
+            fullpath(str): the full path of the document's file
+
+        Returns:
+            str: the OCR text or None if it could not be extracted
+        """
+        doc = Document.ofPath(fullpath)
+        try:
+            ocrText = doc.getOcrText()
+        except Exception as ex:
+            print(f"error {fullpath}:{str(ex)}")
+            ocrText = None
+        return ocrText
+
     def uploadFile(self, wikiId):
         """
         call back
         """
         pageContent = self.getContent()
         ignoreExists = True
-        wikipush = WikiPush(fromWikiId=None, toWikiId=wikiId, login=True)
         description = f"scanned at {self.timestampStr}"
         msg = f"uploading {self.pageTitle} ({self.fileName}) to {wikiId} ... "
         files = [self.fullpath]
-        wikipush.upload(files, force=ignoreExists)
-        pageToBeEdited = wikipush.toWiki.getPage(self.pageTitle)
-        if (not pageToBeEdited.exists) or ignoreExists:
-            pageToBeEdited.edit(pageContent, description)
-            wikipush.log(msg + "✅")
-            pass
+
+        def upload(session):
+            # the logged in session is shared by all uploads to this wiki
+            wikipush = session.getWikiPush()
+            wikipush.upload(files, force=ignoreExists)
+            pageToBeEdited = wikipush.toWiki.getPage(self.pageTitle)
+            if (not pageToBeEdited.exists) or ignoreExists:
+                pageToBeEdited.edit(pageContent, description)
+                wikipush.log(msg + "✅")
+                pass
+
+        Wiki.getSessions().run(wikiId, upload)
 
     def getContent(self):
         """
@@ -534,6 +866,10 @@ class Document:
         return pageContent
 
 
+# the ocrText is kept in a separate compressed TextStore and loaded on access
+Document.ocrText = LazyText("ocrText")
+
+
 @lod_storable
 class Folder:
     """
@@ -648,13 +984,67 @@ class Folder:
         Return:
             list: the files with the given extension
         """
-        files = []
-        fullPath = Folder.getFullpath(self.path)
-        for file in os.listdir(fullPath):
-            if file.endswith(extension) and not file.startswith("._"):
-                files.append(file)
+        files = [entry.name for entry in self.getFileEntries(extension)]
         return files
 
+    @staticmethod
+    def isFileOfInterest(fileName: str, extension=".pdf") -> bool:
+        """
+        check whether the given file name has the given extension and is
+        not a macOS resource fork file
+
+        Args:
+            fileName(str): the name of the file
+            extension(str): the extension to search for
+
+        Return:
+            bool: True if the file is of interest
+        """
+        ofInterest = fileName.endswith(extension) and not fileName.startswith("._")
+        return ofInterest
+
+    def getFileEntries(self, extension=".pdf") -> list:
+        """
+        get the directory entries of all files with the given extension
+        with a single scandir
+
+        Args:
+            extension(str): the extension to search for
+
+        Return:
+            list: the os.DirEntry instances of the files with the given extension
+        """
+        fileEntries = []
+        fullPath = Folder.getFullpath(self.path)
+        with os.scandir(fullPath) as entries:
+            for entry in entries:
+                if Folder.isFileOfInterest(entry.name, extension):
+                    fileEntries.append(entry)
+        return fileEntries
+
+    def isUnchanged(self, knownFolders: dict) -> bool:
+        """
+        check whether I am unchanged compared to my record from a previous collect
+
+        the directory modification time changes when files are added, removed
+        or renamed - files modified in place are not detected
+
+        Args:
+            knownFolders(dict): folder records by path
+
+        Returns:
+            bool: True if lastModified and fileCount match the known record
+        """
+        unchanged = False
+        if knownFolders:
+            record = knownFolders.get(self.path)
+            if record is not None:
+                unchanged = (
+                    record.get("lastModified") == self.lastModified
+                    and record.get("fileCount") == self.fileCount
+                )
+        return unchanged
+
     def getFileDocuments(self):
         """
         get all documents for the OCRDocument files in this folder
@@ -662,26 +1052,34 @@ class Folder:
         Return:
             list: the list of documents
         """
-        files = self.getFiles()
-        documents = self.getDocuments(files)
+        fileEntries = self.getFileEntries()
+        documents = self.getDocuments(fileEntries)
         return documents
 
     def getDocuments(self, files, withOcr=False, progress_bar=None):
         """
         get the documents for this folder based on the files from my listdir
-        progress_bar(Progressbar): a progress bar to track progress
 
+        Args:
+            files(list): file names or os.DirEntry instances from scandir -
+                for directory entries no additional stat calls are needed
+            withOcr(bool): if true get the OCRText
+            progress_bar(Progressbar): a progress bar to track progress
         """
         documentList = []
         msg = f"getting {len(files)} documents for {self.path}"
         Logger.log(msg)
         for file in files:
             try:
-                if file.endswith(".pdf"):
+                fileName = file if isinstance(file, str) else file.name
+                if fileName.endswith(".pdf"):
                     doc = Document()
                     doc.archiveName = self.archiveName
-                    doc.url = f"http://{self.archive.server}{self.path}/{file}"
-                    doc.fromFile(self.path, file, withOcr=withOcr)
+                    doc.url = f"http://{self.archive.server}{self.path}/{fileName}"
+                    if isinstance(file, str):
+                        doc.fromFile(self.path, file, withOcr=withOcr)
+                    else:
+                        doc.fromDirEntry(self.path, file, withOcr=withOcr)
                     documentList.append(doc)
                     if progress_bar:
                         progress_bar.total += 1
@@ -730,14 +1128,200 @@ class DocumentManager(EntityManager):
             handleInvalidListTypes,
             filterInvalidListTypes,
             debug,
+            indexes=[["archiveName", "folderPath"]],
+            binaryCache=mode == "binary",
         )
+        self.fullTextIndex = None
+        self.textStore = None
+        if self.config.mode is StoreMode.SQL:
+            self.textStore = TextStore(self.getCacheFile())
+            self.lazyFields = ["ocrText"]
+            self.fullTextIndex = FullTextIndex(
+                self.getCacheFile(), textStore=self.textStore
+            )
 
     @staticmethod
-    def getInstance(mode="sql"):
+    def getInstance(mode="sql", load: bool = True, lazy: bool = False):
+        """
+        get a DocumentManager
+
+        Args:
+            mode(str): the store mode
+            load(bool): if False only make sure the table exists and leave
+                loading the documents to queries
+            lazy(bool): if True the documents are a LazyEntityList that
+                pages the rows on access
+        """
         dm = DocumentManager(mode=mode)
-        DMSStorage.fromCache(dm)
+        if load and not lazy:
+            DMSStorage.fromCache(dm)
+        else:
+            DMSStorage.ensureTable(dm)
+            if lazy:
+                dm.fromStoreLazy()
         return dm
 
+    def storeLoD(
+        self,
+        listOfDicts,
+        limit=10000000,
+        batchSize=250,
+        cacheFile=None,
+        append=False,
+        fixNone=True,
+        sampleRecordCount=1,
+        replace: bool = False,
+    ) -> str:
+        """
+        store the given documents - the texts go to the TextStore -
+        and keep the full text index in sync
+
+        see EntityManager.storeLoD for the arguments
+        """
+        rows = listOfDicts
+        urls = [record.get("url") for record in rows]
+        if self.fullTextIndex is not None and append:
+            # the entries of replaced documents are removed with their indexed values
+            self.fullTextIndex.delete(urls)
+        if self.textStore is not None:
+            texts = [(record.get("url"), record.get("ocrText")) for record in rows]
+            rows = [{**record, "ocrText": None} for record in rows]
+        cacheFile = super().storeLoD(
+            rows,
+            limit=limit,
+            batchSize=batchSize,
+            cacheFile=cacheFile,
+            append=append,
+            fixNone=fixNone,
+            sampleRecordCount=sampleRecordCount,
+            replace=replace,
+        )
+        if self.textStore is not None:
+            if not append:
+                # the texts that have not been loaded are None and stay stored
+                self.textStore.retain(url for url, _text in texts)
+            self.textStore.put(texts)
+        if self.fullTextIndex is not None:
+            if append:
+                self.fullTextIndex.add(urls)
+            else:
+                # the document table has been recreated
+                self.fullTextIndex.rebuild()
+        return cacheFile
+
+    def createEntity(self, record: dict) -> Document:
+        """
+        create a document whose ocrText is loaded from my text store on first access
+
+        Args:
+            record(dict): the stored record
+
+        Returns:
+            Document: the document
+        """
+        doc = super().createEntity(record)
+        if self.textStore is not None and doc.__dict__.get("ocrText") is None:
+            Document.ocrText.bind(doc, self.textStore)
+        return doc
+
+    def getLazyValues(self, keys: list) -> dict:
+        """
+        get the stored OCR texts for the given urls
+
+        Args:
+            keys(list): the urls of the documents
+
+        Returns:
+            dict: the ocrText by url
+        """
+        texts = self.textStore.getTexts(keys)
+        lazyValues = {url: {"ocrText": text} for url, text in texts.items()}
+        return lazyValues
+
+    def storeDeltaLoD(self, records: list, deleted: list, rowCountDelta: int) -> str:
+        """
+        store the given changed documents - their texts are
+        kept in the text store and the full text index
+
+        see EntityManager.storeDeltaLoD for the arguments
+        """
+        texts = [(record.get("url"), record.get("ocrText")) for record in records]
+        urls = [url for url, _text in texts]
+        self.fullTextIndex.delete(urls + list(deleted))
+        rows = [{**record, "ocrText": None} for record in records]
+        cacheFile = super().storeDeltaLoD(rows, deleted, rowCountDelta)
+        # texts that have not been loaded stay stored
+        self.textStore.put(texts)
+        self.textStore.delete(deleted)
+        self.fullTextIndex.add(urls)
+        return cacheFile
+
+    def search(self, query: str, limit: int = 20, offset: int = 0, **kwargs) -> list:
+        """
+        search the OCR text and page titles of the documents ordered by relevance
+
+        Args:
+            query(str): the search text
+            limit(int): the maximum number of results
+            offset(int): the number of results to skip
+            kwargs: further arguments for FullTextIndex.search
+
+        Returns:
+            list: the result records with highlighted title and snippet
+        """
+        results = self.fullTextIndex.search(query, limit=limit, offset=offset, **kwargs)
+        return results
+
+    def getDocumentStats(self, archiveName: str, folderPath: str) -> dict:
+        """
+        get the size and modification time of the stored documents of the given folder
+
+        Args:
+            archiveName(str): the name of the archive
+            folderPath(str): the path of the folder
+
+        Returns:
+            dict: the records with url, size and lastModified by url
+        """
+        records = self.queryLoD(
+            equals={"archiveName": archiveName, "folderPath": folderPath},
+            columns=["url", "size", "lastModified"],
+        )
+        statsByUrl = {record["url"]: record for record in records}
+        return statsByUrl
+
+    def deleteDocuments(self, urls: list):
+        """
+        delete the documents with the given urls
+
+        Args:
+            urls(list): the primary keys of the documents to delete
+        """
+        if urls:
+            if self.fullTextIndex is not None:
+                self.fullTextIndex.delete(urls)
+            with SQLConnectionPool.getPool(self.getCacheFile()).writer() as sqlDB:
+                cursor = sqlDB.c.executemany(
+                    "DELETE FROM document WHERE url=(?)", [(url,) for url in urls]
+                )
+                self.updateRowCount(sqlDB, -cursor.rowcount)
+            if self.textStore is not None:
+                self.textStore.delete(urls)
+
+    def deleteFolderDocuments(self, archiveName: str, folderPaths: list):
+        """
+        delete all documents of the given folders
+
+        Args:
+            archiveName(str): the name of the archive
+            folderPaths(list): the paths of the folders
+        """
+        if folderPaths:
+            urls = []
+            for folderPath in folderPaths:
+                urls.extend(self.getDocumentStats(archiveName, folderPath).keys())
+            self.deleteDocuments(urls)
+
 
 class FolderManager(EntityManager):
     """
@@ -768,27 +1352,71 @@ class FolderManager(EntityManager):
             handleInvalidListTypes,
             filterInvalidListTypes,
             debug,
+            indexes=[["archiveName", "path"]],
+            binaryCache=mode == "binary",
         )
 
     @staticmethod
-    def getInstance(mode="sql"):
+    def getInstance(mode="sql", load: bool = True, lazy: bool = False):
+        """
+        get a FolderManager
+
+        Args:
+            mode(str): the store mode
+            load(bool): if False only make sure the table exists and leave
+                loading the folders to queries
+            lazy(bool): if True the folders are a LazyEntityList that
+                pages the rows on access
+        """
         fm = FolderManager(mode=mode)
-        DMSStorage.fromCache(fm)
+        if load and not lazy:
+            DMSStorage.fromCache(fm)
+        else:
+            DMSStorage.ensureTable(fm)
+            if lazy:
+                fm.fromStoreLazy()
         return fm
 
     def getDocumentRecords(self, archiveName, folderPath):
         """
         get the document records
         """
-        sqlDB = SQLDB(self.getCacheFile())
-        sqlQuery = "SELECT * FROM document WHERE archiveName=(?) AND folderPath=(?)"
-        params = (
-            archiveName,
-            folderPath,
+        dm = DocumentManager(mode="sql")
+        dictList = dm.queryLoD(
+            equals={"archiveName": archiveName, "folderPath": folderPath}
         )
-        dictList = sqlDB.query(sqlQuery, params)
         return dictList
 
+    def getFolderRecords(self, archiveName: str) -> dict:
+        """
+        get the stored folder records of the given archive
+
+        Args:
+            archiveName(str): the name of the archive
+
+        Returns:
+            dict: the folder records by path - for duplicate rows the last one wins
+        """
+        records = self.queryLoD(equals={"archiveName": archiveName})
+        recordsByPath = {record["path"]: record for record in records}
+        return recordsByPath
+
+    def deleteFolders(self, archiveName: str, folderPaths: list):
+        """
+        delete the folder records for the given paths
+
+        Args:
+            archiveName(str): the name of the archive
+            folderPaths(list): the paths of the folders
+        """
+        if folderPaths:
+            with SQLConnectionPool.getPool(self.getCacheFile()).writer() as sqlDB:
+                cursor = sqlDB.c.executemany(
+                    "DELETE FROM folder WHERE archiveName=(?) AND path=(?)",
+                    [(archiveName, folderPath) for folderPath in folderPaths],
+                )
+                self.updateRowCount(sqlDB, -cursor.rowcount)
+
     def getFolder(self, archive, folderPath: str):
         """
         get the folder for the given archive and folderPath
@@ -797,14 +1425,8 @@ class FolderManager(EntityManager):
             archive: the  archive
             folderPath: the path of the folder
         """
-        sqlDB = SQLDB(self.getCacheFile())
-        sqlQuery = "SELECT * FROM folder WHERE archiveName=(?) AND path=(?)"
         archiveName = archive.name
-        params = (
-            archiveName,
-            folderPath,
-        )
-        records = sqlDB.query(sqlQuery, params)
+        records = self.queryLoD(equals={"archiveName": archiveName, "path": folderPath})
         folder = None
         if len(records) > 1:
             msg = f"{len(records)} folders found for {archiveName}:{folderPath} - there should be only one"
@@ -891,6 +1513,16 @@ class Archive:
         ]
         return samplesLOD
 
+    def isWiki(self) -> bool:
+        """
+        check whether this archive is pointing to a wiki
+
+        Returns:
+            bool: True if I have a wikiid
+        """
+        is_wiki = hasattr(self, "wikiid") and self.wikiid is not None
+        return is_wiki
+
     def normalizePageTitle(self, pageTitle):
         """
         normalize the given pageTitle
@@ -898,130 +1530,416 @@ class Archive:
         nPageTitle = pageTitle.replace(" ", "_")
         return nPageTitle
 
-    def getFoldersAndDocuments(self, withOcr=False, progress_bar=None):
+    def getFoldersAndDocuments(
+        self, withOcr=False, progress_bar=None, max_workers: int = 1
+    ):
         """
         get the folders and documents of this archive
 
         Args:
             withOcr(bool): whether to include OCR text
             progress_bar(Progressbar): a progress bar to track progress
+            max_workers(int): the number of folders to crawl concurrently
+                for filesystem archives - 1 means sequential
 
         Returns:
             dict: foldersByPath and documentList
         """
         foldersByPath = {}
         documentList = []
-        # this archive is pointing to a wiki
-        if hasattr(self, "wikiid") and self.wikiid is not None:
+        for folder, folderDocuments in self.iterFoldersAndDocuments(
+            withOcr=withOcr, progress_bar=progress_bar, max_workers=max_workers
+        ):
+            documentList.extend(folderDocuments)
+            if folder is not None:
+                foldersByPath[folder.path] = folder
+        return foldersByPath, documentList
+
+    def iterFoldersAndDocuments(
+        self,
+        withOcr=False,
+        progress_bar=None,
+        max_workers: int = 1,
+        ocr_workers: int = 1,
+        ocr_chunksize: int = 4,
+    ):
+        """
+        iterate over the folders of this archive together with their documents
+
+        Args:
+            withOcr(bool): whether to include OCR text
+            progress_bar(Progressbar): a progress bar to track progress
+            max_workers(int): the number of folders to crawl concurrently
+                for filesystem archives - 1 means sequential
+            ocr_workers(int): the number of processes to extract the OCR texts
+                with - 1 means in the crawling threads
+            ocr_chunksize(int): the number of documents handed to an OCR process at once
+
+        Yields:
+            tuple: (folder, documents) for each folder - for wiki archives
+            the documents are streamed with folder None ahead of their folders
+        """
+        if self.isWiki():
+            # this archive is pointing to a wiki
+            yield from self.iterWikiFoldersAndDocuments(progress_bar=progress_bar)
+        else:
+            # this archive is pointing to a folder
+            useOcrPool = withOcr and ocr_workers > 1
+            foldersAndDocuments = self.crawlFolders(
+                withOcr=withOcr and not useOcrPool, max_workers=max_workers
+            )
+            # a single pool for the whole crawl
+            ocrPool = (
+                OcrPool(max_workers=ocr_workers, chunksize=ocr_chunksize)
+                if useOcrPool
+                else None
+            )
+            try:
+                if ocrPool is not None:
+                    foldersAndDocuments = ocrPool.addOcrTexts(foldersAndDocuments)
+                for folder, folderDocuments in foldersAndDocuments:
+                    if progress_bar:
+                        steps = len(folderDocuments) + 1
+                        progress_bar.total += steps
+                        progress_bar.update_value(progress_bar.value + steps)
+                    yield folder, folderDocuments
+            finally:
+                if ocrPool is not None:
+                    ocrPool.close()
+
+    def iterWikiFoldersAndDocuments(
+        self,
+        progress_bar=None,
+        smw: SMWClient = None,
+        pageSize: int = 500,
+        max_workers: int = 4,
+    ):
+        """
+        iterate over the documents and folders of this wiki archive
+
+        the OCRDocument pages are fetched in pages of pageSize results with
+        max_workers concurrent requests - the folders are derived from the
+        first category of the documents and are only complete at the end
+
+        Args:
+            progress_bar(Progressbar): a progress bar to track progress
+            smw(SMWClient): the client to query - default: the one for my wikiid
+            pageSize(int): the number of results per ask request
+            max_workers(int): the maximum number of concurrent ask requests
+
+        Yields:
+            tuple: (None, documents) for each page of results
+            followed by (folder, []) for each folder
+        """
+        if smw is None:
             smw = Wiki.getSMW(self.wikiid)
-            for option in ["|format=count", ""]:
-                askQuery = """{{#ask: [[Category:OCRDocument]]
+        askQuery = """{{#ask: [[Category:OCRDocument]]
 | mainlabel=page
 | ?Category
 | ?Modification date=lastModified
 | ?Creation date=created
-|limit=1000
-%s
-}}""" % option
-                print(askQuery)
-                result = smw.query(askQuery)
-                baseUrl = f"{smw.site.scheme}://{smw.site.host}{smw.site.path}index.php"
-                if option == "":
-                    folderCounter = Counter()
-                    folderCreated = {}
-                    folderLastModified = {}
-                    for record in result.values():
-                        page = record["page"]
-                        if "Kategorie" in record:
-                            catname = "Kategorie"
-                            categories = record["Kategorie"]
-                        else:
-                            catname = "Category"
-                            categories = record["Category"]
-                        doc = Document()
-                        doc.archiveName = self.name
-                        if isinstance(categories, list):
-                            firstCategory = categories[0]
-                        else:
-                            firstCategory = categories
-                        doc.folderPath = firstCategory.replace(f"{catname}:", "")
-                        # print(f"{firstCategory}->{doc.folderPath}")
-                        doc.lastModified = record["lastModified"]
-                        doc.created = record["created"]
-                        folderCounter[doc.folderPath] += 1
-                        if doc.created:
-                            if doc.folderPath in folderCreated:
-                                folderCreated[doc.folderPath] = min(
-                                    doc.created, folderCreated[doc.folderPath]
-                                )
-                            else:
-                                folderCreated[doc.folderPath] = doc.created
-                        if doc.lastModified:
-                            if doc.folderPath in folderLastModified:
-                                folderLastModified[doc.folderPath] = max(
-                                    doc.lastModified, folderLastModified[doc.folderPath]
-                                )
-                            else:
-                                folderLastModified[doc.folderPath] = doc.lastModified
-
-                        doc.name = page
-                        doc.url = f"{baseUrl}/{self.normalizePageTitle(page)}"
-                        documentList.append(doc)
-                        if progress_bar:
-                            progress_bar.total += 1
-                            progress_bar.update_value(progress_bar.value + 1)
-
-                    # collect folders
-                    for folderName, count in folderCounter.most_common():
-                        folder = Folder()
-                        folder.archiveName = self.name
-                        folder.name = folderName
-                        folder.path = folderName
-                        if folderName in folderLastModified:
-                            folder.lastModified = folderLastModified[folderName]
-                        if folderName in folderCreated:
-                            folder.created = folderCreated[folderName]
-                        folder.url = f"{baseUrl}/Category:{folderName}"
-                        folder.fileCount = count
-                        foldersByPath[folderName] = folder
-                        if progress_bar:
-                            progress_bar.total += 1
-                            progress_bar.update_value(progress_bar.value + 1)
-                        pass
-        else:
-            # this archive is pointing to a folder
-            pattern = rf"http://{self.server}"
-            folderPath = re.sub(pattern, "", self.url)
-            basePath = Folder.getFullpath(folderPath)
-            for root, dirs, files in os.walk(basePath):
-                relbase = Folder.getRelpath(root)
-                # loop over all directories
-                for dirname in dirs:
-                    if not dirname.startswith("."):
-                        folder = Folder()
-                        folder.archive = self
-                        fullpath = os.path.join(root, dirname)
-                        folder.path = os.path.join(relbase, dirname)
-                        folder.archiveName = self.name
-                        folder.url = f"http://{self.server}{folder.path}"
-                        folder.name = dirname
-                        # files in folder ...
-                        pdfFiles = folder.getFiles()
-                        folder.fileCount = len(pdfFiles)
-                        folder.lastModified = DMSStorage.getDatetime(fullpath)
-                        folder.created = folder.lastModified
-                        folderDocuments = folder.getDocuments(
-                            pdfFiles, withOcr=withOcr, progress_bar=progress_bar
+}}"""
+        baseUrl = f"{smw.site.scheme}://{smw.site.host}{smw.site.path}index.php"
+        folderCounter = Counter()
+        folderCreated = {}
+        folderLastModified = {}
+        pager = SMWPager(smw, pageSize=pageSize, max_workers=max_workers)
+        for rawResult in pager.iterPages(askQuery):
+            documents = []
+            for record in smw.deserialize(rawResult).values():
+                doc = self.getWikiDocument(record, baseUrl)
+                folderCounter[doc.folderPath] += 1
+                if doc.created:
+                    if doc.folderPath in folderCreated:
+                        folderCreated[doc.folderPath] = min(
+                            doc.created, folderCreated[doc.folderPath]
+                        )
+                    else:
+                        folderCreated[doc.folderPath] = doc.created
+                if doc.lastModified:
+                    if doc.folderPath in folderLastModified:
+                        folderLastModified[doc.folderPath] = max(
+                            doc.lastModified, folderLastModified[doc.folderPath]
                         )
-                        # add the results
-                        documentList.extend(folderDocuments)
-                        foldersByPath[folder.path] = folder
-                        if progress_bar:
-                            progress_bar.total += 1
-                            progress_bar.update_value(progress_bar.value + 1)
+                    else:
+                        folderLastModified[doc.folderPath] = doc.lastModified
+                documents.append(doc)
+                if progress_bar:
+                    progress_bar.total += 1
+                    progress_bar.update_value(progress_bar.value + 1)
+            yield None, documents
+        # collect folders
+        for folderName, count in folderCounter.most_common():
+            folder = Folder()
+            folder.archiveName = self.name
+            folder.name = folderName
+            folder.path = folderName
+            if folderName in folderLastModified:
+                folder.lastModified = folderLastModified[folderName]
+            if folderName in folderCreated:
+                folder.created = folderCreated[folderName]
+            folder.url = f"{baseUrl}/Category:{folderName}"
+            folder.fileCount = count
+            if progress_bar:
+                progress_bar.total += 1
+                progress_bar.update_value(progress_bar.value + 1)
+            yield folder, []
+
+    def getWikiDocument(self, record: dict, baseUrl: str) -> "Document":
+        """
+        get the document for the given OCRDocument query record
+
+        Args:
+            record(dict): the deserialized ask query record
+            baseUrl(str): the base url of the wiki's index.php
+
+        Returns:
+            Document: the document
+        """
+        page = record["page"]
+        if "Kategorie" in record:
+            catname = "Kategorie"
+            categories = record["Kategorie"]
+        else:
+            catname = "Category"
+            categories = record["Category"]
+        doc = Document()
+        doc.archiveName = self.name
+        if isinstance(categories, list):
+            firstCategory = categories[0]
+        else:
+            firstCategory = categories
+        doc.folderPath = firstCategory.replace(f"{catname}:", "")
+        doc.lastModified = record["lastModified"]
+        doc.created = record["created"]
+        doc.name = page
+        doc.url = f"{baseUrl}/{self.normalizePageTitle(page)}"
+        return doc
+
+    def getBasePath(self) -> str:
+        """
+        get the base path of this filesystem archive as accessible on my platform
+
+        Returns:
+            str: the full path of the archive's root directory
+        """
+        pattern = rf"http://{self.server}"
+        folderPath = re.sub(pattern, "", self.url)
+        basePath = Folder.getFullpath(folderPath)
+        return basePath
+
+    def crawlDirectory(
+        self,
+        fullpath: str,
+        withFolder: bool = True,
+        withOcr=False,
+        knownFolders: dict = None,
+    ):
+        """
+        crawl a single directory of this filesystem archive
+
+        Args:
+            fullpath(str): the full path of the directory to crawl
+            withFolder(bool): if True create the folder and its documents
+                (False for the archive's root directory)
+            withOcr(bool): whether to include OCR text
+            knownFolders(dict): folder records by path from a previous collect -
+                a folder with unchanged lastModified and fileCount is not re-enumerated
+
+        Returns:
+            tuple: (folder, documents, subdirs) with the sorted full paths
+            of the non hidden subdirectories - documents is None for an unchanged folder
+        """
+        subdirs = []
+        fileEntries = []
+        # a single scandir gives the subdirectories and the stat information of the files
+        with os.scandir(fullpath) as entries:
+            for entry in entries:
+                # symbolic links to directories are not followed - like os.walk
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith("."):
+                        subdirs.append(entry.path)
+                elif entry.is_dir():
+                    continue
+                elif Folder.isFileOfInterest(entry.name):
+                    fileEntries.append(entry)
+        subdirs.sort()
+        fileEntries.sort(key=lambda entry: entry.name)
+        folder = None
+        documents = []
+        if withFolder:
+            folder = Folder()
+            folder.archive = self
+            folder.path = Folder.getRelpath(fullpath)
+            folder.archiveName = self.name
+            folder.url = f"http://{self.server}{folder.path}"
+            folder.name = os.path.basename(fullpath)
+            # files in folder ...
+            folder.fileCount = len(fileEntries)
+            folder.lastModified = DMSStorage.getDatetime(fullpath)
+            folder.created = folder.lastModified
+            if folder.isUnchanged(knownFolders):
+                documents = None
+            else:
+                documents = folder.getDocuments(fileEntries, withOcr=withOcr)
+        return folder, documents, subdirs
+
+    def crawlFolders(
+        self, withOcr=False, max_workers: int = 1, knownFolders: dict = None
+    ):
+        """
+        crawl the folders of this filesystem archive with a bounded
+        thread pool - the directories of each level of the tree are
+        crawled concurrently
+
+        Args:
+            withOcr(bool): whether to include OCR text
+            max_workers(int): the maximum number of directories to crawl concurrently
+            knownFolders(dict): folder records by path from a previous collect
+
+        Yields:
+            tuple: (folder, documents) in deterministic order -
+            level by level and sorted by path within each level -
+            documents is None for folders that are unchanged according to knownFolders
+        """
+        basePath = self.getBasePath()
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            _folder, _documents, level = self.crawlDirectory(basePath, withFolder=False)
+            while level:
+                nextLevel = []
+                results = executor.map(
+                    lambda path: self.crawlDirectory(
+                        path, withOcr=withOcr, knownFolders=knownFolders
+                    ),
+                    level,
+                )
+                for folder, documents, subdirs in results:
+                    yield folder, documents
+                    nextLevel.extend(subdirs)
+                level = nextLevel
+
+
+class OcrPool:
+    """
+    process pool stage extracting the OCR texts of crawled documents
+    on all cores while the crawl is still running
+
+    the worker processes are spawned since forking the crawling threads
+    and their SQLite connections might deadlock - the pool is started on
+    first use and kept until it is closed
+    """
+
+    def __init__(self, max_workers: int = None, chunksize: int = 4):
+        """
+        constructor
+
+        Args:
+            max_workers(int): the number of worker processes - None for the number of CPUs
+            chunksize(int): the number of documents handed to a worker at once
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunksize = max(1, chunksize)
+        # the number of documents to keep in flight
+        self.window = self.max_workers * self.chunksize * 4
+        self.executor = None
+
+    def __enter__(self) -> "OcrPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def initWorker(cacheRootDir: str):
+        """
+        initialize a spawned worker process with the cache root directory of its parent
+        """
+        DMSStorage.cacheRootDir = cacheRootDir
+
+    def getExecutor(self) -> ProcessPoolExecutor:
+        """
+        get my process pool - it is started on first use
+        """
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=OcrPool.initWorker,
+                initargs=(DMSStorage.cacheRootDir,),
+            )
+        return self.executor
+
+    def close(self):
+        """
+        shut down my worker processes
+        """
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def addOcrTexts(self, foldersAndDocuments):
+        """
+        add the OCR texts to the documents of the given folders
+
+        Args:
+            foldersAndDocuments(Iterable): (folder, documents) tuples
+                documents may be None for unchanged folders
+
+        Yields:
+            tuple: (folder, documents) in the original order with the ocrText
+            of the documents set
+        """
+        pending = deque()
+        inFlight = 0
+        executor = self.getExecutor()
+        for folder, documents in foldersAndDocuments:
+            texts = None
+            if documents:
+                texts = executor.map(
+                    Document.extractOcrText,
+                    [doc.fullpath for doc in documents],
+                    chunksize=self.chunksize,
+                )
+                inFlight += len(documents)
+            pending.append((folder, documents, texts))
+            while pending and inFlight >= self.window:
+                inFlight -= self.completeFolder(pending)
+                yield pending.popleft()[:2]
+        while pending:
+            self.completeFolder(pending)
+            yield pending.popleft()[:2]
 
+    def completeFolder(self, pending: deque) -> int:
+        """
+        wait for the OCR texts of the first pending folder
+
+        Args:
+            pending(deque): (folder, documents, texts) tuples
+
+        Returns:
+            int: the number of completed documents
+        """
+        _folder, documents, texts = pending[0]
+        count = 0
+        if texts is not None:
+            for doc, ocrText in zip(documents, texts):
+                doc.ocrText = ocrText
+                count += 1
+        return count
+
+    def addOcrTextsToDocuments(self, documents: list) -> list:
+        """
+        add the OCR texts to the given documents
+
+        Args:
+            documents(list): the documents
+
+        Returns:
+            list: the documents with their ocrText set
+        """
+        for _folder, _documents in self.addOcrTexts([(None, documents)]):
             pass
-        return foldersByPath, documentList
+        return documents
 
 
 class ArchiveManager(EntityManager):
@@ -1053,6 +1971,7 @@ class ArchiveManager(EntityManager):
             handleInvalidListTypes,
             filterInvalidListTypes,
             debug,
+            binaryCache=mode == "binary",
         )
 
     @staticmethod
@@ -1082,37 +2001,192 @@ class ArchiveManager(EntityManager):
 
     @staticmethod
     def addFilesAndFoldersForArchive(
-        archive=None, withOcr=False, progress_bar=None, store=False, debug=True
+        archive=None,
+        withOcr=False,
+        progress_bar=None,
+        store=False,
+        debug=True,
+        max_workers: int = 1,
+        incremental: bool = False,
+        batchSize: int = 1000,
+        ocr_workers: int = 1,
+        ocr_chunksize: int = 4,
     ):
         """
         add Files and folder for the given Archive
 
+        when storing, the folders and documents are streamed to the storage in
+        batches of batchSize while the archive is still being walked
+
         Args:
             archive(Archive): the archive to add files and folder for
             store(bool): True if the result should be stored in the storage
             progress_bar(Progressbar): A Progressbar instance for tracking progress
             debug(bool): True if debugging messages should be displayed
+            max_workers(int): the number of folders to crawl concurrently
+            incremental(bool): if True only re-enumerate and store the folders
+                of a filesystem archive that changed since the last collect
+            batchSize(int): the number of documents per stored batch
+            ocr_workers(int): the number of processes to extract the OCR texts with
+            ocr_chunksize(int): the number of documents handed to an OCR process at once
+
+        Returns:
+            Counter: the number of folders and documents found
         """
+        stats = Counter()
         if archive is None:
-            return
-        folders = []
+            return stats
+        if incremental and store and not archive.isWiki():
+            stats = ArchiveManager.collectIncremental(
+                archive,
+                withOcr=withOcr,
+                progress_bar=progress_bar,
+                debug=debug,
+                max_workers=max_workers,
+                ocr_workers=ocr_workers,
+                ocr_chunksize=ocr_chunksize,
+            )
+            return stats
         msg = f"getting folders for {archive.name}"
         if debug:
             print(msg)
-        afoldersByPath, documentList = archive.getFoldersAndDocuments(
-            withOcr=withOcr, progress_bar=progress_bar
+        foldersAndDocuments = archive.iterFoldersAndDocuments(
+            withOcr=withOcr,
+            progress_bar=progress_bar,
+            max_workers=max_workers,
+            ocr_workers=ocr_workers,
+            ocr_chunksize=ocr_chunksize,
         )
-        folderCount = len(afoldersByPath)
-        msg = f"found {folderCount} folders in {archive.name}"
-        folders.extend(afoldersByPath.values())
-        if debug:
-            print(msg)
         if store:
-            if len(folders) > 0:
-                fms = FolderManager(mode="sql")
-                fms.folders = folders
-                fms.store(append=True, replace=True)
-            if len(documentList) > 0:
-                dms = DocumentManager(mode="sql")
-                dms.documents = documentList
-                dms.store(append=True, replace=True)
+            fms = FolderManager(mode="sql")
+            dms = DocumentManager(mode="sql")
+            for em in [fms, dms]:
+                DMSStorage.ensureTable(em)
+            # re-collected folders replace their former rows
+            folderStore = BatchStore(
+                fms,
+                batchSize=batchSize,
+                beforeFlush=lambda folders: fms.deleteFolders(
+                    archive.name, [folder.path for folder in folders]
+                ),
+            )
+            docStore = BatchStore(dms, batchSize=batchSize)
+            with folderStore, docStore:
+                for folder, documents in foldersAndDocuments:
+                    docStore.addAll(documents)
+                    stats["documents"] += len(documents)
+                    if folder is not None:
+                        folderStore.add(folder)
+                        stats["folders"] += 1
+            stats["batches"] = folderStore.batchCount + docStore.batchCount
+        else:
+            for folder, documents in foldersAndDocuments:
+                stats["documents"] += len(documents)
+                if folder is not None:
+                    stats["folders"] += 1
+        if debug:
+            print(
+                f"found {stats['folders']} folders with {stats['documents']} documents in {archive.name}"
+            )
+        return stats
+
+    @staticmethod
+    def collectIncremental(
+        archive,
+        withOcr=False,
+        progress_bar=None,
+        debug=True,
+        max_workers: int = 1,
+        ocr_workers: int = 1,
+        ocr_chunksize: int = 4,
+    ) -> Counter:
+        """
+        incrementally collect the given filesystem archive
+
+        folders whose modification time and file count match the stored
+        folder record are skipped - for changed folders only new or modified
+        documents are upserted and vanished documents are deleted
+
+        Args:
+            archive(Archive): the archive to collect
+            withOcr(bool): whether to include OCR text
+            progress_bar(Progressbar): A Progressbar instance for tracking progress
+            debug(bool): True if debugging messages should be displayed
+            max_workers(int): the number of folders to crawl concurrently
+                and of threads to extract the OCR texts with if ocr_workers is 1
+            ocr_workers(int): the number of processes to extract the OCR texts
+                of the upserted documents with
+            ocr_chunksize(int): the number of documents handed to an OCR process at once
+
+        Returns:
+            Counter: statistics of the changes
+        """
+        fms = FolderManager(mode="sql")
+        dms = DocumentManager(mode="sql")
+        for em in [fms, dms]:
+            DMSStorage.ensureTable(em)
+        knownFolders = fms.getFolderRecords(archive.name)
+        stats = Counter()
+        changedFolders = []
+        upsertDocuments = []
+        deletedUrls = []
+        crawledPaths = set()
+        # only the new and modified documents need their OCR text
+        for folder, documents in archive.crawlFolders(
+            withOcr=False,
+            max_workers=max_workers,
+            knownFolders=knownFolders,
+        ):
+            crawledPaths.add(folder.path)
+            if documents is None:
+                stats["unchanged folders"] += 1
+            else:
+                stats["changed folders"] += 1
+                changedFolders.append(folder)
+                statsByUrl = dms.getDocumentStats(archive.name, folder.path)
+                for doc in documents:
+                    record = statsByUrl.pop(doc.url, None)
+                    if (
+                        record is None
+                        or record["size"] != doc.size
+                        or record["lastModified"] != doc.lastModified
+                    ):
+                        upsertDocuments.append(doc)
+                deletedUrls.extend(statsByUrl.keys())
+            if progress_bar:
+                progress_bar.total += 1
+                progress_bar.update_value(progress_bar.value + 1)
+        removedPaths = [path for path in knownFolders if path not in crawledPaths]
+        stats["removed folders"] = len(removedPaths)
+        stats["upserted documents"] = len(upsertDocuments)
+        stats["deleted documents"] = len(deletedUrls)
+        # replace the folder rows of changed and removed folders
+        fms.deleteFolders(
+            archive.name, [folder.path for folder in changedFolders] + removedPaths
+        )
+        if changedFolders:
+            fms.folders = changedFolders
+            fms.store(append=True, replace=True)
+        dms.deleteFolderDocuments(archive.name, removedPaths)
+        dms.deleteDocuments(deletedUrls)
+        if upsertDocuments:
+            if withOcr and ocr_workers > 1:
+                with OcrPool(
+                    max_workers=ocr_workers, chunksize=ocr_chunksize
+                ) as ocrPool:
+                    ocrPool.addOcrTextsToDocuments(upsertDocuments)
+            elif withOcr:
+                with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                    for doc, ocrText in zip(
+                        upsertDocuments,
+                        executor.map(
+                            Document.extractOcrText,
+                            [doc.fullpath for doc in upsertDocuments],
+                        ),
+                    ):
+                        doc.ocrText = ocrText
+            dms.documents = upsertDocuments
+            dms.store(append=True, replace=True)
+        if debug:
+            print(f"incremental collect of {archive.name}: {dict(stats)}")
+        return stats
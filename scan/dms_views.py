@@ -10,7 +10,7 @@ from ngwidgets.progress import NiceguiProgressbar
 from ngwidgets.widgets import Link
 from nicegui import run, ui
 
-from scan.dms import Archive
+from scan.dms import Archive, DMSStorage
 
 
 # from ngwidgets.lod_grid import ListOfDictsGrid
@@ -65,6 +65,18 @@ class ArchiveView(EntityView):
             .tooltip("Start collecting folders and files for this archive")
             .on("click", handler=self.on_collect)
         )
+        self.incremental = True
+        self.incremental_checkbox = (
+            ui.checkbox("incremental")
+            .bind_value(self, "incremental")
+            .tooltip("only collect folders that changed since the last collect")
+        )
+        self.withOcr = False
+        self.ocr_checkbox = (
+            ui.checkbox("OCR")
+            .bind_value(self, "withOcr")
+            .tooltip("extract the OCR text of the documents on all cores")
+        )
 
     async def on_collect(self, _event):
         """
@@ -79,15 +91,18 @@ class ArchiveView(EntityView):
         """
         Perform the actual collection process.
         """
-        # Prepare managers
-        self.solution.webserver.fm.getInstance()
-        self.solution.webserver.dm.getInstance()
-
         # Start the scanning process
         with self.progress_row:
             ui.notify(f"collecting files and folders for {self.archive.name}")
             self.am.addFilesAndFoldersForArchive(
-                self.archive, progress_bar=self.progress_bar, store=True
+                self.archive,
+                progress_bar=self.progress_bar,
+                store=True,
+                max_workers=DMSStorage.getCollectWorkers(),
+                incremental=self.incremental,
+                withOcr=self.withOcr,
+                ocr_workers=DMSStorage.getOcrWorkers(),
+                ocr_chunksize=DMSStorage.getOcrChunkSize(),
             )
 
             ui.notify(f"Collection completed for archive: {self.archive.name}")
@@ -0,0 +1,179 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import codecs
+import io
+import os
+import threading
+from itertools import islice
+from typing import Optional
+
+from bs4 import UnicodeDammit
+
+from scan.textcache import TextCache
+
+
+class TextFileDecoder:
+    """
+    reader of text files in unknown encodings e.g. OCR sidecar files of legacy scanners
+
+    the encoding is detected from a bounded prefix of the file and remembered
+    per (path, size, mtime) in memory and in the central text cache
+    so that repeated reads of legacy files decode in a single pass
+    """
+
+    # the number of bytes to detect the encoding from
+    PREFIX_SIZE = 64 * 1024
+    UTF8_ENCODINGS = {"utf-8", "utf_8", "utf8", "ascii"}
+    # the encodings to try before guessing - the one of the legacy scanners
+    LEGACY_ENCODINGS = ["windows-1252"]
+
+    # the detected encodings by (path, size, mtime)
+    encodings = {}
+    lock = threading.Lock()
+
+    def __init__(self, textCache: Optional[TextCache] = None, normalize: bool = False):
+        """
+        constructor
+
+        Args:
+            textCache(TextCache): the central text cache to persist the encodings in
+            normalize(bool): if True keep the UTF-8 text of legacy files in the text cache
+        """
+        self.textCache = textCache
+        self.normalize = normalize and textCache is not None
+
+    @classmethod
+    def detectEncoding(cls, prefix: bytes, final: bool = False) -> str:
+        """
+        detect the encoding of a text from the given prefix
+
+        Args:
+            prefix(bytes): the first bytes of the text
+            final(bool): True if the prefix is the complete text
+
+        Returns:
+            str: the name of the encoding
+        """
+        if prefix.startswith(codecs.BOM_UTF8):
+            return "utf-8-sig"
+        try:
+            # an incremental decoder accepts a multibyte sequence cut off by the prefix
+            codecs.getincrementaldecoder("utf-8")().decode(prefix, final)
+            encoding = "utf-8"
+        except UnicodeDecodeError:
+            encoding = cls.guessEncoding(prefix)
+        return encoding
+
+    @classmethod
+    def guessEncoding(cls, content: bytes) -> str:
+        """
+        guess the encoding of the given content that is not UTF-8
+        """
+        dammit = UnicodeDammit(content, user_encodings=cls.LEGACY_ENCODINGS)
+        encoding = dammit.original_encoding or "utf-8"
+        return encoding
+
+    @staticmethod
+    def decode(content: bytes, encoding: str) -> str:
+        """
+        decode the given content with universal newlines like a text mode read
+        """
+        text = content.decode(encoding).replace("\r\n", "\n").replace("\r", "\n")
+        return text
+
+    def isUTF8(self, encoding: str) -> bool:
+        return encoding.lower() in TextFileDecoder.UTF8_ENCODINGS
+
+    def getKnownEncoding(self, fileName: str, stat: os.stat_result) -> Optional[str]:
+        """
+        get the remembered encoding of the given file
+        """
+        key = (fileName, stat.st_size, stat.st_mtime_ns)
+        with TextFileDecoder.lock:
+            encoding = TextFileDecoder.encodings.get(key)
+        if encoding is None and self.textCache is not None:
+            encoding = self.textCache.getEncoding(fileName, stat)
+            if encoding is not None:
+                with TextFileDecoder.lock:
+                    TextFileDecoder.encodings[key] = encoding
+        return encoding
+
+    def rememberEncoding(self, fileName: str, stat: os.stat_result, encoding: str):
+        """
+        remember the detected encoding of the given file - UTF-8 is
+        not remembered since it is detected in a single pass anyway
+        """
+        if self.isUTF8(encoding):
+            return
+        with TextFileDecoder.lock:
+            TextFileDecoder.encodings[(fileName, stat.st_size, stat.st_mtime_ns)] = (
+                encoding
+            )
+        if self.textCache is not None:
+            self.textCache.putEncoding(fileName, stat, encoding)
+
+    def read(self, fileName: str) -> str:
+        """
+        read the text of the given file
+
+        Args:
+            fileName(str): the path of the file
+
+        Returns:
+            str: the decoded text
+        """
+        if self.normalize:
+            text = self.textCache.get(fileName, onlyKnown=True)
+            if text is not None:
+                return text
+        stat = os.stat(fileName)
+        encoding = self.getKnownEncoding(fileName, stat)
+        known = encoding is not None
+        with open(fileName, "rb") as textFile:
+            content = textFile.read()
+        if not known:
+            encoding = self.detectEncoding(
+                content[: TextFileDecoder.PREFIX_SIZE],
+                final=len(content) <= TextFileDecoder.PREFIX_SIZE,
+            )
+        try:
+            text = self.decode(content, encoding)
+        except (UnicodeDecodeError, LookupError):
+            # the prefix was not representative - detect from the full content
+            known = False
+            encoding = self.guessEncoding(content)
+            text = self.decode(content, encoding)
+        if not known:
+            self.rememberEncoding(fileName, stat, encoding)
+        if self.normalize and not self.isUTF8(encoding):
+            self.textCache.put(fileName, text)
+        return text
+
+    def readHead(self, fileName: str, max_lines: int) -> str:
+        """
+        read the first lines of the given file
+
+        Args:
+            fileName(str): the path of the file
+            max_lines(int): the number of lines to read
+
+        Returns:
+            str: the decoded first lines
+        """
+        stat = os.stat(fileName)
+        encoding = self.getKnownEncoding(fileName, stat)
+        with open(fileName, "rb") as textFile:
+            prefix = textFile.read(TextFileDecoder.PREFIX_SIZE)
+        if encoding is None:
+            encoding = self.detectEncoding(
+                prefix, final=len(prefix) < TextFileDecoder.PREFIX_SIZE
+            )
+        reader = io.TextIOWrapper(
+            io.BytesIO(prefix), encoding=encoding, errors="replace"
+        )
+        text = "".join(islice(reader, max_lines))
+        return text
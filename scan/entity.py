@@ -6,18 +6,26 @@ Updated 2025-11-28
 """
 
 import datetime
+import hashlib
 import json
 import logging
 import os
+import sqlite3
 import sys
+import threading
 import time
-from typing import Any, Dict, List, Type
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, Iterable, List, Type
 
 from lodstorage.lod import LOD
 from lodstorage.sparql import SPARQL
-from lodstorage.sql import SQLDB
+from lodstorage.sql import SQLDB, EntityInfo
 from lodstorage.storageconfig import StorageConfig, StoreMode
 
+from scan.lodcache import LoDFile
+from scan.sqlpool import SQLConnectionPool
+
 
 class JsonCache:
     """
@@ -64,6 +72,37 @@ class JsonCache:
 
         return lod
 
+    def store_to_binary_file(
+        self, cacheFile: str, lod: Iterable[Dict[str, Any]]
+    ) -> int:
+        """
+        Store the given list of dicts to a binary LoD file.
+
+        Args:
+            cacheFile (str): The path to the file where the records should be stored.
+            lod (Iterable): The records to store - may be a generator.
+
+        Returns:
+            int: The number of stored records.
+        """
+        count = LoDFile(cacheFile).write(lod)
+        return count
+
+    def read_lod_from_binary_file(self, cacheFile: str) -> List[Dict[str, Any]]:
+        """
+        Read a list of dictionaries from a binary LoD file.
+
+        Args:
+            cacheFile (str): The path to the LoD file.
+
+        Returns:
+            list: A list of dictionaries loaded from the LoD file.
+        """
+        if not os.path.isfile(cacheFile):
+            return []
+        lod = LoDFile(cacheFile).read()
+        return lod
+
     def to_json(
         self,
         pretty: bool = False,
@@ -135,6 +174,13 @@ class EntityManager(JsonCache):
     generic entity manager
     """
 
+    # EntityInfo derived from the samples by (class, table name, primary key)
+    entityInfoCache = {}
+    # (cache file, table name) pairs whose indexes have been created
+    indexedTables = set()
+    # the table with the row count, schema version and last store time by table
+    metaTableName = "entity_meta"
+
     def __init__(
         self,
         name,
@@ -149,6 +195,8 @@ class EntityManager(JsonCache):
         filterInvalidListTypes=False,
         listSeparator="⇹",
         debug=False,
+        indexes: List[List[str]] = None,
+        binaryCache: bool = False,
     ):
         """
         Constructor
@@ -162,6 +210,8 @@ class EntityManager(JsonCache):
             filterInvalidListTypes(bool): True if invalidListTypes should be deleted
             listSeparator(str): the symbol to use as a list separator
             debug(boolean): override debug setting when default of config is used via config=None
+            indexes(list): the column lists to create SQL indexes for e.g. [["archiveName","folderPath"]]
+            binaryCache(bool): if True use a binary LoD file instead of a JSON file in JSON mode
         """
         self.logger = logging.getLogger(__name__)
         self.name = name
@@ -188,6 +238,12 @@ class EntityManager(JsonCache):
         self.tableName = tableName
         self.handleInvalidListTypes = handleInvalidListTypes
         self.filterInvalidListTypes = filterInvalidListTypes
+        self.indexes = indexes if indexes is not None else []
+        self.binaryCache = binaryCache
+        # fields that are loaded on access and are None until then
+        self.lazyFields = []
+        # record hashes by primary key of the stored entities - None if not tracked
+        self.snapshots = None
 
         cacheFile = self.getCacheFile(config=config, mode=config.mode)
         self.showProgress(
@@ -201,7 +257,8 @@ class EntityManager(JsonCache):
                 config.endpoint, debug=config.debug, profile=config.profile
             )
         elif config.mode is StoreMode.SQL:
-            self.executeMany = False  # may be True when issues are fixed
+            # use the SQLBulkWriter for storing
+            self.executeMany = True
         self.listSeparator = listSeparator
 
     def storeMode(self):
@@ -258,6 +315,8 @@ class EntityManager(JsonCache):
         """ get the path to the file for my cached data """
         if mode is StoreMode.JSON or mode is StoreMode.JSONPICKLE:
             extension = f".{mode.name.lower()}"
+            if mode is StoreMode.JSON and getattr(self, "binaryCache", False):
+                extension = ".lod"
             cachepath = f"{cachedir}/{self.name}-{self.listName}{extension}"
         elif mode is StoreMode.SPARQL:
             cachepath = f"SPARQL {self.name}:{config.endpoint}"
@@ -279,12 +338,16 @@ class EntityManager(JsonCache):
         """
         get the SQL database for the given cacheFile
 
+        the connection is the pooled one of the current thread
+        and must not be closed
+
         Args:
             cacheFile(string): the file to get the SQL db from
         """
         config = self.config
-        sqldb = self.sqldb = SQLDB(
-            cacheFile, debug=config.debug, errorDebug=config.errorDebug
+        pool = SQLConnectionPool.getPool(cacheFile)
+        sqldb = self.sqldb = pool.getSQLDB(
+            debug=config.debug, errorDebug=config.errorDebug
         )
         return sqldb
 
@@ -325,6 +388,44 @@ class EntityManager(JsonCache):
         )
         return entityInfo
 
+    def getEntityInfo(
+        self, sqldb: SQLDB, listOfDicts: list = None, sampleRecordCount: int = -1
+    ) -> EntityInfo:
+        """
+        get the entity information of my table without creating it
+
+        the entity info is derived from the samples of my class once and then
+        taken from the cache - without samples it is derived from the given records
+
+        Args:
+            sqldb(SQLDB): the database
+            listOfDicts(list): the records to analyze if there are no samples
+            sampleRecordCount(int): the number of records to analyze for type information
+
+        Return:
+            EntityInfo: the entity information such as CREATE Table command
+        """
+        key = (self.clazz, self.tableName, self.primaryKey)
+        entityInfo = EntityManager.entityInfoCache.get(key)
+        if entityInfo is None:
+            samples = None
+            if self.clazz is not None:
+                samples = self.get_samples_for_class(self.clazz)
+            if samples:
+                entityInfo = EntityInfo(
+                    samples, self.tableName, self.primaryKey, quiet=True
+                )
+                EntityManager.entityInfoCache[key] = entityInfo
+            else:
+                entityInfo = self.initSQLDB(
+                    sqldb,
+                    listOfDicts,
+                    withCreate=False,
+                    withDrop=False,
+                    sampleRecordCount=sampleRecordCount,
+                )
+        return entityInfo
+
     def setNone(self, record, fields):
         """
         make sure the given fields in the given record are set to none
@@ -360,13 +461,10 @@ GROUP by ?source
         elif mode is StoreMode.SQL:
             cacheFile = self.getCacheFile(config=self.config, mode=StoreMode.SQL)
             if os.path.isfile(cacheFile):
-                sqlQuery = f"SELECT COUNT(*) AS count FROM {self.tableName}"
                 try:
-                    sqlDB = self.getSQLDB(cacheFile)
-                    countResults = sqlDB.query(sqlQuery)
-                    countResult = countResults[0]
-                    count = countResult["count"]
-                    result = count >= 0
+                    # a lookup in the metadata table instead of counting the rows
+                    meta = self.getMeta()
+                    result = meta is not None
                 except Exception as ex:
                     msg = str(ex)
                     if self.debug:
@@ -443,6 +541,8 @@ GROUP by ?source
             err_msg = f"""The JSONPICKLE store mode has been deprecated.
 You need to switch to a supported mode like StoreMode.SQL or StoreMode.JSON to be able to use fromStore"""
             raise NotImplementedError(err_msg)
+        elif mode is StoreMode.JSON and self.binaryCache:
+            listOfDicts = self.read_lod_from_binary_file(cacheFile)
         elif mode is StoreMode.JSON:
             listOfDicts = self.read_lod_from_json_file(cacheFile)
             # Fix for wrapped lists e.g. {"archives": [...]} or {"documents": [...]}
@@ -483,8 +583,6 @@ SELECT ?eventId ?acronym ?series ?title ?year ?country ?city ?startDate ?endDate
             sqlQuery = "SELECT * FROM %s" % self.tableName
             sqlDB = self.getSQLDB(cacheFile)
             listOfDicts = sqlDB.query(sqlQuery)
-            sqlDB.close()
-            pass
         else:
             raise Exception(f"unsupported store mode {self.config.mode}")
 
@@ -501,6 +599,38 @@ SELECT ?eventId ?acronym ?series ?title ?year ?country ?city ?startDate ?endDate
             self.setListFromLoD(listOfDicts)
         return listOfDicts
 
+    def fromStoreLazy(self, pageSize: int = 1000, **filters) -> "LazyEntityList":
+        """
+        set my list to a lazy sequence over my table that pages the rows
+        on demand and only constructs the entities that are accessed
+
+        the lazy list is read only - assign a new list to modify my entities
+
+        Args:
+            pageSize(int): the number of rows to fetch per page
+            filters: equals, ranges and prefixes filters - see queryLoD
+
+        Returns:
+            LazyEntityList: the lazy list
+        """
+        self.list = LazyEntityList(self, pageSize=pageSize, **filters)
+        if self.listName:
+            setattr(self, self.listName, self.list)
+        return self.list
+
+    def createEntity(self, record: Dict[str, Any]):
+        """
+        create an entity of my class from the given stored record
+
+        Args:
+            record(dict): the record
+
+        Returns:
+            the entity
+        """
+        entity = self.clazz.from_dict(record)
+        return entity
+
     def setListFromLoD(self, listOfDicts: list):
         """
 
@@ -511,7 +641,7 @@ SELECT ?eventId ?acronym ?series ?title ?year ?country ?city ?startDate ?endDate
         if listOfDicts:
             for record in listOfDicts:
                 if isinstance(record, dict):
-                    entity = self.clazz.from_dict(record)
+                    entity = self.createEntity(record)
                     self.list.append(entity)
                 else:
                     self.logger.warning(
@@ -521,8 +651,16 @@ SELECT ?eventId ?acronym ?series ?title ?year ?country ?city ?startDate ?endDate
         # Update the alias to point to the new list object
         if self.listName:
             setattr(self, self.listName, self.list)
+        self.takeSnapshot()
 
     def getList(self):
+        """
+        get my list of entities
+
+        the list might have been replaced via its alias e.g. self.documents=...
+        """
+        if self.listName:
+            self.list = getattr(self, self.listName)
         return self.list
 
     def getLookup(self, attrName: str, withDuplicates: bool = False) -> tuple:
@@ -565,6 +703,353 @@ SELECT ?eventId ?acronym ?series ?title ?year ?country ?city ?startDate ?endDate
 
         return lookup, duplicates
 
+    def ensureIndexes(self, sqldb: SQLDB, force: bool = False):
+        """
+        create my indexes if they do not exist yet
+
+        Args:
+            sqldb(SQLDB): the database
+            force(bool): if True check the indexes even if they have been created before
+        """
+        key = (sqldb.dbname, self.tableName)
+        if self.indexes and (force or key not in EntityManager.indexedTables):
+            with SQLConnectionPool.getPool(sqldb.dbname).writeLock:
+                for columns in self.indexes:
+                    indexName = f"idx_{self.tableName}_{'_'.join(columns)}"
+                    sqldb.c.execute(
+                        f"CREATE INDEX IF NOT EXISTS {indexName} ON {self.tableName}({','.join(columns)})"
+                    )
+                sqldb.c.commit()
+            EntityManager.indexedTables.add(key)
+
+    def getWhereClause(
+        self,
+        tableColumns: List[str],
+        equals: Dict[str, Any] = None,
+        ranges: Dict[str, tuple] = None,
+        prefixes: Dict[str, str] = None,
+    ) -> tuple:
+        """
+        get a parameterized WHERE clause for the given filters
+
+        Args:
+            tableColumns(list): the valid column names
+            equals(dict): column values to match - a list or tuple value matches any of its values
+            ranges(dict): (low, high) tuples of inclusive bounds by column or rowid - None for open bounds
+            prefixes(dict): string prefixes by column
+
+        Returns:
+            tuple: the WHERE clause (empty if there are no filters) and its params
+        """
+        conditions = []
+        params = []
+
+        def checkColumn(column: str):
+            if column not in tableColumns:
+                raise ValueError(f"invalid column {column} for {self.tableName}")
+
+        for column, value in (equals or {}).items():
+            checkColumn(column)
+            if isinstance(value, (list, tuple, set)):
+                values = list(value)
+                placeholders = ",".join("?" * len(values))
+                conditions.append(f"{column} IN ({placeholders})")
+                params.extend(values)
+            elif value is None:
+                conditions.append(f"{column} IS NULL")
+            else:
+                conditions.append(f"{column}=?")
+                params.append(value)
+        for column, (low, high) in (ranges or {}).items():
+            # the rowid gives the insertion order e.g. for keyset paging
+            if column != "rowid":
+                checkColumn(column)
+            if low is not None:
+                conditions.append(f"{column}>=?")
+                params.append(low)
+            if high is not None:
+                conditions.append(f"{column}<=?")
+                params.append(high)
+        for column, prefix in (prefixes or {}).items():
+            checkColumn(column)
+            if prefix:
+                # a range instead of LIKE so that an index can be used
+                upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+                conditions.append(f"{column}>=? AND {column}<?")
+                params.extend([prefix, upper])
+        whereClause = ""
+        if conditions:
+            whereClause = " WHERE " + " AND ".join(conditions)
+        return whereClause, params
+
+    def getTableColumns(self, sqldb: SQLDB) -> List[str]:
+        """
+        get the columns of my table
+
+        Args:
+            sqldb(SQLDB): the database
+
+        Returns:
+            list: the column names - empty if the table does not exist
+        """
+        rows = sqldb.c.execute(f"PRAGMA table_info({self.tableName})").fetchall()
+        columns = [row[1] for row in rows]
+        return columns
+
+    def getSchemaVersion(self, sqldb: SQLDB) -> str:
+        """
+        get the schema version of my table as a short hash of its column definitions
+
+        Args:
+            sqldb(SQLDB): the database
+
+        Returns:
+            str: the schema version - None if the table does not exist
+        """
+        rows = sqldb.c.execute(f"PRAGMA table_info({self.tableName})").fetchall()
+        schemaVersion = None
+        if rows:
+            schema = ",".join(f"{row[1]}:{row[2]}" for row in rows)
+            schemaVersion = hashlib.sha1(schema.encode("utf-8")).hexdigest()[:12]
+        return schemaVersion
+
+    def ensureMetaTable(self, sqldb: SQLDB):
+        """
+        make sure the metadata table exists
+
+        Args:
+            sqldb(SQLDB): the database
+        """
+        sqldb.c.execute(f"""CREATE TABLE IF NOT EXISTS {EntityManager.metaTableName} (
+  tableName TEXT PRIMARY KEY,
+  entityName TEXT,
+  rowCount INTEGER,
+  schemaVersion TEXT,
+  lastStored TIMESTAMP
+)""")
+
+    def storeMeta(self, sqldb: SQLDB, rowCount: int = None, rowCountDelta: int = 0):
+        """
+        store the metadata of my table and commit - needs to be called while
+        holding the write lock of the pool before the last rows are committed
+        so that the metadata is stored in the same transaction as the rows
+
+        Args:
+            sqldb(SQLDB): the database
+            rowCount(int): the number of rows - None to adjust the stored row count
+            rowCountDelta(int): the number of rows added since the row count was stored
+        """
+        self.ensureMetaTable(sqldb)
+        if rowCount is None:
+            row = sqldb.c.execute(
+                f"SELECT rowCount FROM {EntityManager.metaTableName} WHERE tableName=?",
+                (self.tableName,),
+            ).fetchone()
+            if row is not None and row[0] is not None:
+                rowCount = row[0] + rowCountDelta
+            else:
+                # a table stored by a former version is counted once
+                sqlQuery = f"SELECT COUNT(*) FROM {self.tableName}"
+                rowCount = sqldb.c.execute(sqlQuery).fetchone()[0]
+        sqldb.c.execute(
+            f"""INSERT OR REPLACE INTO {EntityManager.metaTableName}
+(tableName,entityName,rowCount,schemaVersion,lastStored) VALUES (?,?,?,?,?)""",
+            (
+                self.tableName,
+                self.entityName,
+                rowCount,
+                self.getSchemaVersion(sqldb),
+                datetime.datetime.now(),
+            ),
+        )
+        sqldb.c.commit()
+
+    def countNewRows(
+        self, sqldb: SQLDB, listOfDicts: List[Dict[str, Any]], replace: bool = True
+    ) -> int:
+        """
+        count the rows the given records will add to my table - records
+        inserted with replace only add a row if their primary key is not stored yet
+
+        Args:
+            sqldb(SQLDB): the database
+            listOfDicts(list): the records to be stored
+            replace(bool): True if the records are inserted with replace
+
+        Returns:
+            int: the number of new rows
+        """
+        if not replace or self.primaryKey is None:
+            return len(listOfDicts)
+        keys = list({record.get(self.primaryKey) for record in listOfDicts})
+        newRows = len(keys)
+        if self.getTableColumns(sqldb):
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                sqlQuery = f"SELECT COUNT(*) FROM {self.tableName} WHERE {self.primaryKey} IN ({placeholders})"
+                newRows -= sqldb.c.execute(sqlQuery, chunk).fetchone()[0]
+        return newRows
+
+    def updateRowCount(self, sqldb: SQLDB, delta: int):
+        """
+        adjust the row count in my metadata e.g. after deleting rows
+
+        Args:
+            sqldb(SQLDB): the database
+            delta(int): the change of the number of rows
+        """
+        self.ensureMetaTable(sqldb)
+        sqldb.c.execute(
+            f"""UPDATE {EntityManager.metaTableName}
+SET rowCount=MAX(rowCount+?,0),lastStored=? WHERE tableName=?""",
+            (delta, datetime.datetime.now(), self.tableName),
+        )
+
+    def getMeta(self) -> Dict[str, Any]:
+        """
+        get the metadata of my table
+
+        the metadata of a table stored by a former version is
+        created on first access by counting the rows once
+
+        Returns:
+            dict: tableName, entityName, rowCount, schemaVersion and lastStored
+            - None if my table does not exist
+        """
+        cacheFile = self.getCacheFile(config=self.config, mode=StoreMode.SQL)
+        pool = SQLConnectionPool.getPool(cacheFile)
+        sqldb = pool.getSQLDB()
+        sqlQuery = f"SELECT * FROM {EntityManager.metaTableName} WHERE tableName=?"
+        meta = None
+        try:
+            records = sqldb.query(sqlQuery, (self.tableName,))
+        except sqlite3.OperationalError:
+            # no metadata table yet
+            records = []
+        if records:
+            meta = records[0]
+        elif self.getTableColumns(sqldb):
+            with pool.writeLock:
+                self.storeMeta(sqldb)
+            meta = sqldb.query(sqlQuery, (self.tableName,))[0]
+        return meta
+
+    def queryLoD(
+        self,
+        equals: Dict[str, Any] = None,
+        ranges: Dict[str, tuple] = None,
+        prefixes: Dict[str, str] = None,
+        columns: List[str] = None,
+        orderBy: Any = None,
+        limit: int = None,
+        offset: int = None,
+        withRowid: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        query my table with the given filters in SQL
+
+        Args:
+            equals(dict): column values to match - a list or tuple value matches any of its values
+            ranges(dict): (low, high) tuples of inclusive bounds by column or rowid - None for open bounds
+            prefixes(dict): string prefixes by column
+            columns(list): the columns to select - default: all
+            orderBy(str|list): column name(s) or rowid to sort by - prefix with "-" for descending order
+            limit(int): the maximum number of records
+            offset(int): the number of records to skip
+            withRowid(bool): if True also select the rowid of each record
+
+        Returns:
+            list: the matching records
+        """
+        if self.config.mode is not StoreMode.SQL:
+            raise Exception(f"query is not supported for store mode {self.config.mode}")
+        cacheFile = self.getCacheFile(config=self.config, mode=self.config.mode)
+        sqldb = SQLConnectionPool.getPool(cacheFile).getSQLDB()
+        tableColumns = self.getTableColumns(sqldb)
+        lod = []
+        if tableColumns:
+            self.ensureIndexes(sqldb)
+            whereClause, params = self.getWhereClause(
+                tableColumns, equals=equals, ranges=ranges, prefixes=prefixes
+            )
+            selectColumns = "*"
+            if columns:
+                for column in columns:
+                    if column not in tableColumns:
+                        raise ValueError(
+                            f"invalid column {column} for {self.tableName}"
+                        )
+                selectColumns = ",".join(columns)
+            if withRowid:
+                selectColumns = f"rowid AS rowid,{selectColumns}"
+            sqlQuery = f"SELECT {selectColumns} FROM {self.tableName}{whereClause}"
+            if orderBy:
+                if isinstance(orderBy, str):
+                    orderBy = [orderBy]
+                orders = []
+                for order in orderBy:
+                    column = order.lstrip("-")
+                    # the rowid gives the insertion order
+                    if column not in tableColumns and column != "rowid":
+                        raise ValueError(
+                            f"invalid column {column} for {self.tableName}"
+                        )
+                    direction = " DESC" if order.startswith("-") else ""
+                    orders.append(f"{column}{direction}")
+                sqlQuery += " ORDER BY " + ",".join(orders)
+            if limit is not None or offset:
+                sqlQuery += " LIMIT ? OFFSET ?"
+                params.extend([-1 if limit is None else limit, offset or 0])
+            lod = sqldb.query(sqlQuery, tuple(params))
+        return lod
+
+    def query(self, **kwargs) -> list:
+        """
+        query my table with the given filters in SQL
+
+        Args:
+            kwargs: see queryLoD
+
+        Returns:
+            list: the matching entities
+        """
+        lod = self.queryLoD(**kwargs)
+        entities = [self.createEntity(record) for record in lod]
+        return entities
+
+    def count(
+        self,
+        equals: Dict[str, Any] = None,
+        ranges: Dict[str, tuple] = None,
+        prefixes: Dict[str, str] = None,
+    ) -> int:
+        """
+        count the records of my table matching the given filters
+
+        Args:
+            equals(dict): column values to match
+            ranges(dict): (low, high) tuples of inclusive bounds by column
+            prefixes(dict): string prefixes by column
+
+        Returns:
+            int: the number of matching records
+        """
+        if self.config.mode is not StoreMode.SQL:
+            raise Exception(f"count is not supported for store mode {self.config.mode}")
+        cacheFile = self.getCacheFile(config=self.config, mode=self.config.mode)
+        sqldb = SQLConnectionPool.getPool(cacheFile).getSQLDB()
+        tableColumns = self.getTableColumns(sqldb)
+        count = 0
+        if tableColumns:
+            self.ensureIndexes(sqldb)
+            whereClause, params = self.getWhereClause(
+                tableColumns, equals=equals, ranges=ranges, prefixes=prefixes
+            )
+            sqlQuery = f"SELECT COUNT(*) AS count FROM {self.tableName}{whereClause}"
+            count = sqldb.query(sqlQuery, tuple(params))[0]["count"]
+        return count
+
     def getLoD(self, limit_to_sample_fields: bool = False) -> List[Dict[str, Any]]:
         """
         Return the LoD of the entities in the list
@@ -572,6 +1057,24 @@ SELECT ?eventId ?acronym ?series ?title ?year ?country ?city ?startDate ?endDate
         Args:
             limit_to_sample_fields(bool): if True filter key by getSamples()
 
+        Return:
+            list: a list of Dicts
+        """
+        lod = self.getRecords(
+            self.getList(), limit_to_sample_fields=limit_to_sample_fields
+        )
+        return lod
+
+    def getRecords(
+        self, entities: Iterable, limit_to_sample_fields: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the LoD of the given entities
+
+        Args:
+            entities(Iterable): the entities to convert
+            limit_to_sample_fields(bool): if True filter key by getSamples()
+
         Return:
             list: a list of Dicts
         """
@@ -584,7 +1087,7 @@ SELECT ?eventId ?acronym ?series ?title ?year ?country ?city ?startDate ?endDate
             if samples:
                 valid_keys = set().union(*(sample.keys() for sample in samples))
 
-        for entity in self.getList():
+        for entity in entities:
             record = entity.__dict__
             if valid_keys:
                 # Filter dict to only include keys present in samples
@@ -592,6 +1095,38 @@ SELECT ?eventId ?acronym ?series ?title ?year ?country ?city ?startDate ?endDate
             lod.append(record)
         return lod
 
+    def getStoreRecords(self, entities: Iterable) -> List[Dict[str, Any]]:
+        """
+        get the records of the given entities to be stored - all attributes
+        are kept except list valued ones that the samples do not document
+        such as the fields of the string representation which would make
+        filterInvalidListTypes drop the whole record
+
+        Args:
+            entities(Iterable): the entities to convert
+
+        Return:
+            list: a list of Dicts
+        """
+        sampleKeys = set()
+        if self.clazz is not None:
+            samples = self.get_samples_for_class(self.clazz)
+            sampleKeys = set().union(*(sample.keys() for sample in samples))
+        lod = []
+        for entity in entities:
+            record = entity.__dict__
+            if any(
+                isinstance(value, list) and key not in sampleKeys
+                for key, value in record.items()
+            ):
+                record = {
+                    key: value
+                    for key, value in record.items()
+                    if key in sampleKeys or not isinstance(value, list)
+                }
+            lod.append(record)
+        return lod
+
     def store(
         self,
         limit=10000000,
@@ -600,6 +1135,7 @@ SELECT ?eventId ?acronym ?series ?title ?year ?country ?city ?startDate ?endDate
         fixNone=True,
         sampleRecordCount=-1,
         replace: bool = False,
+        delta: bool = None,
     ) -> str:
         """
         store my list of dicts
@@ -611,22 +1147,215 @@ SELECT ?eventId ?acronym ?series ?title ?year ?country ?city ?startDate ?endDate
             fixNone(bool): if True make sure the dicts are filled with None references for each record
             sampleRecordCount(int): the number of records to analyze for type information
             replace(bool): if True allow replace for insert
+            delta(bool): if True only write the inserted, modified and deleted entities
+                - default: if my entities are tracked
 
         Return:
             str: The cache_file being used
         """
-        lod = self.getLoD()
-        cache_file = self.storeLoD(
-            lod,
-            limit=limit,
-            batchSize=batchSize,
-            append=append,
-            fixNone=fixNone,
-            sampleRecordCount=sampleRecordCount,
-            replace=replace,
-        )
+        if isinstance(self.getList(), LazyEntityList):
+            raise Exception(
+                f"the lazy list of {self.entityPluralName} is read only - assign a list to store"
+            )
+        if delta is None:
+            delta = not append and self.isTracked()
+        if delta:
+            changes = self.getChanges()
+            cache_file = self.storeDelta(changes)
+        else:
+            lod = self.getStoreRecords(self.getList())
+            cache_file = self.storeLoD(
+                lod,
+                limit=limit,
+                batchSize=batchSize,
+                append=append,
+                fixNone=fixNone,
+                sampleRecordCount=sampleRecordCount,
+                replace=replace,
+            )
+            if append:
+                # my list is only a part of the stored entities
+                self.snapshots = None
+            else:
+                self.takeSnapshot(lod)
         return cache_file
 
+    def isTracked(self) -> bool:
+        """
+        check whether the changes of my entities are tracked
+        so that only the changes need to be stored
+
+        Returns:
+            bool: True if there is a snapshot of my stored SQL entities
+        """
+        tracked = (
+            self.snapshots is not None
+            and self.config.mode is StoreMode.SQL
+            and self.primaryKey is not None
+        )
+        return tracked
+
+    @staticmethod
+    def hashValues(values: tuple) -> int:
+        """
+        get the hash of the given values - unhashable values are hashed by their repr
+        """
+        try:
+            valuesHash = hash(values)
+        except TypeError:
+            valuesHash = hash(repr(values))
+        return valuesHash
+
+    def getRecordHashes(self, record: Dict[str, Any]) -> tuple:
+        """
+        get the hashes of the given record
+
+        Args:
+            record(dict): the record of an entity
+
+        Returns:
+            tuple: the hash of the eagerly loaded values and the hash of
+            the lazy values - None if no lazy value is loaded
+        """
+        lazyFields = self.lazyFields
+        values = tuple((k, v) for k, v in record.items() if k not in lazyFields)
+        lazyValues = tuple(record.get(field) or None for field in lazyFields)
+        lazyHash = None
+        if any(value is not None for value in lazyValues):
+            lazyHash = EntityManager.hashValues(lazyValues)
+        return EntityManager.hashValues(values), lazyHash
+
+    def takeSnapshot(self, records: List[Dict[str, Any]] = None):
+        """
+        remember the state of my stored entities to track their changes
+
+        Args:
+            records(list): the stored records - default: the records of my list
+        """
+        self.snapshots = None
+        if self.primaryKey is not None and isinstance(self.getList(), list):
+            if records is None:
+                records = self.getStoreRecords(self.getList())
+            self.snapshots = {
+                record.get(self.primaryKey): self.getRecordHashes(record)
+                for record in records
+            }
+
+    def getLazyValues(self, keys: List[Any]) -> Dict[Any, Dict[str, Any]]:
+        """
+        get the stored values of my lazy fields - to be overridden
+        by managers with lazy fields
+
+        Args:
+            keys(list): the primary keys of the entities
+
+        Returns:
+            dict: the values of the lazy fields by primary key
+        """
+        return {}
+
+    def getChanges(self) -> Dict[str, list]:
+        """
+        get the changes of my entities since the last snapshot
+
+        Returns:
+            dict: the records to insert and to update and the primary keys to delete
+        """
+        if self.snapshots is None:
+            raise Exception(
+                f"the changes of the {self.entityPluralName} are not tracked"
+            )
+        inserted = []
+        modified = []
+        loaded = []
+        seen = set()
+        for record in self.getStoreRecords(self.getList()):
+            key = record.get(self.primaryKey)
+            seen.add(key)
+            recordHash, lazyHash = self.getRecordHashes(record)
+            snapshot = self.snapshots.get(key)
+            if snapshot is None:
+                inserted.append(record)
+            elif recordHash != snapshot[0]:
+                modified.append(record)
+            elif lazyHash is not None and lazyHash != snapshot[1]:
+                if snapshot[1] is None:
+                    # loaded after the snapshot - compare with the stored values
+                    loaded.append(record)
+                else:
+                    modified.append(record)
+        if loaded:
+            storedValues = self.getLazyValues(
+                [record.get(self.primaryKey) for record in loaded]
+            )
+            for record in loaded:
+                stored = storedValues.get(record.get(self.primaryKey), {})
+                for field in self.lazyFields:
+                    if (record.get(field) or None) != (stored.get(field) or None):
+                        modified.append(record)
+                        break
+        deleted = [key for key in self.snapshots if key not in seen]
+        changes = {"inserted": inserted, "modified": modified, "deleted": deleted}
+        return changes
+
+    def storeDelta(self, changes: Dict[str, list]) -> str:
+        """
+        store the given changes in a single transaction
+
+        Args:
+            changes(dict): the changes as returned by getChanges
+
+        Returns:
+            str: the cache file being used
+        """
+        records = changes["inserted"] + changes["modified"]
+        deleted = changes["deleted"]
+        cacheFile = self.storeDeltaLoD(
+            records, deleted, rowCountDelta=len(changes["inserted"]) - len(deleted)
+        )
+        for record in records:
+            self.snapshots[record.get(self.primaryKey)] = self.getRecordHashes(record)
+        for key in deleted:
+            self.snapshots.pop(key, None)
+        self.showProgress(
+            f"stored {len(changes['inserted'])} inserted, {len(changes['modified'])} modified and {len(deleted)} deleted {self.entityPluralName}"
+        )
+        return cacheFile
+
+    def storeDeltaLoD(
+        self, records: List[Dict[str, Any]], deleted: List[Any], rowCountDelta: int
+    ) -> str:
+        """
+        replace the given records and delete the given primary keys in my table
+        in a single transaction
+
+        Args:
+            records(list): the records to insert or replace
+            deleted(list): the primary keys of the records to delete
+            rowCountDelta(int): the change of the number of rows
+
+        Returns:
+            str: the cache file being used
+        """
+        if self.config.mode is not StoreMode.SQL:
+            raise Exception(
+                f"delta store is not supported for store mode {self.config.mode}"
+            )
+        cacheFile = self.getCacheFile(config=self.config, mode=self.config.mode)
+        if records or deleted:
+            with SQLConnectionPool.getPool(cacheFile).writeLock:
+                sqldb = self.getSQLDB(cacheFile)
+                entityInfo = self.getEntityInfo(sqldb, records)
+                writer = SQLBulkWriter(sqldb)
+                try:
+                    writer.storeDelta(records, deleted, entityInfo, self.primaryKey)
+                    self.updateRowCount(sqldb, rowCountDelta)
+                    sqldb.c.commit()
+                except Exception:
+                    sqldb.c.rollback()
+                    raise
+        return cacheFile
+
     def storeLoD(
         self,
         listOfDicts,
@@ -671,7 +1400,9 @@ SELECT ?eventId ?acronym ?series ?title ?year ?country ?city ?startDate ?endDate
                 raise NotImplementedError(
                     "The JSONPICKLE store mode has been deprecated. Use StoreMode.SQL or StoreMode.JSON."
                 )
-            if mode is StoreMode.JSON:
+            if mode is StoreMode.JSON and self.binaryCache:
+                self.store_to_binary_file(cacheFile, listOfDicts)
+            elif mode is StoreMode.JSON:
                 # Wrap list in dictionary for JSON compatibility
                 wrapped_lod = {self.listName: listOfDicts}
                 self.store_to_json_file(cacheFile, dod=wrapped_lod)
@@ -710,26 +1441,60 @@ SELECT ?eventId ?acronym ?series ?title ?year ?country ?city ?startDate ?endDate
                     cacheFile,
                 )
             )
-            if append:
-                withDrop = False
-                withCreate = False
-            else:
-                withDrop = True
-                withCreate = True
-            entityInfo = self.initSQLDB(
-                sqldb,
-                listOfDicts,
-                withCreate=withCreate,
-                withDrop=withDrop,
-                sampleRecordCount=sampleRecordCount,
-            )
-            self.sqldb.store(
-                listOfDicts,
-                entityInfo,
-                executeMany=self.executeMany,
-                fixNone=fixNone,
-                replace=replace,
-            )
+            # a single writer at a time - readers are not blocked in WAL mode
+            with SQLConnectionPool.getPool(cacheFile).writeLock:
+                if append:
+                    withDrop = False
+                    withCreate = False
+                else:
+                    withDrop = True
+                    withCreate = True
+                if self.executeMany:
+                    entityInfo = self.getEntityInfo(
+                        sqldb, listOfDicts, sampleRecordCount=sampleRecordCount
+                    )
+                    sqldb.createTable4EntityInfo(
+                        entityInfo, withDrop=withDrop, withCreate=withCreate
+                    )
+                    if withCreate:
+                        self.ensureIndexes(sqldb, force=True)
+                    newRows = self.countNewRows(sqldb, listOfDicts, replace)
+                    writer = SQLBulkWriter(sqldb)
+                    # the last batch is committed with the row count
+                    writer.store(
+                        listOfDicts,
+                        entityInfo,
+                        batchSize=batchSize,
+                        replace=replace,
+                        commit=False,
+                    )
+                    try:
+                        if append:
+                            self.storeMeta(sqldb, rowCountDelta=newRows)
+                        else:
+                            self.storeMeta(sqldb, rowCount=newRows)
+                    except Exception:
+                        sqldb.c.rollback()
+                        raise
+                else:
+                    entityInfo = self.initSQLDB(
+                        sqldb,
+                        listOfDicts,
+                        withCreate=withCreate,
+                        withDrop=withDrop,
+                        sampleRecordCount=sampleRecordCount,
+                    )
+                    sqldb.store(
+                        listOfDicts,
+                        entityInfo,
+                        executeMany=False,
+                        fixNone=fixNone,
+                        replace=replace,
+                    )
+                    # the rows have been committed record by record - count them
+                    sqlQuery = f"SELECT COUNT(*) FROM {self.tableName}"
+                    rowCount = sqldb.c.execute(sqlQuery).fetchone()[0]
+                    self.storeMeta(sqldb, rowCount=rowCount)
             self.showProgress(
                 "store for %s done after %5.1f secs"
                 % (self.name, time.time() - startTime)
@@ -737,3 +1502,363 @@ SELECT ?eventId ?acronym ?series ?title ?year ?country ?city ?startDate ?endDate
         else:
             raise Exception(f"unsupported store mode {self.mode}")
         return cacheFile
+
+
+class LazyEntityList(Sequence):
+    """
+    read only sequence of the entities of an EntityManager's SQL table
+
+    the rows are fetched page by page in rowid order when accessed and a
+    bounded number of pages is kept - entities are constructed on first access
+
+    a page continues after the last rowid of the nearest page before it that
+    has been fetched so that reading deep pages does not skip the rows before them
+    """
+
+    def __init__(
+        self,
+        em: EntityManager,
+        pageSize: int = 1000,
+        maxPages: int = 8,
+        columns: List[str] = None,
+        **filters,
+    ):
+        """
+        constructor
+
+        Args:
+            em(EntityManager): the entity manager whose table to page
+            pageSize(int): the number of rows per page
+            maxPages(int): the maximum number of pages to keep
+            columns(list): the columns to fetch - default: all
+            filters: equals, ranges and prefixes filters - see EntityManager.queryLoD
+        """
+        self.em = em
+        self.pageSize = max(1, pageSize)
+        self.maxPages = max(1, maxPages)
+        self.columns = columns
+        self.filters = filters
+        self.lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self):
+        """
+        forget the cached pages and recount the rows
+        """
+        with self.lock:
+            self.pages = OrderedDict()
+            # the last rowid of each fetched page for the keyset paging
+            self.pageEnds = {}
+            self.length = self.em.count(**self.filters)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def getPage(self, pageIndex: int) -> list:
+        """
+        get the page with the given index
+
+        Args:
+            pageIndex(int): the index of the page
+
+        Returns:
+            list: [records, entities] with None for entities not constructed yet
+        """
+        with self.lock:
+            page = self.pages.get(pageIndex)
+            if page is not None:
+                self.pages.move_to_end(pageIndex)
+                return page
+        filters = dict(self.filters)
+        ranges = dict(filters.pop("ranges", None) or {})
+        with self.lock:
+            startPage, lastRowid = self.getPageStart(pageIndex)
+        if lastRowid is not None:
+            ranges["rowid"] = (lastRowid + 1, None)
+        records = self.em.queryLoD(
+            columns=self.columns,
+            orderBy="rowid",
+            limit=self.pageSize,
+            offset=(pageIndex - startPage) * self.pageSize,
+            ranges=ranges,
+            withRowid=True,
+            **filters,
+        )
+        rowids = [record.pop("rowid") for record in records]
+        page = [records, [None] * len(records)]
+        with self.lock:
+            if rowids:
+                self.pageEnds[pageIndex] = rowids[-1]
+            self.pages[pageIndex] = page
+            while len(self.pages) > self.maxPages:
+                self.pages.popitem(last=False)
+        return page
+
+    def getPageStart(self, pageIndex: int) -> tuple:
+        """
+        get the nearest fetched page before the given page - needs my lock
+
+        Args:
+            pageIndex(int): the index of the page
+
+        Returns:
+            tuple: the index of the page after it and its last rowid -
+            (0, None) if no page before has been fetched
+        """
+        start = (0, None)
+        if pageIndex - 1 in self.pageEnds:
+            start = (pageIndex, self.pageEnds[pageIndex - 1])
+        else:
+            before = [index for index in self.pageEnds if index < pageIndex]
+            if before:
+                nearest = max(before)
+                start = (nearest + 1, self.pageEnds[nearest])
+        return start
+
+    def getEntity(self, index: int):
+        """
+        get the entity with the given non negative index
+        """
+        pageIndex, pageOffset = divmod(index, self.pageSize)
+        records, entities = self.getPage(pageIndex)
+        if pageOffset >= len(records):
+            # the table shrank since the rows were counted
+            raise IndexError(f"index {index} out of range")
+        entity = entities[pageOffset]
+        if entity is None:
+            entity = self.em.createEntity(records[pageOffset])
+            entities[pageOffset] = entity
+        return entity
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.getEntity(i) for i in range(*index.indices(self.length))]
+        if index < 0:
+            index += self.length
+        if index < 0 or index >= self.length:
+            raise IndexError(f"index {index} out of range")
+        return self.getEntity(index)
+
+    def __iter__(self):
+        for index in range(self.length):
+            try:
+                yield self.getEntity(index)
+            except IndexError:
+                return
+
+
+class SQLBulkWriter:
+    """
+    fast bulk insert of records into a SQLite table
+
+    each batch is inserted with a single prepared statement via executemany
+    in its own transaction on a connection tuned for writing
+    """
+
+    # journal in write ahead log mode and only sync at checkpoints
+    PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+    }
+
+    def __init__(self, sqldb: SQLDB, pragmas: Dict[str, Any] = None):
+        """
+        constructor
+
+        Args:
+            sqldb(SQLDB): the database to write to
+            pragmas(dict): the pragmas to apply - default: PRAGMAS
+        """
+        self.sqldb = sqldb
+        self.pragmas = SQLBulkWriter.PRAGMAS if pragmas is None else pragmas
+        self.applyPragmas()
+
+    def applyPragmas(self):
+        """
+        apply my pragmas to the connection
+        """
+        for name, value in self.pragmas.items():
+            self.sqldb.c.execute(f"PRAGMA {name}={value}")
+
+    def getColumns(self, tableName: str) -> List[str]:
+        """
+        get the columns of the given table
+
+        Args:
+            tableName(str): the name of the table
+
+        Returns:
+            list: the column names
+        """
+        rows = self.sqldb.c.execute(f"PRAGMA table_info({tableName})").fetchall()
+        columns = [row[1] for row in rows]
+        return columns
+
+    def getInsertCmd(self, entityInfo: EntityInfo, replace: bool = False) -> tuple:
+        """
+        get the parameterized INSERT command for the given entity info
+
+        Args:
+            entityInfo(EntityInfo): the entity info of the table
+            replace(bool): if True allow replace for insert
+
+        Returns:
+            tuple: the command and the columns of its parameters
+        """
+        tableColumns = set(self.getColumns(entityInfo.name))
+        columns = [column for column in entityInfo.typeMap if column in tableColumns]
+        replaceClause = " OR REPLACE" if replace else ""
+        placeholders = ",".join("?" * len(columns))
+        insertCmd = f"INSERT{replaceClause} INTO {entityInfo.name} ({','.join(columns)}) VALUES ({placeholders})"
+        return insertCmd, columns
+
+    def storeDelta(
+        self,
+        listOfDicts: List[Dict[str, Any]],
+        deleted: List[Any],
+        entityInfo: EntityInfo,
+        primaryKey: str,
+    ):
+        """
+        replace the given records and delete the records with the given
+        primary keys - the caller commits or rolls back the transaction
+
+        Args:
+            listOfDicts(list): the records to insert or replace
+            deleted(list): the primary keys of the records to delete
+            entityInfo(EntityInfo): the entity info of the table
+            primaryKey(str): the primary key column
+        """
+        if deleted:
+            self.sqldb.c.executemany(
+                f"DELETE FROM {entityInfo.name} WHERE {primaryKey}=(?)",
+                [(key,) for key in deleted],
+            )
+        if listOfDicts:
+            insertCmd, columns = self.getInsertCmd(entityInfo, replace=True)
+            rows = [
+                tuple(record.get(column) for column in columns)
+                for record in listOfDicts
+            ]
+            self.sqldb.c.executemany(insertCmd, rows)
+
+    def store(
+        self,
+        listOfDicts: List[Dict[str, Any]],
+        entityInfo: EntityInfo,
+        batchSize: int = 10000,
+        replace: bool = False,
+        commit: bool = True,
+    ) -> int:
+        """
+        store the given records - missing values are stored as NULL
+
+        only the columns of the entityInfo that exist in the table are written
+        so that tables created by former versions can still be appended to
+
+        Args:
+            listOfDicts(list): the records to store
+            entityInfo(EntityInfo): the entity info of the table
+            batchSize(int): the number of records per transaction
+            replace(bool): if True allow replace for insert
+            commit(bool): if False the last batch is not committed so that the
+                caller can complete its transaction e.g. with metadata
+
+        Returns:
+            int: the number of stored records
+        """
+        insertCmd, columns = self.getInsertCmd(entityInfo, replace=replace)
+        count = 0
+        batchSize = max(1, batchSize)
+        for start in range(0, len(listOfDicts), batchSize):
+            rows = [
+                tuple(record.get(column) for column in columns)
+                for record in listOfDicts[start : start + batchSize]
+            ]
+            try:
+                self.sqldb.c.executemany(insertCmd, rows)
+                if commit or start + batchSize < len(listOfDicts):
+                    self.sqldb.c.commit()
+            except sqlite3.Error as ex:
+                self.sqldb.c.rollback()
+                raise Exception(f"{insertCmd}\nfailed:{str(ex)}")
+            count += len(rows)
+        return count
+
+
+class BatchStore:
+    """
+    buffer entities and store them in fixed size batches
+
+    each batch is stored in its own transaction so that the memory
+    needed stays constant and the batches stored so far are durable
+    """
+
+    def __init__(
+        self,
+        em: EntityManager,
+        batchSize: int = 1000,
+        replace: bool = True,
+        beforeFlush: Callable[[list], None] = None,
+    ):
+        """
+        constructor
+
+        Args:
+            em(EntityManager): the entity manager to store the entities with
+            batchSize(int): the number of entities per batch
+            replace(bool): if True allow replace for insert
+            beforeFlush(Callable): optional callback receiving each batch
+                before it is stored e.g. to delete outdated rows
+        """
+        self.em = em
+        self.batchSize = batchSize
+        self.replace = replace
+        self.beforeFlush = beforeFlush
+        self.batch = []
+        self.count = 0
+        self.batchCount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # keep the entities collected before a failure
+        self.flush()
+
+    def add(self, entity):
+        """
+        add the given entity - the batch is stored when it is full
+
+        Args:
+            entity: the entity to add
+        """
+        self.batch.append(entity)
+        if len(self.batch) >= self.batchSize:
+            self.flush()
+
+    def addAll(self, entities: Iterable):
+        """
+        add all the given entities
+
+        Args:
+            entities(Iterable): the entities to add
+        """
+        for entity in entities:
+            self.add(entity)
+
+    def flush(self):
+        """
+        store the buffered entities
+        """
+        if self.batch:
+            batch = self.batch
+            self.batch = []
+            if self.beforeFlush:
+                self.beforeFlush(batch)
+            lod = self.em.getStoreRecords(batch)
+            self.em.storeLoD(lod, append=True, replace=self.replace)
+            self.count += len(batch)
+            self.batchCount += 1
@@ -4,6 +4,7 @@ Created on 2023-11-17
 @author: wf
 """
 
+from lodstorage.storageconfig import StoreMode
 from ngwidgets.lod_grid import GridConfig, ListOfDictsGrid
 from ngwidgets.widgets import Link
 from nicegui import ui
@@ -16,10 +17,18 @@ class EntityManagerView:
     a view for a given entity manager
     """
 
-    def __init__(self, em: EntityManager, key_col: str = "name", debug: bool = False):
+    def __init__(
+        self,
+        em: EntityManager,
+        key_col: str = "name",
+        debug: bool = False,
+        max_rows: int = 1000,
+    ):
         self.em = em
         self.key_col = key_col
         self.debug = debug
+        # only the first max_rows entities are materialized for the grid
+        self.max_rows = max_rows
         self.title = self.em.entityPluralName
         self.setup_view()
 
@@ -59,11 +68,26 @@ class EntityManagerView:
     def defaultRowHandler(self, row):
         self.linkColumn("url", row, formatWith="%s")
 
+    def showMeta(self):
+        """
+        show the row count and last store time of my entity manager's table
+        """
+        if self.em.config.mode is StoreMode.SQL:
+            meta = self.em.getMeta()
+            if meta is not None:
+                lastStored = meta["lastStored"]
+                stored = f"{lastStored:%Y-%m-%d %H:%M}" if lastStored else "?"
+                ui.label(f"{meta['rowCount']} {self.title} stored {stored}")
+
     def show(self, rowHandler=None, lodKeyHandler=None):
         """
         show my given entity manager
         """
-        records = self.em.getList()
+        self.showMeta()
+        entities = self.em.getList()
+        records = entities[: self.max_rows]
+        if len(entities) > len(records):
+            ui.label(f"showing {len(records)} of {len(entities)} {self.title}")
         if len(records) > 0:
             firstRecord = records[0]
             lodKeys = list(firstRecord.getJsonTypeSamples()[0].keys())
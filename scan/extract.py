@@ -0,0 +1,258 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, Iterator, List, Set
+
+import fitz  # PyMuPDF
+
+from scan.dms import DMSStorage, Document, Folder, OcrPool
+
+
+@dataclass
+class ExtractStats:
+    """
+    throughput statistics of a batch text extraction
+    """
+
+    files: int = 0
+    pages: int = 0
+    bytes: int = 0
+    failures: int = 0
+    skipped: int = 0
+    startTime: float = field(default_factory=time.time)
+
+    def add(self, result: dict):
+        """
+        add the given extraction result
+        """
+        self.files += 1
+        self.pages += result.get("pages", 0)
+        self.bytes += result.get("size", 0)
+        if not result.get("ok"):
+            self.failures += 1
+
+    @property
+    def elapsed(self) -> float:
+        return max(time.time() - self.startTime, 1e-9)
+
+    @property
+    def pagesPerSecond(self) -> float:
+        return self.pages / self.elapsed
+
+    @property
+    def mbPerSecond(self) -> float:
+        return self.bytes / 1024 / 1024 / self.elapsed
+
+    def __str__(self):
+        text = (
+            f"{self.files} files {self.pages} pages {self.bytes/1024/1024:.1f} MB "
+            f"in {self.elapsed:.1f} s: {self.pagesPerSecond:.1f} pages/s "
+            f"{self.mbPerSecond:.2f} MB/s {self.failures} failures {self.skipped} skipped"
+        )
+        return text
+
+
+class BatchExtractor:
+    """
+    extract the texts of all PDF files of folder trees with a pool of processes
+
+    the texts end up in the central text cache - the progress is checkpointed
+    as one JSON line per file so that an interrupted run resumes where it stopped
+    """
+
+    def __init__(
+        self,
+        rootPaths: List[str],
+        checkpointPath: str = None,
+        max_workers: int = None,
+        chunksize: int = 4,
+        extension: str = ".pdf",
+    ):
+        """
+        constructor
+
+        Args:
+            rootPaths(list): the archive or folder paths to extract the texts of
+            checkpointPath(str): the checkpoint file - default: one per root paths in the dms cache
+            max_workers(int): the number of worker processes - None for the number of CPUs
+            chunksize(int): the number of files handed to a worker at once
+            extension(str): the extension of the files to extract
+        """
+        self.rootPaths = [os.path.abspath(rootPath) for rootPath in rootPaths]
+        if checkpointPath is None:
+            checkpointPath = self.getCheckpointPath(self.rootPaths)
+        self.checkpointPath = checkpointPath
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunksize = max(1, chunksize)
+        # the number of files to keep in flight
+        self.window = self.max_workers * self.chunksize * 4
+        self.extension = extension
+
+    @staticmethod
+    def getCheckpointPath(rootPaths: List[str]) -> str:
+        """
+        get the default checkpoint path for the given root paths
+
+        Args:
+            rootPaths(list): the absolute root paths
+
+        Returns:
+            str: the path of the checkpoint file in the dms cache directory
+        """
+        key = hashlib.sha1("\n".join(rootPaths).encode("utf-8")).hexdigest()[:12]
+        cacheDir = DMSStorage.getStorageConfig(mode="sql").getCachePath()
+        checkpointPath = os.path.join(cacheDir, "extract", f"{key}.jsonl")
+        return checkpointPath
+
+    def iterFiles(self) -> Iterator[str]:
+        """
+        iterate over the files of interest of my root paths - hidden directories are skipped
+
+        Yields:
+            str: the full path of each file in a stable order
+        """
+        for rootPath in self.rootPaths:
+            if os.path.isfile(rootPath):
+                yield rootPath
+                continue
+            for dirPath, dirNames, fileNames in os.walk(rootPath):
+                dirNames[:] = sorted(
+                    name for name in dirNames if not name.startswith(".")
+                )
+                for fileName in sorted(fileNames):
+                    if Folder.isFileOfInterest(fileName, self.extension):
+                        yield os.path.join(dirPath, fileName)
+
+    def readCheckpoint(self, withFailures: bool = True) -> Set[str]:
+        """
+        read the paths of the files that have been processed
+
+        Args:
+            withFailures(bool): if False the failed files are not considered processed
+
+        Returns:
+            set: the processed paths
+        """
+        done = set()
+        if os.path.isfile(self.checkpointPath):
+            with open(self.checkpointPath, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        result = json.loads(line)
+                    except json.JSONDecodeError:
+                        # a line cut off by an interruption
+                        continue
+                    if withFailures or result.get("ok"):
+                        done.add(result["path"])
+        return done
+
+    @staticmethod
+    def extractFile(path: str) -> dict:
+        """
+        extract the text of the given file - the picklable entry point for worker processes
+
+        Args:
+            path(str): the full path of the file
+
+        Returns:
+            dict: the path, size, pages, ok and error of the extraction
+        """
+        result = {"path": path, "size": 0, "pages": 0, "ok": False}
+        try:
+            result["size"] = os.path.getsize(path)
+            with fitz.open(path) as pdf:
+                result["pages"] = pdf.page_count
+            Document.ofPath(path).getOcrText()
+            result["ok"] = True
+        except Exception as ex:
+            result["error"] = str(ex)
+        return result
+
+    @staticmethod
+    def extractFiles(paths: List[str]) -> List[dict]:
+        """
+        extract the texts of the given chunk of files in a worker process
+
+        Args:
+            paths(list): the full paths of the files
+
+        Returns:
+            list: the result of each file - see extractFile
+        """
+        results = [BatchExtractor.extractFile(path) for path in paths]
+        return results
+
+    def run(
+        self, retryFailures: bool = False, progress: Callable = None
+    ) -> ExtractStats:
+        """
+        extract the texts of all files that have not been processed yet
+
+        Args:
+            retryFailures(bool): if True the files that failed before are tried again
+            progress(Callable): called with the stats and result of each file
+
+        Returns:
+            ExtractStats: the statistics of this run
+        """
+        stats = ExtractStats()
+        done = self.readCheckpoint(withFailures=not retryFailures)
+        os.makedirs(os.path.dirname(self.checkpointPath) or ".", exist_ok=True)
+
+        def todo():
+            for path in self.iterFiles():
+                if path in done:
+                    stats.skipped += 1
+                else:
+                    yield path
+
+        with open(self.checkpointPath, "a", encoding="utf-8") as checkpoint:
+
+            def record(result: dict):
+                checkpoint.write(json.dumps(result) + "\n")
+                checkpoint.flush()
+                stats.add(result)
+                if progress:
+                    progress(stats, result)
+
+            if self.max_workers == 1:
+                for path in todo():
+                    record(self.extractFile(path))
+            else:
+                executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=OcrPool.initWorker,
+                    initargs=(DMSStorage.cacheRootDir,),
+                )
+                try:
+                    paths = todo()
+                    # a new chunk is submitted as soon as one completes
+                    # so that the workers never wait for the slowest file of a batch
+                    inFlight = set()
+                    while True:
+                        while len(inFlight) < self.window // self.chunksize:
+                            chunk = list(islice(paths, self.chunksize))
+                            if not chunk:
+                                break
+                            inFlight.add(executor.submit(self.extractFiles, chunk))
+                        if not inFlight:
+                            break
+                        finished, inFlight = wait(inFlight, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            for result in future.result():
+                                record(result)
+                finally:
+                    executor.shutdown(cancel_futures=True)
+        return stats
@@ -0,0 +1,121 @@
+"""
+Created on 2026-10-17
+
+extract_cmd - CLI to extract the texts of whole archives ahead of time
+
+@author: wf
+"""
+
+import os
+import sys
+from argparse import ArgumentParser, Namespace
+
+from basemkit.base_cmd import BaseCmd
+
+from scan.dms import DMSStorage
+from scan.extract import BatchExtractor, ExtractStats
+from scan.version import Version
+
+
+class ExtractCmd(BaseCmd):
+    """
+    Command line for the resumable batch text extraction
+    """
+
+    def add_arguments(self, parser: ArgumentParser):
+        """
+        add the extraction arguments to the standard arguments
+        """
+        super().add_arguments(parser)
+        parser.add_argument(
+            "paths",
+            nargs="+",
+            help="archive or folder paths to extract the PDF texts of",
+        )
+        parser.add_argument(
+            "-w",
+            "--workers",
+            type=int,
+            default=DMSStorage.getOcrWorkers(),
+            help="number of worker processes [default: %(default)s]",
+        )
+        parser.add_argument(
+            "--chunksize",
+            type=int,
+            default=DMSStorage.getOcrChunkSize(),
+            help="number of files handed to a worker at once [default: %(default)s]",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="checkpoint file to resume from [default: one per paths in the dms cache]",
+        )
+        parser.add_argument(
+            "--retry",
+            action="store_true",
+            help="retry the files that failed in a former run",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="ignore the checkpoint of a former run",
+        )
+        parser.add_argument(
+            "--every",
+            type=int,
+            default=100,
+            help="show the throughput every given number of files [default: %(default)s]",
+        )
+
+    def handle_args(self, args: Namespace) -> bool:
+        """
+        run the extraction
+        """
+        handled = super().handle_args(args)
+        if handled:
+            return handled
+        extractor = BatchExtractor(
+            args.paths,
+            checkpointPath=args.checkpoint,
+            max_workers=args.workers,
+            chunksize=args.chunksize,
+        )
+        if args.restart and os.path.isfile(extractor.checkpointPath):
+            os.remove(extractor.checkpointPath)
+        if not self.quiet:
+            print(f"extracting {' '.join(extractor.rootPaths)}")
+            print(f"checkpoint {extractor.checkpointPath}")
+        stats = extractor.run(retryFailures=args.retry, progress=self.showProgress)
+        if not self.quiet:
+            print(stats)
+        if stats.failures:
+            self.exit_code = 1
+        return True
+
+    def showProgress(self, stats: ExtractStats, result: dict):
+        """
+        show the failures and the throughput every args.every files
+        """
+        if self.quiet:
+            return
+        if not result["ok"]:
+            print(f"error {result['path']}:{result.get('error')}", file=sys.stderr)
+        elif self.verbose:
+            print(f"{result['path']}: {result['pages']} pages")
+        if self.args.every and stats.files % self.args.every == 0:
+            print(stats)
+
+
+def main(argv: list = None):
+    """
+    main call
+    """
+    cmd = ExtractCmd(version=Version)
+    exit_code = cmd.run(argv)
+    return exit_code
+
+
+DEBUG = 0
+if __name__ == "__main__":
+    if DEBUG:
+        sys.argv.append("-d")
+    sys.exit(main())
@@ -17,18 +17,43 @@ class Watcher:
     watch the given path with the given callback
     """
 
-    def __init__(self, path, patterns=["*.pdf", "*.jpg"], debug=False):
+    def __init__(self, path, patterns=["*.pdf", "*.jpg"], debug=False, recursive=True):
         """
         construct me for the given path
         Args:
             path(str): the directory to observer
             patterns(list): a list of wildcard patterns
             debug(bool): True if debugging should be switched on
+            recursive(bool): if True also watch the subdirectories
         """
         self.observer = Observer()
         self.path = path
         self.patterns = patterns
         self.debug = debug
+        self.recursive = recursive
+
+    def start(self, callback, all_events=False):
+        """
+        start watching in the background
+
+        Args:
+            callback(func): the function to trigger when a file appears
+            all_events(bool): if True the callback gets every event instead of the modified paths
+        """
+        event_handler = Handler(
+            callback, patterns=self.patterns, debug=self.debug, all_events=all_events
+        )
+        self.observer.schedule(event_handler, self.path, recursive=self.recursive)
+        self.observer.daemon = True
+        self.observer.start()
+
+    def stop(self):
+        """
+        stop watching
+        """
+        if self.observer.is_alive():
+            self.observer.stop()
+            self.observer.join()
 
     def run(self, callback, sleepTime=1, limit=sys.maxsize):
         """
@@ -40,7 +65,7 @@ class Watcher:
             limit(float): the maximum time to run the server default: unlimited
         """
         event_handler = Handler(callback, patterns=self.patterns, debug=self.debug)
-        self.observer.schedule(event_handler, self.path, recursive=True)
+        self.observer.schedule(event_handler, self.path, recursive=self.recursive)
         self.observer.start()
         runTime = 0
         try:
@@ -63,7 +88,7 @@ class Handler(PatternMatchingEventHandler):
     handle changes for a given wildcard pattern
     """
 
-    def __init__(self, callback, patterns, debug=False):
+    def __init__(self, callback, patterns, debug=False, all_events=False):
         """
         construct me
 
@@ -71,9 +96,11 @@ class Handler(PatternMatchingEventHandler):
             callback: the function to call
             patterns: the patterns to trigger on
             debug(bool): if True print debug output
+            all_events(bool): if True call back with every event instead of the modified paths
         """
         self.callback = callback
         self.debug = debug
+        self.all_events = all_events
         # Set the patterns for PatternMatchingEventHandler
         PatternMatchingEventHandler.__init__(
             self,
@@ -89,5 +116,7 @@ class Handler(PatternMatchingEventHandler):
                     time.asctime(), event.event_type, event.src_path
                 )
             )
-        if "modified" == event.event_type:
+        if self.all_events:
+            self.callback(event)
+        elif "modified" == event.event_type:
             self.callback(event.src_path)
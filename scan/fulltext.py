@@ -0,0 +1,338 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import html
+from typing import Optional
+
+from lodstorage.sql import SQLDB
+
+from scan.sqlpool import SQLConnectionPool
+from scan.textstore import TextStore
+
+
+class FullTextIndex:
+    """
+    SQLite FTS5 full text index over the page title and OCR text of the documents
+
+    the index is an external content table over a view of the documents
+    and their compressed texts so that the texts are not stored a second
+    time - the rowid of an index entry is the rowid of its document and
+    entries are removed with the values they have been indexed with so they
+    need to be deleted before their document or text changes
+    """
+
+    # control characters marking highlighted terms before html escaping
+    START_MARK = "\x02"
+    END_MARK = "\x03"
+    # the SQL function the content view decompresses the texts with
+    DECODE_FUNCTION = "textstore_decode"
+
+    def __init__(
+        self,
+        dbFile: str,
+        tableName: str = "document_fts",
+        contentTable: str = "document",
+        textStore: TextStore = None,
+    ):
+        """
+        constructor
+
+        Args:
+            dbFile(str): the path to the SQLite database
+            tableName(str): the name of the FTS5 virtual table
+            contentTable(str): the name of the table with the documents
+            textStore(TextStore): the store of the OCR texts - None if they are inline
+        """
+        self.dbFile = dbFile
+        self.tableName = tableName
+        self.contentTable = contentTable
+        self.textStore = textStore
+        # the view the index takes its content from
+        self.viewName = f"{tableName}_view"
+
+    @staticmethod
+    def toMatchQuery(text: str) -> str:
+        """
+        convert the given search text to an FTS5 MATCH expression
+        where all terms need to be present - a trailing * is kept for prefix searches
+
+        Args:
+            text(str): the search text e.g. ALDI Rechn*
+
+        Returns:
+            str: the MATCH expression e.g. "ALDI" AND "Rechn"*
+        """
+        terms = []
+        for term in text.split():
+            prefix = term.endswith("*")
+            term = term.rstrip("*").replace('"', '""')
+            if term:
+                terms.append(f'"{term}"*' if prefix else f'"{term}"')
+        matchQuery = " AND ".join(terms)
+        return matchQuery
+
+    def getPool(self) -> SQLConnectionPool:
+        """
+        get the connection pool of my database - its connections
+        can decompress the texts of the content view
+        """
+        pool = SQLConnectionPool.getPool(self.dbFile)
+        pool.createFunction(FullTextIndex.DECODE_FUNCTION, 1, TextStore.decode)
+        return pool
+
+    def getSchema(self, sqlDB: SQLDB, name: str) -> Optional[str]:
+        """
+        get the SQL the given table or view has been created with
+
+        Args:
+            sqlDB(SQLDB): the database connection to use
+            name(str): the name of the table or view
+
+        Returns:
+            str: the SQL or None if there is no such table or view
+        """
+        row = sqlDB.c.execute(
+            "SELECT sql FROM sqlite_master WHERE name=(?)", (name,)
+        ).fetchone()
+        schema = row[0] if row is not None else None
+        return schema
+
+    def exists(self, sqlDB: SQLDB) -> bool:
+        """
+        check whether my virtual table exists as external content table
+        - the index of former versions kept a copy of the texts
+
+        Args:
+            sqlDB(SQLDB): the database connection to use
+
+        Returns:
+            bool: True if the index table exists
+        """
+        schema = self.getSchema(sqlDB, self.tableName)
+        return schema is not None and "content=" in schema
+
+    def getViewSQL(self) -> str:
+        """
+        get the SQL of the view of the indexed values
+        """
+        if self.textStore is None:
+            viewSQL = f"""SELECT rowid AS docid,url,pageTitle,ocrText FROM {self.contentTable}"""
+        else:
+            viewSQL = f"""SELECT d.rowid AS docid,d.url AS url,d.pageTitle AS pageTitle,
+COALESCE({FullTextIndex.DECODE_FUNCTION}(t.data),d.ocrText) AS ocrText
+FROM {self.contentTable} d LEFT JOIN {self.textStore.tableName} t ON t.url=d.url"""
+        return viewSQL
+
+    def create(self, sqlDB: SQLDB, withDrop: bool = False):
+        """
+        create my content view and virtual table
+
+        Args:
+            sqlDB(SQLDB): the database connection to use
+            withDrop(bool): if True drop an existing index first
+        """
+        if withDrop:
+            sqlDB.execute(f"DROP TABLE IF EXISTS {self.tableName}")
+        if self.textStore is not None:
+            self.textStore.ensure(sqlDB)
+        sqlDB.execute(f"DROP VIEW IF EXISTS {self.viewName}")
+        sqlDB.execute(f"CREATE VIEW {self.viewName} AS {self.getViewSQL()}")
+        sqlDB.execute(
+            f"""CREATE VIRTUAL TABLE IF NOT EXISTS {self.tableName} USING fts5(
+  url UNINDEXED,
+  pageTitle,
+  ocrText,
+  content='{self.viewName}',
+  content_rowid='docid',
+  tokenize='unicode61 remove_diacritics 2'
+)"""
+        )
+
+    def ensure(self, sqlDB: SQLDB) -> bool:
+        """
+        make sure the index exists - a missing index is created
+        and filled from the content table
+
+        Args:
+            sqlDB(SQLDB): the database connection to use
+
+        Returns:
+            bool: False if there is no content table to index yet
+        """
+        if self.getSchema(sqlDB, self.contentTable) is None:
+            return False
+        if not self.exists(sqlDB):
+            with self.getPool().writeLock:
+                self.create(sqlDB, withDrop=True)
+                self.fill(sqlDB)
+        return True
+
+    def getEntries(self, sqlDB: SQLDB, urls: list) -> list:
+        """
+        get the indexed values of the documents with the given urls
+
+        Args:
+            sqlDB(SQLDB): the database connection to use
+            urls(list): the urls of the documents
+
+        Returns:
+            list: (docid, url, pageTitle, ocrText) tuples
+        """
+        entries = []
+        for start in range(0, len(urls), 500):
+            chunk = urls[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            entries.extend(
+                sqlDB.c.execute(
+                    f"SELECT docid,url,pageTitle,ocrText FROM {self.viewName} WHERE url IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+            )
+        return entries
+
+    def add(self, urls: list):
+        """
+        index the stored documents with the given urls
+
+        Args:
+            urls(list): the urls of the documents
+        """
+        urls = [url for url in urls if url]
+        if urls:
+            with self.getPool().writer() as sqlDB:
+                if self.ensure(sqlDB):
+                    sqlDB.c.executemany(
+                        f"INSERT INTO {self.tableName}(rowid,url,pageTitle,ocrText) VALUES (?,?,?,?)",
+                        self.getEntries(sqlDB, urls),
+                    )
+
+    def delete(self, urls: list):
+        """
+        delete the index entries of the given urls - to be called before
+        the documents or their texts are changed or deleted
+
+        Args:
+            urls(list): the urls of the documents
+        """
+        urls = [url for url in urls if url]
+        if urls:
+            with self.getPool().writer() as sqlDB:
+                if self.ensure(sqlDB):
+                    sqlDB.c.executemany(
+                        f"INSERT INTO {self.tableName}({self.tableName},rowid,url,pageTitle,ocrText) VALUES ('delete',?,?,?,?)",
+                        self.getEntries(sqlDB, urls),
+                    )
+
+    def fill(self, sqlDB: SQLDB) -> int:
+        """
+        index all documents of the content table from scratch
+
+        Args:
+            sqlDB(SQLDB): the database connection to use
+
+        Returns:
+            int: the number of indexed documents
+        """
+        sqlDB.execute(
+            f"INSERT INTO {self.tableName}({self.tableName}) VALUES ('rebuild')"
+        )
+        row = sqlDB.c.execute(f"SELECT COUNT(*) FROM {self.viewName}").fetchone()
+        sqlDB.c.commit()
+        return row[0]
+
+    def rebuild(self) -> int:
+        """
+        rebuild the index from scratch
+
+        Returns:
+            int: the number of indexed documents
+        """
+        count = 0
+        with self.getPool().writer() as sqlDB:
+            if self.ensure(sqlDB):
+                count = self.fill(sqlDB)
+        return count
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        archiveName: str = None,
+        raw: bool = False,
+        asHtml: bool = True,
+        snippetTokens: int = 16,
+    ) -> list:
+        """
+        search the index ordered by relevance
+
+        Args:
+            query(str): the search text - or an FTS5 MATCH expression if raw is True
+            limit(int): the maximum number of results
+            offset(int): the number of results to skip
+            archiveName(str): if set only search the documents of this archive
+            raw(bool): if True use the query as FTS5 MATCH expression
+            asHtml(bool): if True escape title and snippet and highlight the
+                matching terms with <mark> - else use START_MARK and END_MARK
+            snippetTokens(int): the maximum number of tokens of a snippet
+
+        Returns:
+            list: dicts with url, archiveName, folderPath, name, lastModified,
+            title (highlighted pageTitle), snippet (highlighted ocrText) and rank
+        """
+        matchQuery = query if raw else FullTextIndex.toMatchQuery(query)
+        results = []
+        if matchQuery:
+            fts = self.tableName
+            archiveClause = "AND d.archiveName=(?)" if archiveName else ""
+            # the page is selected by rank first so that only the texts of
+            # its rows are decoded for the highlighted title and snippet
+            sqlQuery = f"""SELECT d.url AS url,
+  d.archiveName AS archiveName,
+  d.folderPath AS folderPath,
+  d.name AS name,
+  d.lastModified AS lastModified,
+  highlight({fts},1,?,?) AS title,
+  snippet({fts},2,?,?,'…',?) AS snippet,
+  bm25({fts}) AS rank
+FROM {fts} LEFT JOIN {self.contentTable} d ON d.rowid={fts}.rowid
+WHERE {fts} MATCH (?) AND {fts}.rowid IN (
+  SELECT {fts}.rowid FROM {fts} LEFT JOIN {self.contentTable} d ON d.rowid={fts}.rowid
+  WHERE {fts} MATCH (?) {archiveClause}
+  ORDER BY bm25({fts})
+  LIMIT (?) OFFSET (?)
+)
+ORDER BY rank"""
+            marks = [FullTextIndex.START_MARK, FullTextIndex.END_MARK]
+            params = marks + marks + [snippetTokens]
+            params.extend([matchQuery, matchQuery])
+            if archiveName:
+                params.append(archiveName)
+            params.extend([limit, offset])
+            sqlDB = self.getPool().getSQLDB()
+            if self.ensure(sqlDB):
+                results = sqlDB.query(sqlQuery, tuple(params))
+            if asHtml:
+                for record in results:
+                    for key in ["title", "snippet"]:
+                        record[key] = FullTextIndex.toHtml(record[key])
+        return results
+
+    @staticmethod
+    def toHtml(text: str) -> str:
+        """
+        escape the given highlighted text and mark the highlighted terms
+
+        Args:
+            text(str): text with START_MARK and END_MARK
+
+        Returns:
+            str: html markup with <mark> elements
+        """
+        markup = html.escape(text or "")
+        markup = markup.replace(FullTextIndex.START_MARK, "<mark>")
+        markup = markup.replace(FullTextIndex.END_MARK, "</mark>")
+        return markup
@@ -0,0 +1,347 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from scan.folderwatcher import Watcher
+from scan.logger import Logger
+from scan.scans import Scans
+
+
+@dataclass
+class InboxDelta:
+    """
+    the row changes of the scan inbox - reload means the rows
+    have to be loaded completely e.g. after the directory changed
+    """
+
+    add: List[Dict[str, Any]] = field(default_factory=list)
+    update: List[Dict[str, Any]] = field(default_factory=list)
+    remove: List[Dict[str, Any]] = field(default_factory=list)
+    reload: bool = False
+
+    def is_empty(self) -> bool:
+        empty = not (self.add or self.update or self.remove or self.reload)
+        return empty
+
+    def as_transaction(self) -> Dict[str, Any]:
+        """
+        get me as an ag-grid row transaction - new scans are added on top
+        """
+        transaction = {
+            "add": self.add,
+            "addIndex": 0,
+            "update": self.update,
+            "remove": self.remove,
+        }
+        return transaction
+
+    def apply_to(self, lod: List[Dict[str, Any]], key_col: str = "#"):
+        """
+        apply me to the given list of rows in place
+
+        Args:
+            lod(list): the rows
+            key_col(str): the column identifying the rows
+        """
+        updates = {row[key_col]: row for row in self.update}
+        removes = {row[key_col] for row in self.remove}
+        lod[:] = [
+            updates.get(row[key_col], row) for row in lod if row[key_col] not in removes
+        ]
+        lod[0:0] = self.add
+
+
+@dataclass
+class InboxPage:
+    """
+    a window of the sorted and filtered rows of the scan inbox
+    """
+
+    rows: List[Dict[str, Any]]
+    total: int
+    offset: int
+    limit: int
+
+    @property
+    def pages(self) -> int:
+        pages = max(1, -(-self.total // self.limit))
+        return pages
+
+
+class InboxIndex:
+    """
+    in memory index of the grid rows of the scan inbox that is kept
+    up to date by file system events
+
+    the rows are identified by their "#" number which stays stable
+    for a file - the changes are published as deltas to the subscribers
+    """
+
+    def __init__(self, scans: Scans, allowed_extensions: List[str] = [".pdf", ".jpg"]):
+        """
+        constructor
+
+        Args:
+            scans(Scans): the scans of the inbox directory
+            allowed_extensions(list): the extensions of the files to show
+        """
+        self.scans = scans
+        self.allowed_extensions = allowed_extensions
+        # the rows by file name
+        self.rows = {}
+        self.counter = 0
+        self.lock = threading.RLock()
+        self.subscribers = []
+        self.watcher = None
+        # the file names in ascending order by sort column - cleared on changes
+        self.sorted_names = {}
+
+    # the sort keys of the (name, row) items by sortable column
+    SORT_KEYS = {
+        "lastModified": lambda item: (item[1]["lastModified"], item[0]),
+        "size": lambda item: (item[1].get("size") or 0, item[0]),
+        "name": lambda item: (item[0].lower(), item[0]),
+    }
+
+    def load(self):
+        """
+        load all rows of the inbox - the rows are numbered newest first
+        """
+        with self.lock:
+            scan_rows = self.scans.get_scan_rows(self.allowed_extensions)
+            sorted_rows = Scans.sort_rows(scan_rows.values())
+            for index, row in enumerate(sorted_rows):
+                row["#"] = index + 1
+            self.rows = scan_rows
+            self.counter = len(sorted_rows)
+            self.sorted_names.clear()
+
+    def get_rows(self) -> List[Dict[str, Any]]:
+        """
+        get copies of all rows newest first
+        """
+        with self.lock:
+            rows = Scans.sort_rows(dict(row) for row in self.rows.values())
+        return rows
+
+    def get_sorted_names(self, sort_by: str) -> List[str]:
+        """
+        get the file names in ascending order of the given column - needs my lock
+        """
+        names = self.sorted_names.get(sort_by)
+        if names is None:
+            sort_key = InboxIndex.SORT_KEYS.get(sort_by)
+            if sort_key is None:
+                raise ValueError(f"can't sort by {sort_by}")
+            names = [name for name, _row in sorted(self.rows.items(), key=sort_key)]
+            self.sorted_names[sort_by] = names
+        return names
+
+    def query(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        sort_by: str = "lastModified",
+        descending: bool = True,
+        filter_text: str = None,
+    ) -> InboxPage:
+        """
+        get a window of my rows
+
+        Args:
+            offset(int): the index of the first row
+            limit(int): the maximum number of rows
+            sort_by(str): lastModified, size or name
+            descending(bool): if True sort in descending order
+            filter_text(str): only rows whose file name or text head contain this text (if any)
+
+        Returns:
+            InboxPage: copies of the rows of the window and the total number of matching rows
+        """
+        limit = max(1, limit)
+        with self.lock:
+            names = self.get_sorted_names(sort_by)
+            if descending:
+                names = names[::-1]
+            if filter_text:
+                needle = filter_text.lower()
+                names = [
+                    name
+                    for name in names
+                    if needle in name.lower()
+                    or needle in (self.rows[name].get("textHead") or "").lower()
+                ]
+            offset = max(0, offset)
+            rows = [dict(self.rows[name]) for name in names[offset : offset + limit]]
+        page = InboxPage(rows=rows, total=len(names), offset=offset, limit=limit)
+        return page
+
+    def start(self):
+        """
+        load the rows and start watching the inbox directory
+        """
+        self.load()
+        try:
+            patterns = [f"*{ext}" for ext in self.allowed_extensions] + ["*.txt"]
+            self.watcher = Watcher(
+                self.scans.scandir, patterns=patterns, recursive=False
+            )
+            self.watcher.start(self.on_watch_event, all_events=True)
+        except Exception as ex:
+            self.watcher = None
+            Logger.log(f"can't watch {self.scans.scandir}: {str(ex)}")
+
+    def stop(self):
+        """
+        stop watching the inbox directory
+        """
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+    def set_scans(self, scans: Scans):
+        """
+        switch to the given scans directory - the subscribers have to reload
+        """
+        self.stop()
+        with self.lock:
+            self.scans = scans
+        self.start()
+        self.publish(InboxDelta(reload=True))
+
+    def subscribe(self) -> queue.SimpleQueue:
+        """
+        get a queue receiving my deltas
+        """
+        subscriber = queue.SimpleQueue()
+        with self.lock:
+            self.subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.SimpleQueue):
+        with self.lock:
+            if subscriber in self.subscribers:
+                self.subscribers.remove(subscriber)
+
+    def publish(self, delta: InboxDelta):
+        if not delta.is_empty():
+            with self.lock:
+                subscribers = list(self.subscribers)
+            for subscriber in subscribers:
+                subscriber.put(delta)
+
+    def on_watch_event(self, event):
+        """
+        handle the given watchdog event
+        """
+        dest_path = getattr(event, "dest_path", None) or None
+        self.on_event(event.event_type, event.src_path, dest_path)
+
+    def on_event(
+        self, event_type: str, src_path: str, dest_path: Optional[str] = None
+    ) -> InboxDelta:
+        """
+        apply the given file system event to my rows and publish the delta
+
+        Args:
+            event_type(str): created, modified, closed, deleted or moved
+            src_path(str): the path of the file
+            dest_path(str): the new path of a moved file
+
+        Returns:
+            InboxDelta: the changes of the rows
+        """
+        delta = InboxDelta()
+        try:
+            if event_type in ("deleted", "moved"):
+                self.remove_file(src_path, delta)
+            if event_type in ("created", "modified", "closed"):
+                self.update_file(src_path, delta)
+            if event_type == "moved" and dest_path:
+                self.update_file(dest_path, delta)
+        except Exception as ex:
+            Logger.log(f"error {str(ex)} for {event_type} {src_path}")
+        self.publish(delta)
+        return delta
+
+    def get_name(self, path: str) -> Optional[str]:
+        """
+        get the file name of the given path if it is in the inbox directory
+        """
+        name = None
+        directory, file_name = os.path.split(os.path.abspath(path))
+        if directory == os.path.abspath(self.scans.scandir):
+            name = file_name
+        return name
+
+    def get_document_names(self, text_name: str) -> List[str]:
+        """
+        get the names of the documents the given text file belongs to
+        """
+        basename = os.path.splitext(text_name)[0]
+        names = [
+            f"{basename}{ext}"
+            for ext in self.allowed_extensions
+            if f"{basename}{ext}" != text_name
+        ]
+        return names
+
+    def update_file(self, path: str, delta: InboxDelta):
+        """
+        add or update the row of the given file - the row is built
+        via the row cache of my scans without holding my lock
+        """
+        name = self.get_name(path)
+        if name is None:
+            return
+        if name.endswith(".txt"):
+            for doc_name in self.get_document_names(name):
+                self.update_file(self.scans.get_full_path(doc_name), delta)
+        if not self.scans.is_valid_name(name, self.allowed_extensions):
+            return
+        if not os.path.isfile(path):
+            self.remove_file(path, delta)
+            return
+        row = self.scans.get_cached_file_row(name)
+        with self.lock:
+            old_row = self.rows.get(name)
+            if old_row is not None:
+                row["#"] = old_row["#"]
+                if row == old_row:
+                    # e.g. one of the many events of a file being written
+                    return
+                delta.update.append(dict(row))
+            else:
+                self.counter += 1
+                row["#"] = self.counter
+                delta.add.append(dict(row))
+            self.rows[name] = row
+            self.sorted_names.clear()
+
+    def remove_file(self, path: str, delta: InboxDelta):
+        """
+        remove the row of the given file
+        """
+        name = self.get_name(path)
+        if name is None:
+            return
+        with self.lock:
+            row = self.rows.pop(name, None)
+            if row is not None:
+                self.sorted_names.clear()
+                delta.remove.append({"#": row["#"]})
+            doc_names = [
+                doc_name
+                for doc_name in self.get_document_names(name)
+                if name.endswith(".txt") and doc_name in self.rows
+            ]
+        for doc_name in doc_names:
+            self.update_file(self.scans.get_full_path(doc_name), delta)
@@ -0,0 +1,256 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import mmap
+import os
+import pickle
+import struct
+from typing import Any, Dict, Iterable, Iterator, List
+
+
+class LoDFile:
+    """
+    compact binary file of a list of dicts
+
+    the records are stored in length prefixed frames of up to batchSize
+    records - each frame holds the column names once and the rows as value
+    tuples pickled with a fixed protocol that stays readable across python
+    versions so that the file can be read frame by frame from a memory map
+
+    the frames are trusted local cache data - never read files of others
+    """
+
+    MAGIC = b"S2WLOD\x00\x01"
+    PICKLE_PROTOCOL = 4
+    FRAME_HEADER = struct.Struct("<I")
+    # the value of a column that is not in a record
+    MISSING = ...
+
+    def __init__(self, path: str, batchSize: int = 1000):
+        """
+        constructor
+
+        Args:
+            path(str): the path of the file
+            batchSize(int): the maximum number of records per frame
+        """
+        self.path = path
+        self.batchSize = max(1, batchSize)
+
+    @classmethod
+    def isLoDFile(cls, path: str) -> bool:
+        """
+        check whether the given path is a LoD file
+
+        Args:
+            path(str): the path to check
+
+        Returns:
+            bool: True if the file starts with my magic bytes
+        """
+        result = False
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                magic = f.read(len(cls.MAGIC))
+            result = magic == cls.MAGIC
+        return result
+
+    @classmethod
+    def encodeFrame(cls, records: List[Dict[str, Any]]) -> bytes:
+        """
+        encode the given records as a frame
+
+        Args:
+            records(list): the records to encode
+
+        Returns:
+            bytes: the pickled (columns, hasMissing, rows)
+        """
+        columnIndex = {}
+        for record in records:
+            for key in record:
+                if key not in columnIndex:
+                    columnIndex[key] = len(columnIndex)
+        columns = tuple(columnIndex)
+        hasMissing = False
+        rows = []
+        for record in records:
+            row = tuple(record.get(column, LoDFile.MISSING) for column in columns)
+            if not hasMissing and LoDFile.MISSING in row:
+                hasMissing = True
+            rows.append(row)
+        frame = (columns, hasMissing, rows)
+        try:
+            data = pickle.dumps(frame, protocol=LoDFile.PICKLE_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError) as ex:
+            raise ValueError(f"unsupported value in records: {ex}") from ex
+        return data
+
+    @classmethod
+    def decodeFrame(cls, data: bytes) -> List[Dict[str, Any]]:
+        """
+        decode the given frame
+
+        Args:
+            data(bytes): the pickled frame
+
+        Returns:
+            list: the records of the frame
+        """
+        columns, hasMissing, rows = pickle.loads(data)
+        records = [dict(zip(columns, row)) for row in rows]
+        if hasMissing:
+            records = [
+                {
+                    key: value
+                    for key, value in record.items()
+                    if value is not LoDFile.MISSING
+                }
+                for record in records
+            ]
+        return records
+
+    def writer(self) -> "LoDFileWriter":
+        """
+        get a writer for streaming records to my file
+        """
+        writer = LoDFileWriter(self)
+        return writer
+
+    def write(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        write the given records to my file
+
+        Args:
+            records(Iterable): the records to write
+
+        Returns:
+            int: the number of written records
+        """
+        with self.writer() as writer:
+            writer.addAll(records)
+        return writer.count
+
+    def iterFrames(self) -> Iterator[List[Dict[str, Any]]]:
+        """
+        iterate over the frames of my file
+
+        Yields:
+            list: the records of each frame
+        """
+        with open(self.path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                size = len(mm)
+                if mm[: len(LoDFile.MAGIC)] != LoDFile.MAGIC:
+                    raise ValueError(f"{self.path} is not a LoD file")
+                offset = len(LoDFile.MAGIC)
+                headerSize = LoDFile.FRAME_HEADER.size
+                while offset < size:
+                    (length,) = LoDFile.FRAME_HEADER.unpack_from(mm, offset)
+                    offset += headerSize
+                    if offset + length > size:
+                        raise ValueError(f"{self.path} is truncated")
+                    records = LoDFile.decodeFrame(mm[offset : offset + length])
+                    offset += length
+                    yield records
+
+    def iterRecords(self) -> Iterator[Dict[str, Any]]:
+        """
+        iterate over the records of my file frame by frame
+
+        Yields:
+            dict: the records
+        """
+        for records in self.iterFrames():
+            yield from records
+
+    def read(self) -> List[Dict[str, Any]]:
+        """
+        read all records of my file
+
+        Returns:
+            list: the records
+        """
+        records = []
+        for frame in self.iterFrames():
+            records.extend(frame)
+        return records
+
+
+class LoDFileWriter:
+    """
+    streaming writer of a LoDFile - the records are written to a
+    temporary file that replaces the target when the writer is closed
+    """
+
+    def __init__(self, lodFile: LoDFile):
+        """
+        constructor
+
+        Args:
+            lodFile(LoDFile): the file to write
+        """
+        self.lodFile = lodFile
+        self.tmpPath = f"{lodFile.path}.tmp"
+        dirPath = os.path.dirname(lodFile.path)
+        if dirPath:
+            os.makedirs(dirPath, exist_ok=True)
+        self.f = open(self.tmpPath, "wb")
+        self.f.write(LoDFile.MAGIC)
+        self.batch = []
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def add(self, record: Dict[str, Any]):
+        """
+        add the given record - a frame is written when the batch is full
+        """
+        self.batch.append(record)
+        if len(self.batch) >= self.lodFile.batchSize:
+            self.flush()
+
+    def addAll(self, records: Iterable[Dict[str, Any]]):
+        """
+        add all given records
+        """
+        for record in records:
+            self.add(record)
+
+    def flush(self):
+        """
+        write the pending records as a frame
+        """
+        if self.batch:
+            data = LoDFile.encodeFrame(self.batch)
+            self.f.write(LoDFile.FRAME_HEADER.pack(len(data)))
+            self.f.write(data)
+            self.count += len(self.batch)
+            self.batch = []
+
+    def close(self):
+        """
+        write the pending records and replace the target file
+        """
+        self.flush()
+        self.f.close()
+        os.replace(self.tmpPath, self.lodFile.path)
+
+    def abort(self):
+        """
+        discard the written records and keep the target file
+        """
+        self.f.close()
+        if os.path.isfile(self.tmpPath):
+            os.remove(self.tmpPath)
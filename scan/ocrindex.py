@@ -0,0 +1,145 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class OcrFiles:
+    """
+    the OCR text files of a document in a directory
+    """
+
+    # the name of the single text file basename.txt
+    textFile: Optional[str] = None
+    # the names of the page files basename_pNNN.txt by page number
+    pageFiles: Dict[int, str] = field(default_factory=dict)
+
+
+class OcrDirectoryIndex:
+    """
+    index of the OCR text files of directories
+
+    each directory is read with a single scandir and the index is
+    cached until the modification time of the directory changes so that
+    looking up the text files of a document needs no stat call per file
+    """
+
+    PAGE_PATTERN = re.compile(r"^(?P<basename>.+)_p(?P<page>\d{3,})\.txt$")
+    # the number of directory indexes to keep
+    maxDirs = 1024
+
+    indexes = OrderedDict()
+    lock = threading.Lock()
+
+    @classmethod
+    def scan(cls, dirPath: str) -> Dict[str, OcrFiles]:
+        """
+        index the text files of the given directory
+
+        Args:
+            dirPath(str): the directory
+
+        Returns:
+            dict: the OCR files by document basename
+        """
+        index = {}
+        with os.scandir(dirPath) as entries:
+            for entry in entries:
+                name = entry.name
+                if not name.endswith(".txt"):
+                    continue
+                index.setdefault(name[:-4], OcrFiles()).textFile = name
+                match = cls.PAGE_PATTERN.match(name)
+                if match:
+                    ocrFiles = index.setdefault(match.group("basename"), OcrFiles())
+                    ocrFiles.pageFiles[int(match.group("page"))] = name
+        return index
+
+    @classmethod
+    def getIndex(cls, dirPath: str) -> Dict[str, OcrFiles]:
+        """
+        get the index of the given directory - it is rebuilt when the directory changed
+
+        Args:
+            dirPath(str): the directory
+
+        Returns:
+            dict: the OCR files by document basename - empty if there is no such directory
+        """
+        dirPath = str(dirPath)
+        try:
+            mtime = os.stat(dirPath).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            return {}
+        with cls.lock:
+            cached = cls.indexes.get(dirPath)
+            if cached is not None and cached[0] == mtime:
+                cls.indexes.move_to_end(dirPath)
+                return cached[1]
+        index = cls.scan(dirPath)
+        with cls.lock:
+            cls.indexes[dirPath] = (mtime, index)
+            cls.indexes.move_to_end(dirPath)
+            while len(cls.indexes) > cls.maxDirs:
+                cls.indexes.popitem(last=False)
+        return index
+
+    @classmethod
+    def getTextFile(cls, dirPath: str, basename: str) -> Optional[str]:
+        """
+        get the path of the single text file of the given document
+
+        Args:
+            dirPath(str): the directory
+            basename(str): the basename of the document
+
+        Returns:
+            str: the path of basename.txt or None if there is none
+        """
+        ocrFiles = cls.getIndex(dirPath).get(basename)
+        textFile = None
+        if ocrFiles is not None and ocrFiles.textFile is not None:
+            textFile = os.path.join(dirPath, ocrFiles.textFile)
+        return textFile
+
+    @classmethod
+    def getPageFiles(
+        cls, dirPath: str, basename: str, maxPages: int = 1000
+    ) -> List[str]:
+        """
+        get the paths of the page files of the given document
+
+        Args:
+            dirPath(str): the directory
+            basename(str): the basename of the document
+            maxPages(int): the page number limit
+
+        Returns:
+            list: the paths of the consecutive page files starting with page 1
+        """
+        pageFiles = []
+        ocrFiles = cls.getIndex(dirPath).get(basename)
+        if ocrFiles is not None:
+            for page in range(1, maxPages):
+                name = ocrFiles.pageFiles.get(page)
+                if name is None:
+                    break
+                pageFiles.append(os.path.join(dirPath, name))
+        return pageFiles
+
+    @classmethod
+    def clear(cls):
+        """
+        forget all directory indexes
+        """
+        with cls.lock:
+            cls.indexes.clear()
@@ -4,8 +4,13 @@ Created on 2025-04-07
 @author: wf
 """
 
+import multiprocessing
 import os
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterator, List
 
 import fitz  # PyMuPDF
 
@@ -15,9 +20,180 @@ class PDFExtractor:
     PyMuPDF wrapper to get PDF Text with caching capability
     """
 
+    # the default number of processes to extract the pages of a PDF with
+    max_workers = 1
+    # the minimum number of pages for which the extraction is split across processes
+    min_parallel_pages = 32
+    # the shared process pool for the page ranges - see getExecutor
+    executor = None
+    executorLock = threading.Lock()
+
+    @classmethod
+    def iterPageTexts(
+        cls, pdfFilenamePath: str, start: int = 0, stop: int = None
+    ) -> Iterator[str]:
+        """
+        Yields the text of the pages of a PDF one by one.
+
+        Args:
+            pdfFilenamePath: Path to the PDF file
+            start: the index of the first page
+            stop: the index after the last page - None for the end of the document
+
+        Yields:
+            str: the text of each page
+        """
+        with fitz.open(pdfFilenamePath) as doc:
+            if stop is None or stop > doc.page_count:
+                stop = doc.page_count
+            for pageIndex in range(start, stop):
+                yield doc[pageIndex].get_text()
+
+    @classmethod
+    def extractPages(cls, pdfFilenamePath: str, start: int, stop: int) -> List[str]:
+        """
+        Gets the texts of the given page range - the picklable entry point
+        for worker processes which open the file independently.
+
+        Args:
+            pdfFilenamePath: Path to the PDF file
+            start: the index of the first page
+            stop: the index after the last page
+
+        Returns:
+            list: the text of each page
+        """
+        texts = list(cls.iterPageTexts(pdfFilenamePath, start, stop))
+        return texts
+
+    @classmethod
+    def limitText(cls, text: str, max_lines: int = None, max_chars: int = None) -> str:
+        """
+        Cuts the given text to the given number of lines and characters.
+
+        Args:
+            text: the text to cut
+            max_lines: the maximum number of lines - None for no limit
+            max_chars: the maximum number of characters - None for no limit
+
+        Returns:
+            str: the head of the text
+        """
+        if max_lines is not None:
+            text = "\n".join(text.split("\n", max_lines)[:max_lines])
+        if max_chars is not None:
+            text = text[:max_chars]
+        return text
+
+    @classmethod
+    def getTextHead(
+        cls,
+        pdfFilenamePath: str,
+        max_lines: int = None,
+        max_chars: int = None,
+        max_pages: int = None,
+    ) -> str:
+        """
+        Extracts the head of the text of a PDF - the extraction stops at the
+        first page that completes the requested head and nothing is cached.
+
+        Args:
+            pdfFilenamePath: Path to the PDF file
+            max_lines: the maximum number of lines - None for no limit
+            max_chars: the maximum number of characters - None for no limit
+            max_pages: the maximum number of pages to extract - None for no limit
+
+        Returns:
+            str: the head of the text
+        """
+        pageTexts = []
+        lines = 0
+        chars = 0
+        for pageText in cls.iterPageTexts(pdfFilenamePath, 0, max_pages):
+            pageTexts.append(pageText)
+            lines += pageText.count("\n")
+            chars += len(pageText)
+            if (max_lines is not None and lines >= max_lines) or (
+                max_chars is not None and chars >= max_chars
+            ):
+                break
+        text = cls.limitText("".join(pageTexts), max_lines, max_chars)
+        return text
+
+    @classmethod
+    def getExecutor(cls) -> ProcessPoolExecutor:
+        """
+        Gets the process pool shared by all extractions - it is started on first use
+        with max_workers processes or one per CPU if max_workers is not configured
+        and is kept until closeExecutor since other threads might still use it.
+        The workers are spawned since forking a threaded process such as the
+        webserver might deadlock.
+
+        Returns:
+            ProcessPoolExecutor: the shared pool
+        """
+        with cls.executorLock:
+            if cls.executor is None:
+                workers = cls.max_workers
+                if workers <= 1:
+                    workers = os.cpu_count() or 1
+                cls.executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return cls.executor
+
+    @classmethod
+    def closeExecutor(cls):
+        """
+        Shuts down the shared process pool e.g. when the webserver stops.
+        """
+        with cls.executorLock:
+            executor = cls.executor
+            cls.executor = None
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    @classmethod
+    def extractText(cls, pdfFilenamePath: str, max_workers: int = None) -> str:
+        """
+        Extracts the text of all pages of a PDF - large documents are split
+        into page ranges that are extracted by the shared pool of processes.
+
+        Args:
+            pdfFilenamePath: Path to the PDF file
+            max_workers: the number of page ranges to extract in parallel - default: cls.max_workers
+
+        Returns:
+            str: the joined text of all pages
+        """
+        if max_workers is None:
+            max_workers = cls.max_workers
+        # never start a pool from a worker process e.g. of an OCR pool
+        if max_workers > 1 and multiprocessing.parent_process() is None:
+            with fitz.open(pdfFilenamePath) as doc:
+                pageCount = doc.page_count
+            if pageCount >= cls.min_parallel_pages:
+                max_workers = min(max_workers, pageCount)
+                rangeSize = -(-pageCount // max_workers)
+                starts = list(range(0, pageCount, rangeSize))
+                stops = [start + rangeSize for start in starts]
+                executor = cls.getExecutor()
+                pageTexts = executor.map(
+                    cls.extractPages, repeat(pdfFilenamePath), starts, stops
+                )
+                text = "".join("".join(texts) for texts in pageTexts)
+                return text
+        text = "".join(cls.iterPageTexts(pdfFilenamePath))
+        return text
+
     @classmethod
     def getPDFText(
-        cls, pdfFilenamePath, throwError: bool = True, useCache: bool = True
+        cls,
+        pdfFilenamePath,
+        throwError: bool = True,
+        useCache: bool = True,
+        max_workers: int = None,
     ):
         """
         Gets text content from PDF, with optional caching.
@@ -26,6 +202,7 @@ class PDFExtractor:
             pdfFilenamePath: Path to the PDF file
             throwError: If True, raises exceptions instead of returning empty string
             useCache: If True, uses/creates a .txt cache file with the same base name
+            max_workers: the number of processes to extract the pages with - default: cls.max_workers
 
         Returns:
             str: The text content of the PDF
@@ -43,16 +220,8 @@ class PDFExtractor:
                 # Continue with PDF extraction if cache reading fails
 
         try:
-            # Open the PDF file
-            doc = fitz.open(pdfFilenamePath)
-
             # Extract text from all pages and join them
-            text = ""
-            for page in doc:
-                text += page.get_text()
-
-            # Close the document
-            doc.close()
+            text = cls.extractText(pdfFilenamePath, max_workers=max_workers)
 
             # If caching is enabled, write the text to the cache file
             if useCache and text:
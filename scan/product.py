@@ -4,13 +4,16 @@ Created on 2023-11-16
 @author: wf
 """
 
-from dataclasses import dataclass, field
+import os
+from dataclasses import asdict, dataclass, field
 from os.path import expanduser
 from typing import Dict, List, Optional
 
 from basemkit.yamlable import lod_storable
 from ngwidgets.widgets import Link
 
+from scan.lodcache import LoDFile
+
 
 @dataclass
 class Product:
@@ -104,6 +107,68 @@ class Products:
         products = cls.load_from_yaml_file(yaml_path)
         return products
 
+    @classmethod
+    def lod_path(cls) -> str:
+        lod_path = expanduser("~/.scan2wiki/products.lod")
+        return lod_path
+
+    @classmethod
+    def ofCache(cls, yaml_path: str = None, lod_path: str = None) -> "Products":
+        """
+        load the products from the binary cache - the cache is
+        refreshed from the YAML file if it is missing or outdated
+
+        Args:
+            yaml_path (str, optional): the YAML file - defaults to store_path()
+            lod_path (str, optional): the binary cache file - defaults to lod_path()
+
+        Returns:
+            Products: the loaded products - empty if there are no stored products
+        """
+        if yaml_path is None:
+            yaml_path = cls.store_path()
+        if lod_path is None:
+            lod_path = cls.lod_path()
+        has_yaml = os.path.isfile(yaml_path)
+        if os.path.isfile(lod_path) and (
+            not has_yaml or os.path.getmtime(lod_path) >= os.path.getmtime(yaml_path)
+        ):
+            product_list = [
+                Product(**record) for record in LoDFile(lod_path).iterRecords()
+            ]
+            products = cls(products=product_list)
+        elif has_yaml:
+            products = cls.ofYaml(yaml_path)
+            products.save_to_lod_file(lod_path)
+        else:
+            products = cls()
+        return products
+
+    def save_to_lod_file(self, lod_path: str = None):
+        """
+        save the products to the binary cache
+
+        Args:
+            lod_path (str, optional): the binary cache file - defaults to lod_path()
+        """
+        if lod_path is None:
+            lod_path = self.lod_path()
+        LoDFile(lod_path).write(asdict(product) for product in self.products)
+
+    def save(self, yaml_path: str = None, lod_path: str = None):
+        """
+        save the products to the YAML file and the binary cache
+
+        Args:
+            yaml_path (str, optional): the YAML file - defaults to store_path()
+            lod_path (str, optional): the binary cache file - defaults to lod_path()
+        """
+        if yaml_path is None:
+            yaml_path = self.store_path()
+        os.makedirs(os.path.dirname(yaml_path), exist_ok=True)
+        self.save_to_yaml_file(yaml_path)
+        self.save_to_lod_file(lod_path)
+
     def add_product(self, product: Product):
         """
         Adds a product to the product list and updates the mappings.
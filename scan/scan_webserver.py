@@ -12,7 +12,8 @@ from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse
 from ngwidgets.input_webserver import InputWebserver, InputWebSolution
 from ngwidgets.lod_grid import GridConfig, ListOfDictsGrid
 from ngwidgets.webserver import WebserverConfig
-from nicegui import Client, app, ui
+from ngwidgets.widgets import Link
+from nicegui import Client, app, run, ui
 from wikibot3rd.wikiuser import WikiUser
 
 from scan.dms import (
@@ -24,7 +25,9 @@ from scan.dms import (
 )
 from scan.dms_views import ArchiveView
 from scan.entity_view import EntityManagerView
-from scan.scans import Scans
+from scan.inbox import InboxDelta, InboxIndex
+from scan.pdf import PDFExtractor
+from scan.scans import ScanRowCache, Scans
 from scan.upload import UploadForm
 from scan.version import Version
 from scan.webcam import AIWebcamForm, ProductWebcamForm
@@ -56,12 +59,24 @@ class ScanWebServer(InputWebserver):
         """Constructs all the necessary attributes for the WebServer object."""
         InputWebserver.__init__(self, config=ScanWebServer.get_config())
         self.scandir = DMSStorage.getScanDir()
-        self.scans = Scans(self.scandir)
+        # the rows of unchanged inbox files are reused across renders and restarts
+        self.scan_row_cache = ScanRowCache(
+            DMSStorage.getStorageConfig(mode="sql").cacheFile
+        )
+        self.scans = Scans(self.scandir, row_cache=self.scan_row_cache)
+        # the inbox rows are kept up to date by file system events
+        self.inbox = InboxIndex(self.scans)
+        app.on_startup(self.inbox.start)
+        app.on_shutdown(self.inbox.stop)
         self.wiki_users = WikiUser.getWikiUsers()
         self.sql_db = DMSStorage.getSqlDB()
+        PDFExtractor.max_workers = DMSStorage.getPdfWorkers()
+        app.on_shutdown(PDFExtractor.closeExecutor)
+        app.on_shutdown(DMSStorage.closeSqlDB)
         self.am = ArchiveManager.getInstance()
-        self.fm = FolderManager.getInstance()
-        self.dm = DocumentManager.getInstance()
+        # folders and documents are paged from the database on demand
+        self.fm = FolderManager.getInstance(lazy=True)
+        self.dm = DocumentManager.getInstance(lazy=True)
 
         @ui.page("/upload/{path:path}")
         async def upload(client: Client, path: str = None):
@@ -76,6 +91,10 @@ class ScanWebServer(InputWebserver):
         async def barcodewebcam(client: Client):
             return await self.page(client, ScanSolution.barcodewebcam)
 
+        @ui.page("/search")
+        async def search(client: Client):
+            return await self.page(client, ScanSolution.search)
+
         @ui.page("/archives")
         async def show_archives(client: Client):
             return await self.page(client, ScanSolution.show_archives)
@@ -103,7 +122,8 @@ class ScanWebServer(InputWebserver):
         """
         fullpath = f"{self.scandir}/{path}"
         if os.path.isdir(fullpath):
-            self.scans = Scans(fullpath)
+            self.scans = Scans(fullpath, row_cache=self.scan_row_cache)
+            self.inbox.set_scans(self.scans)
             return RedirectResponse("/")
         elif os.path.isfile(fullpath):
             file_response = FileResponse(fullpath)
@@ -131,6 +151,18 @@ class ScanSolution(InputWebSolution):
         self.stdout_handler = logging.StreamHandler(stream=sys.stdout)
         self.stderr_handler = logging.StreamHandler(stream=sys.stderr)
         self.lod = []
+        self.search_limit = 100
+        # the number of scans per page of the scans grid
+        self.page_size = 100
+        # the sorting, filter and page of the scans grid
+        self.scan_view = {
+            "sort_by": "lastModified",
+            "descending": True,
+            "filter": "",
+            "page": 1,
+        }
+        # the queue of the inbox deltas for my scans grid
+        self.inbox_queue = None
 
     async def setup_footer(self):
         """
@@ -195,13 +227,73 @@ class ScanSolution(InputWebSolution):
 
     def update_scans(self):
         """
-        update the scans grid
+        update the scans grid with the current page of the inbox
         """
         try:
-            self.lod = self.webserver.scans.get_scan_files()
+            inbox = self.webserver.inbox
+            page = inbox.query(
+                offset=(self.scan_view["page"] - 1) * self.page_size,
+                limit=self.page_size,
+                sort_by=self.scan_view["sort_by"],
+                descending=self.scan_view["descending"],
+                filter_text=self.scan_view["filter"],
+            )
+            if page.total and page.offset >= page.total:
+                # the page vanished e.g. by deletions or a narrower filter
+                self.scan_view["page"] = page.pages
+                self.update_scans()
+                return
+            self.lod = page.rows
             self.lod_grid.load_lod(self.lod)
             self.lod_grid.sizeColumnsToFit()
             self.lod_grid.set_checkbox_selection(self.key_col)
+            self.scan_pagination.max = page.pages
+            self.scan_total_label.text = f"{page.total} scans"
+            if self.inbox_queue is None:
+                self.inbox_queue = inbox.subscribe()
+                self.client.on_disconnect(lambda: inbox.unsubscribe(self.inbox_queue))
+                ui.timer(0.5, self.apply_inbox_deltas)
+        except Exception as ex:
+            self.handle_exception(ex)
+
+    def on_scan_view_change(self, reset_page: bool = True):
+        """
+        show the scans grid for the changed sorting, filter or page
+        """
+        if reset_page and self.scan_view["page"] != 1:
+            # the pagination change triggers the update
+            self.scan_view["page"] = 1
+            self.scan_pagination.value = 1
+        else:
+            self.update_scans()
+
+    def apply_inbox_deltas(self):
+        """
+        apply the pending inbox changes to the scans grid - updates of
+        visible rows are applied row by row, added or removed rows
+        change the page composition so the page is reloaded
+        """
+        try:
+            reload = False
+            updates = []
+            while not self.inbox_queue.empty():
+                delta = self.inbox_queue.get_nowait()
+                if delta.reload or delta.add or delta.remove:
+                    reload = True
+                updates.extend(delta.update)
+            if reload:
+                self.update_scans()
+                return
+            visible = {row[self.key_col] for row in self.lod}
+            delta = InboxDelta(
+                update=[row for row in updates if row[self.key_col] in visible]
+            )
+            if not delta.is_empty():
+                delta.apply_to(self.lod, key_col=self.key_col)
+                self.lod_grid.ag_grid.run_grid_method(
+                    "applyTransaction", delta.as_transaction()
+                )
+                self.lod_grid.update_index(lenient=self.lod_grid.config.lenient)
         except Exception as ex:
             self.handle_exception(ex)
 
@@ -243,6 +335,58 @@ class ScanSolution(InputWebSolution):
 
         await self.setup_content_div(setup_show_archives)
 
+    async def search(self):
+        """
+        full text search over the OCR text of the documents
+        """
+
+        def setup_search():
+            with ui.row():
+                self.search_input = (
+                    ui.input("search", placeholder="e.g. ALDI Rechn*")
+                    .props("size=60")
+                    .on("keydown.enter", self.on_search)
+                )
+                ui.button("search", icon="search", on_click=self.on_search)
+            grid_config = GridConfig(
+                key_col="#",
+                editable=False,
+                multiselect=False,
+                with_buttons=False,
+                debug=self.args.debug,
+            )
+            self.search_grid = ListOfDictsGrid(config=grid_config)
+
+        await self.setup_content_div(setup_search)
+
+    async def on_search(self, _event=None):
+        """
+        run the full text search for the current search input
+        """
+        try:
+            query = self.search_input.value
+            results = await run.io_bound(
+                self.webserver.dm.search, query, limit=self.search_limit
+            )
+            lod = []
+            for index, record in enumerate(results):
+                title = record["name"] or record["url"]
+                row = {
+                    "#": index + 1,
+                    "name": Link.create(record["url"], title),
+                    "title": record["title"],
+                    "snippet": record["snippet"],
+                    "archive": record["archiveName"],
+                    "folder": record["folderPath"],
+                    "lastModified": record["lastModified"],
+                }
+                lod.append(row)
+            self.search_grid.load_lod(lod)
+            self.search_grid.sizeColumnsToFit()
+            ui.notify(f"{len(lod)} documents found for {query}")
+        except Exception as ex:
+            self.handle_exception(ex)
+
     def configure_menu(self):
         """
         configure additional non-standard menu entries
@@ -257,6 +401,7 @@ class ScanSolution(InputWebSolution):
             name="Barcode Cam", icon_name="qr_code_2", target="/barcode-webcam"
         )
         self.link_button(name="Archives", icon_name="database", target="/archives")
+        self.link_button(name="Search", icon_name="search", target="/search")
         pass
 
     async def get_selected_lod(self):
@@ -292,6 +437,27 @@ class ScanSolution(InputWebSolution):
                 button_names=["all", "fit"],
                 debug=self.args.debug,
             )
+            with ui.row().classes("items-center"):
+                ui.select(
+                    {"lastModified": "last modified", "size": "size", "name": "name"},
+                    label="sort by",
+                    on_change=lambda _e: self.on_scan_view_change(),
+                ).bind_value(self.scan_view, "sort_by")
+                ui.switch(
+                    "descending", on_change=lambda _e: self.on_scan_view_change()
+                ).bind_value(self.scan_view, "descending")
+                ui.input(
+                    "filter", on_change=lambda _e: self.on_scan_view_change()
+                ).props("clearable debounce=300").bind_value(self.scan_view, "filter")
+                self.scan_pagination = ui.pagination(
+                    1,
+                    1,
+                    direction_links=True,
+                    on_change=lambda _e: self.on_scan_view_change(reset_page=False),
+                ).bind_value(self.scan_view, "page")
+                self.scan_total_label = ui.label()
+            # the rows are identified by their stable number for row transactions
+            grid_config.options[":getRowId"] = "(params) => String(params.data['#'])"
             self.lod_grid = ListOfDictsGrid(config=grid_config)
             with self.lod_grid.button_row:
                 self.work_button = ui.button(
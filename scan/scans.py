@@ -4,15 +4,121 @@ Created on 2023-11-14
 @author: wf
 """
 
+import json
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 from ngwidgets.widgets import Link
 
 from scan.dms import Document
 from scan.logger import Logger
+from scan.sqlpool import SQLConnectionPool
+
+
+class ScanRowCache:
+    """
+    persistent cache of the grid rows of the files of scan directories
+
+    a row is valid as long as the (size, mtime) of the file and of its
+    text file are unchanged - the rows are kept in memory and in a
+    SQLite table so that only new or changed files need to be read
+    """
+
+    tableName = "scan_row"
+
+    def __init__(self, dbFile: str):
+        """
+        constructor
+
+        Args:
+            dbFile(str): the path to the SQLite database
+        """
+        self.dbFile = dbFile
+        # the (key, row) tuples by file name by scan directory
+        self.rowsByDir = {}
+        self.lock = threading.Lock()
+
+    def getPool(self) -> SQLConnectionPool:
+        """
+        get the connection pool of my database
+        """
+        pool = SQLConnectionPool.getPool(self.dbFile)
+        return pool
+
+    def ensureTable(self, sqlDB):
+        """
+        make sure my table exists
+        """
+        sqlDB.execute(f"""CREATE TABLE IF NOT EXISTS {self.tableName} (
+  scandir TEXT,
+  name TEXT,
+  rowKey TEXT,
+  row TEXT,
+  PRIMARY KEY (scandir,name)
+)""")
+
+    def getRows(self, scandir: str) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """
+        get the cached rows of the given scan directory
+
+        Args:
+            scandir(str): the scan directory
+
+        Returns:
+            dict: the (key, row) tuples by file name
+        """
+        with self.lock:
+            rows = self.rowsByDir.get(scandir)
+        if rows is None:
+            rows = {}
+            with self.getPool().writer() as sqlDB:
+                self.ensureTable(sqlDB)
+            sqlDB = self.getPool().getSQLDB()
+            for name, rowKey, row in sqlDB.c.execute(
+                f"SELECT name,rowKey,row FROM {self.tableName} WHERE scandir=?",
+                (scandir,),
+            ):
+                rows[name] = (rowKey, json.loads(row))
+            with self.lock:
+                self.rowsByDir[scandir] = rows
+        return rows
+
+    def update(
+        self,
+        scandir: str,
+        changed: Dict[str, Tuple[str, Dict[str, Any]]],
+        removed: List[str],
+    ):
+        """
+        store the changed rows and remove the rows of the removed files in one transaction
+
+        Args:
+            scandir(str): the scan directory
+            changed(dict): the new (key, row) tuples by file name
+            removed(list): the names of the removed files
+        """
+        if not changed and not removed:
+            return
+        rows = self.getRows(scandir)
+        with self.getPool().writer() as sqlDB:
+            sqlDB.c.executemany(
+                f"INSERT OR REPLACE INTO {self.tableName}(scandir,name,rowKey,row) VALUES (?,?,?,?)",
+                [
+                    (scandir, name, rowKey, json.dumps(row))
+                    for name, (rowKey, row) in changed.items()
+                ],
+            )
+            sqlDB.c.executemany(
+                f"DELETE FROM {self.tableName} WHERE scandir=? AND name=?",
+                [(scandir, name) for name in removed],
+            )
+        with self.lock:
+            rows.update(changed)
+            for name in removed:
+                rows.pop(name, None)
 
 
 class Scans:
@@ -20,14 +126,16 @@ class Scans:
     Class to handle operations related to scanned files.
     """
 
-    def __init__(self, scandir: str):
+    def __init__(self, scandir: str, row_cache: ScanRowCache = None):
         """
         Initialize the Scans object.
 
         Args:
             scandir (str): The directory where the scanned files are located.
+            row_cache (ScanRowCache): the cache of the rows of unchanged files (if any)
         """
         self.scandir = scandir
+        self.row_cache = row_cache
 
     def get_full_path(self, path: str) -> str:
         """
@@ -70,19 +178,115 @@ class Scans:
             Each dictionary contains details like file name, last modified time, size, and links for
             delete and upload actions, plus cache text file info if available.
         """
-        scan_files = []
+        scan_files = self.sort_rows(self.get_scan_rows(allowed_extensions).values())
+        for index, scan_file in enumerate(scan_files):
+            scan_file["#"] = index + 1
+        return scan_files
 
-        for index, path in enumerate(self.get_valid_files(allowed_extensions)):
+    @staticmethod
+    def sort_rows(rows) -> List[Dict[str, Any]]:
+        """
+        sort the given rows by their last modification - the newest first
+        """
+        sorted_rows = sorted(rows, key=lambda x: x["lastModified"], reverse=True)
+        return sorted_rows
+
+    def get_scan_rows(
+        self, allowed_extensions: List[str] = [".pdf", ".jpg"]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the rows of the scanned files - the rows of unchanged files are
+        taken from my row cache (if any).
+
+        Args:
+            allowed_extensions: List of file extensions to include. Defaults to [".pdf", ".jpg"]
+
+        Returns:
+            Dict mapping file names to their rows
+        """
+        scan_rows = {}
+        # a single scandir gives the stat information of all files
+        entries_by_name = self.get_entries_by_name()
+        valid_entries = self.get_valid_entries(allowed_extensions, entries_by_name)
+        cached_rows = {}
+        if self.row_cache is not None:
+            cached_rows = self.row_cache.getRows(self.scandir)
+        changed_rows = {}
+        for index, entry in enumerate(valid_entries):
+            path = entry.name
             try:
-                scan_file = self.get_file_row(path, index)
-                scan_files.append(scan_file)
+                row_key = self.get_row_key(entry, entries_by_name)
+                cached = cached_rows.get(path)
+                if cached is not None and cached[0] == row_key:
+                    scan_file = dict(cached[1])
+                else:
+                    scan_file = self.get_file_row(
+                        path, index, entry=entry, entries_by_name=entries_by_name
+                    )
+                    changed_rows[path] = (row_key, dict(scan_file))
+                scan_rows[path] = scan_file
             except Exception as ex:
                 msg = f"error {str(ex)} for {path}"
                 Logger.log(msg)
-        scan_files = sorted(scan_files, key=lambda x: x["lastModified"], reverse=True)
-        for index, scan_file in enumerate(scan_files):
-            scan_file["#"] = index + 1
-        return scan_files
+        if self.row_cache is not None:
+            removed = [name for name in cached_rows if name not in entries_by_name]
+            self.row_cache.update(self.scandir, changed_rows, removed)
+        return scan_rows
+
+    def is_valid_name(self, path: str, allowed_extensions: List[str]) -> bool:
+        """
+        check whether the given file name is shown in the scans grid
+
+        Args:
+            path: the file name
+            allowed_extensions: List of file extensions to include
+
+        Returns:
+            bool: True if the file is not hidden and has an allowed extension
+        """
+        _, extension = os.path.splitext(path)
+        valid = not path.startswith(".") and (
+            not allowed_extensions or extension.lower() in allowed_extensions
+        )
+        return valid
+
+    def get_entries_by_name(self) -> Dict[str, os.DirEntry]:
+        """
+        Get the directory entries of the scan directory with a single scandir.
+
+        Returns:
+            Dict mapping file names to their os.DirEntry
+        """
+        entries_by_name = {}
+        with os.scandir(self.scandir) as entries:
+            for entry in entries:
+                entries_by_name[entry.name] = entry
+        return entries_by_name
+
+    def get_valid_entries(
+        self,
+        allowed_extensions: List[str],
+        entries_by_name: Dict[str, os.DirEntry] = None,
+    ) -> List[os.DirEntry]:
+        """
+        Get the directory entries of the scan directory that match allowed extensions.
+
+        Args:
+            allowed_extensions: List of file extensions to include
+            entries_by_name: the directory entries to filter - if None scan the directory
+
+        Returns:
+            List of valid directory entries
+        """
+        if entries_by_name is None:
+            entries_by_name = self.get_entries_by_name()
+        valid_entries = []
+
+        for path, entry in entries_by_name.items():
+            if self.is_valid_name(path, allowed_extensions):
+                valid_entries.append(entry)
+
+        return valid_entries
 
     def get_valid_files(self, allowed_extensions: List[str]) -> List[str]:
         """
@@ -94,48 +298,119 @@ class Scans:
         Returns:
             List of valid filenames
         """
-        valid_files = []
+        valid_files = [
+            entry.name for entry in self.get_valid_entries(allowed_extensions)
+        ]
+        return valid_files
 
-        for path in os.listdir(self.scandir):
-            # Ignore hidden files
-            if path.startswith("."):
-                continue
+    def get_row_key(
+        self, entry: os.DirEntry, entries_by_name: Dict[str, os.DirEntry]
+    ) -> str:
+        """
+        get the key that changes when the row of the given file needs to be recomputed
 
-            # Check file extension
-            _, extension = os.path.splitext(path)
-            if allowed_extensions and extension.lower() not in allowed_extensions:
-                continue
+        Args:
+            entry: the directory entry of the file
+            entries_by_name: the directory entries of the scan directory
 
-            valid_files.append(path)
+        Returns:
+            str: the size and mtime of the file and of its text file
+        """
+        basename = os.path.splitext(entry.name)[0]
+        text_entry = entries_by_name.get(f"{basename}.txt")
+        text_stat = None
+        if text_entry is not None and text_entry is not entry:
+            text_stat = text_entry.stat()
+        row_key = Scans.get_stat_key(entry.stat(), text_stat)
+        return row_key
+
+    @staticmethod
+    def get_stat_key(stat: os.stat_result, text_stat: os.stat_result = None) -> str:
+        """
+        get the row key for the given stat results of a file and its text file (if any)
+        """
+        row_key = f"{stat.st_size}:{stat.st_mtime_ns}"
+        if text_stat is not None:
+            row_key += f":{text_stat.st_size}:{text_stat.st_mtime_ns}"
+        return row_key
 
-        return valid_files
+    def get_cached_file_row(self, path: str) -> Dict[str, Any]:
+        """
+        get the row of the given file - the row of an unchanged file
+        is taken from my row cache (if any) and a new row is cached
+
+        Args:
+            path: The filename
+
+        Returns:
+            Dictionary with file metadata
+        """
+        fullpath = self.get_full_path(path)
+        stat = os.stat(fullpath)
+        text_path = self.get_full_path(f"{os.path.splitext(path)[0]}.txt")
+        text_stat = None
+        if text_path != fullpath and os.path.isfile(text_path):
+            text_stat = os.stat(text_path)
+        row_key = Scans.get_stat_key(stat, text_stat)
+        cached = None
+        if self.row_cache is not None:
+            cached = self.row_cache.getRows(self.scandir).get(path)
+        if cached is not None and cached[0] == row_key:
+            scan_file = dict(cached[1])
+        else:
+            scan_file = self.get_file_row(path, 0)
+            if self.row_cache is not None:
+                self.row_cache.update(
+                    self.scandir, {path: (row_key, dict(scan_file))}, []
+                )
+        return scan_file
 
-    def get_file_row(self, path: str, index: int) -> Dict[str, Any]:
+    def get_file_row(
+        self,
+        path: str,
+        index: int,
+        entry: os.DirEntry = None,
+        entries_by_name: Dict[str, os.DirEntry] = None,
+    ) -> Dict[str, Any]:
         """
         Create a dictionary entry for a single file with all metadata.
 
         Args:
             path: The filename
             index: The current index number
+            entry: the directory entry of the file from scandir (if any)
+            entries_by_name: the directory entries of the scan directory (if any)
+                to look up the text file without extra stat calls
 
         Returns:
             Dictionary with file metadata
         """
         doc = Document()
-        doc.fromFile(self.scandir, path, local=True, withOcr=True)
+        if entry is not None:
+            doc.fromDirEntry(self.scandir, entry, local=True)
+        else:
+            doc.fromFile(self.scandir, path, local=True)
 
         _fileurl, file_link = self.get_file_link(path)
 
         text_filename = f"{doc.basename}.txt"
-        text_path = self.get_full_path(text_filename)
 
         text_link = ""
         text_size = 0
         text_head = ""
 
-        if os.path.exists(text_path):
-            text_size = os.path.getsize(text_path)
+        if entries_by_name is not None:
+            text_entry = entries_by_name.get(text_filename)
+            if text_entry is not None:
+                text_size = text_entry.stat().st_size
+        else:
+            text_path = self.get_full_path(text_filename)
+            text_entry = os.path.exists(text_path)
+            if text_entry:
+                text_size = os.path.getsize(text_path)
+        if text_entry:
             _text_url, text_link = self.get_file_link(text_filename)
+        if text_entry or path.lower().endswith(".pdf"):
             text_head = doc.get_text_head(3)
 
         # Add AI link for image files
@@ -0,0 +1,128 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from wikibot3rd.smw import SMW, QueryResultSizeExceedException
+
+
+class SMWPager:
+    """
+    fetch all results of a Semantic MediaWiki ask query with offset paging
+
+    the pages are requested speculatively ahead with a bounded number of
+    requests in flight and handed out in offset order as soon as they arrive
+    """
+
+    def __init__(
+        self, smw: SMW, pageSize: int = 500, max_workers: int = 4, debug: bool = False
+    ):
+        """
+        constructor
+
+        Args:
+            smw(SMW): the Semantic MediaWiki client whose site to query
+            pageSize(int): the number of results to request per page
+            max_workers(int): the maximum number of concurrent requests
+            debug(bool): if True show the requested offsets
+        """
+        self.smw = smw
+        self.pageSize = pageSize
+        self.max_workers = max(1, max_workers)
+        self.debug = debug
+
+    def fetchPage(self, fixedAsk: str, offset: int, limit: int) -> dict:
+        """
+        fetch a single page of results
+
+        Args:
+            fixedAsk(str): the ask query as fixed for the API
+            offset(int): the offset of the first result
+            limit(int): the maximum number of results
+
+        Returns:
+            dict: the raw ask API result
+        """
+        if self.debug:
+            print(f"ask offset={offset} limit={limit}")
+        queryParam = f"{fixedAsk}|offset={offset}|limit={limit}"
+        rawResult = self.smw.site.raw_api("ask", query=queryParam, http_method="GET")
+        self.smw.site.handle_api_result(rawResult)
+        return rawResult
+
+    def iterPages(self, askQuery: str):
+        """
+        iterate over the raw result pages of the given ask query
+
+        Args:
+            askQuery(str): the ask query - without limit and offset
+
+        Yields:
+            dict: the raw ask API result of each non empty page in offset order
+
+        Raises:
+            QueryResultSizeExceedException: if the wiki stops delivering
+            results before the end of the query e.g. due to $smwgQMaxLimit
+        """
+        fixedAsk = self.smw.fixAsk(askQuery)
+        pageSize = self.pageSize
+        pending = deque()
+        nextOffset = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+
+            def fill():
+                nonlocal nextOffset
+                while len(pending) < self.max_workers:
+                    future = executor.submit(
+                        self.fetchPage, fixedAsk, nextOffset, pageSize
+                    )
+                    pending.append((nextOffset, future))
+                    nextOffset += pageSize
+
+            def cancel():
+                while pending:
+                    _offset, future = pending.popleft()
+                    future.cancel()
+
+            fill()
+            while pending:
+                offset, future = pending.popleft()
+                rawResult = future.result()
+                results = rawResult.get("query", {}).get("results")
+                continueOffset = rawResult.get("query-continue-offset")
+                if results:
+                    yield rawResult
+                if continueOffset is None:
+                    # this was the last page - drop the requests beyond the end
+                    cancel()
+                elif not results or continueOffset <= offset:
+                    cancel()
+                    raise QueryResultSizeExceedException(
+                        result=[rawResult],
+                        message=f"ask query stopped delivering results at offset {offset}",
+                    )
+                else:
+                    if continueOffset != offset + pageSize:
+                        # the wiki caps the page size - restart at the continuation
+                        cancel()
+                        pageSize = continueOffset - offset
+                        nextOffset = continueOffset
+                    fill()
+
+    def iterRecords(self, askQuery: str):
+        """
+        iterate over the deserialized records of the given ask query
+
+        Args:
+            askQuery(str): the ask query - without limit and offset
+
+        Yields:
+            dict: the deserialized record of each result
+        """
+        for rawResult in self.iterPages(askQuery):
+            for record in self.smw.deserialize(rawResult).values():
+                yield record
@@ -0,0 +1,229 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict
+
+from lodstorage.sql import SQLDB
+
+
+class SQLConnectionPool:
+    """
+    per thread connections to a SQLite database
+
+    each thread reuses its own connection so that no connection
+    is opened per query and no connection is shared between threads -
+    the database is journaled in write ahead log mode so that the readers
+    do not block the single writer which is serialized by my writeLock
+    """
+
+    PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+    }
+
+    pools = {}
+    poolsLock = threading.Lock()
+
+    def __init__(
+        self, dbFile: str, timeout: float = 30.0, pragmas: Dict[str, Any] = None
+    ):
+        """
+        constructor
+
+        Args:
+            dbFile(str): the path to the SQLite database
+            timeout(float): the number of seconds to wait for a lock
+            pragmas(dict): the pragmas to apply to each connection - default: PRAGMAS
+        """
+        self.dbFile = dbFile
+        self.timeout = timeout
+        self.pragmas = SQLConnectionPool.PRAGMAS if pragmas is None else pragmas
+        self.writeLock = threading.RLock()
+        self.local = threading.local()
+        # the open connections by thread
+        self.connections = {}
+        self.lock = threading.Lock()
+        # incremented on close to invalidate the thread local connections
+        self.generation = 0
+        # the connections of a parent process must not be used after a fork
+        self.pid = os.getpid()
+        # the SQL functions of my connections by name
+        self.functions = {}
+
+    @classmethod
+    def getPool(cls, dbFile: str) -> "SQLConnectionPool":
+        """
+        get the pool for the given database file
+
+        Args:
+            dbFile(str): the path to the SQLite database
+
+        Returns:
+            SQLConnectionPool: the shared pool for the database
+        """
+        with cls.poolsLock:
+            pool = cls.pools.get(dbFile)
+            if pool is None:
+                pool = cls(dbFile)
+                cls.pools[dbFile] = pool
+        return pool
+
+    @classmethod
+    def closeAll(cls):
+        """
+        close the connections of all pools
+        """
+        with cls.poolsLock:
+            pools = list(cls.pools.values())
+            cls.pools.clear()
+        for pool in pools:
+            pool.close()
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        open a new connection with my pragmas applied
+        """
+        connection = sqlite3.connect(
+            self.dbFile,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            # the connection is only used by its thread but closed by the pool
+            check_same_thread=False,
+            timeout=self.timeout,
+        )
+        for name, value in self.pragmas.items():
+            connection.execute(f"PRAGMA {name}={value}")
+        return connection
+
+    def getConnection(self) -> sqlite3.Connection:
+        """
+        get the connection of the current thread - it is opened on first use
+        """
+        if self.pid != os.getpid():
+            self.forget()
+        connection = getattr(self.local, "connection", None)
+        if connection is None or self.local.generation != self.generation:
+            connection = self.connect()
+            thread = threading.current_thread()
+            with self.lock:
+                self.closeDeadThreads()
+                self.connections[thread] = connection
+                self.local.generation = self.generation
+            self.local.connection = connection
+            self.local.functionNames = set()
+        if len(self.local.functionNames) != len(self.functions):
+            self.createFunctions(connection)
+        return connection
+
+    def createFunction(self, name: str, numParams: int, func: Callable):
+        """
+        register the given deterministic SQL function for all my connections
+
+        Args:
+            name(str): the name of the function
+            numParams(int): the number of parameters
+            func(Callable): the python function
+        """
+        if name not in self.functions:
+            with self.lock:
+                self.functions[name] = (numParams, func)
+
+    def createFunctions(self, connection: sqlite3.Connection):
+        """
+        register the missing SQL functions for the connection of the current thread
+        """
+        with self.lock:
+            functions = dict(self.functions)
+        for name, (numParams, func) in functions.items():
+            if name not in self.local.functionNames:
+                connection.create_function(name, numParams, func, deterministic=True)
+                self.local.functionNames.add(name)
+
+    def getSQLDB(self, debug: bool = False, errorDebug: bool = False) -> SQLDB:
+        """
+        get a SQLDB for the connection of the current thread
+
+        the SQLDB must not be closed - use closeThread or close instead
+
+        Args:
+            debug(bool): if True switch on debug
+            errorDebug(bool): if True provide debug info on errors
+
+        Returns:
+            SQLDB: the database wrapping the thread's connection
+        """
+        sqlDB = SQLDB(
+            self.dbFile,
+            connection=self.getConnection(),
+            debug=debug,
+            errorDebug=errorDebug,
+        )
+        return sqlDB
+
+    @contextmanager
+    def writer(self, debug: bool = False, errorDebug: bool = False):
+        """
+        serialize a write transaction - it is committed when the block
+        succeeds and rolled back on an exception
+
+        Args:
+            debug(bool): if True switch on debug
+            errorDebug(bool): if True provide debug info on errors
+
+        Yields:
+            SQLDB: the database wrapping the thread's connection
+        """
+        with self.writeLock:
+            sqlDB = self.getSQLDB(debug=debug, errorDebug=errorDebug)
+            try:
+                yield sqlDB
+                sqlDB.c.commit()
+            except BaseException:
+                sqlDB.c.rollback()
+                raise
+
+    def forget(self):
+        """
+        drop the connections inherited from the parent process without closing them
+        """
+        with self.lock:
+            self.pid = os.getpid()
+            self.generation += 1
+            self.connections.clear()
+            self.writeLock = threading.RLock()
+
+    def closeDeadThreads(self):
+        """
+        close the connections of threads that have ended - needs my lock
+        """
+        for thread in list(self.connections):
+            if not thread.is_alive():
+                self.connections.pop(thread).close()
+
+    def closeThread(self):
+        """
+        close the connection of the current thread
+        """
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            self.local.connection = None
+            with self.lock:
+                self.connections.pop(threading.current_thread(), None)
+            connection.close()
+
+    def close(self):
+        """
+        close all my connections - threads open a new one on next use
+        """
+        with self.lock:
+            self.generation += 1
+            connections = list(self.connections.values())
+            self.connections.clear()
+        for connection in connections:
+            connection.close()
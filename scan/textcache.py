@@ -0,0 +1,392 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import hashlib
+import os
+import threading
+import time
+import zlib
+from typing import Callable, Optional, Tuple
+
+from lodstorage.sql import SQLDB
+
+from scan.sqlpool import SQLConnectionPool
+
+
+class TextCache:
+    """
+    central content addressed cache of extracted texts
+
+    the texts are stored zlib compressed by the sha256 hash of the content
+    of their source file - the (path, size, mtime) of a file is remembered
+    with its hash so that unchanged files are looked up without reading them
+    and changed files are detected as stale - the least recently used
+    texts are evicted when the cache exceeds its maximum size - the total
+    size is kept as a running sum in the text_cache_meta table
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+    # seconds within which a hit does not update the access time of a text again
+    ACCESS_RESOLUTION = 60
+    # seconds between the prunings of the rows of changed and removed files
+    PRUNE_INTERVAL = 3600
+
+    caches = {}
+    cachesLock = threading.Lock()
+
+    def __init__(self, dbFile: str, maxSize: int = 1024 * 1024 * 1024, level: int = 6):
+        """
+        constructor
+
+        Args:
+            dbFile(str): the path to the SQLite database of the cache
+            maxSize(int): the maximum number of compressed bytes to keep
+            level(int): the zlib compression level
+        """
+        self.dbFile = dbFile
+        self.maxSize = maxSize
+        self.level = level
+        self.initialized = False
+
+    @classmethod
+    def getCache(cls, dbFile: str, maxSize: int = 1024 * 1024 * 1024) -> "TextCache":
+        """
+        get the shared cache for the given database file
+
+        Args:
+            dbFile(str): the path to the SQLite database of the cache
+            maxSize(int): the maximum number of compressed bytes to keep
+
+        Returns:
+            TextCache: the cache
+        """
+        with cls.cachesLock:
+            cache = cls.caches.get(dbFile)
+            if cache is None:
+                cache = cls(dbFile, maxSize=maxSize)
+                cls.caches[dbFile] = cache
+            cache.maxSize = maxSize
+        return cache
+
+    @classmethod
+    def hashFile(cls, path: str) -> str:
+        """
+        get the content hash of the given file
+
+        Args:
+            path(str): the path of the file
+
+        Returns:
+            str: the hex sha256 digest of the file's content
+        """
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(cls.CHUNK_SIZE), b""):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    def getPool(self) -> SQLConnectionPool:
+        """
+        get the connection pool of my database
+        """
+        pool = SQLConnectionPool.getPool(self.dbFile)
+        return pool
+
+    def getSQLDB(self) -> SQLDB:
+        """
+        get the connection of the current thread - my tables are created on first use
+        """
+        if not self.initialized:
+            os.makedirs(os.path.dirname(self.dbFile) or ".", exist_ok=True)
+            with self.getPool().writer() as sqlDB:
+                sqlDB.execute("""CREATE TABLE IF NOT EXISTS text_cache (
+  hash TEXT PRIMARY KEY,
+  size INTEGER,
+  storedSize INTEGER,
+  lastAccess REAL,
+  data BLOB
+)""")
+                sqlDB.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_text_cache_lastAccess ON text_cache(lastAccess)"
+                )
+                sqlDB.execute("""CREATE TABLE IF NOT EXISTS text_cache_file (
+  path TEXT PRIMARY KEY,
+  size INTEGER,
+  mtime INTEGER,
+  hash TEXT
+)""")
+                sqlDB.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_text_cache_file_hash ON text_cache_file(hash)"
+                )
+                sqlDB.execute("""CREATE TABLE IF NOT EXISTS text_encoding (
+  path TEXT PRIMARY KEY,
+  size INTEGER,
+  mtime INTEGER,
+  encoding TEXT
+)""")
+                sqlDB.execute("""CREATE TABLE IF NOT EXISTS text_cache_meta (
+  name TEXT PRIMARY KEY,
+  value REAL
+)""")
+                # the total is only summed up once for a cache of a former version
+                sqlDB.execute(
+                    "INSERT OR IGNORE INTO text_cache_meta(name,value) SELECT 'totalSize',COALESCE(SUM(storedSize),0) FROM text_cache"
+                )
+                sqlDB.c.execute(
+                    "INSERT OR IGNORE INTO text_cache_meta(name,value) VALUES ('lastPrune',?)",
+                    (time.time(),),
+                )
+            self.initialized = True
+        sqlDB = self.getPool().getSQLDB()
+        return sqlDB
+
+    def getHash(
+        self, sqlDB: SQLDB, path: str, onlyKnown: bool = False
+    ) -> Tuple[Optional[str], bool]:
+        """
+        get the content hash of the given file - the file is only
+        read if it is unknown or has changed since it was hashed
+
+        Args:
+            sqlDB(SQLDB): the database connection to use
+            path(str): the path of the file
+            onlyKnown(bool): if True never read the file - None is returned for unknown files
+
+        Returns:
+            tuple: the hash and True if it was taken from the cache
+        """
+        stat = os.stat(path)
+        row = sqlDB.c.execute(
+            "SELECT size,mtime,hash FROM text_cache_file WHERE path=?", (path,)
+        ).fetchone()
+        if row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2], True
+        if onlyKnown:
+            return None, False
+        contentHash = self.hashFile(path)
+        with self.getPool().writer():
+            sqlDB.c.execute(
+                "INSERT OR REPLACE INTO text_cache_file(path,size,mtime,hash) VALUES (?,?,?,?)",
+                (path, stat.st_size, stat.st_mtime_ns, contentHash),
+            )
+        return contentHash, False
+
+    def get(self, path: str, onlyKnown: bool = False) -> Optional[str]:
+        """
+        get the cached text of the given file
+
+        Args:
+            path(str): the path of the file
+            onlyKnown(bool): if True only look up files that are known to be unchanged
+                without reading them
+
+        Returns:
+            str: the text or None if there is no text for the current content
+        """
+        text = None
+        sqlDB = self.getSQLDB()
+        contentHash, _known = self.getHash(sqlDB, path, onlyKnown=onlyKnown)
+        if contentHash is None:
+            return text
+        row = sqlDB.c.execute(
+            "SELECT data,lastAccess FROM text_cache WHERE hash=?", (contentHash,)
+        ).fetchone()
+        if row is not None:
+            text = zlib.decompress(row[0]).decode("utf-8")
+            now = time.time()
+            # repeated hits do not contend for the write lock
+            if now - row[1] >= self.ACCESS_RESOLUTION:
+                with self.getPool().writer():
+                    sqlDB.c.execute(
+                        "UPDATE text_cache SET lastAccess=? WHERE hash=?",
+                        (now, contentHash),
+                    )
+        return text
+
+    def put(self, path: str, text: str):
+        """
+        cache the text of the given file
+
+        Args:
+            path(str): the path of the file
+            text(str): the text extracted from the file's current content
+        """
+        sqlDB = self.getSQLDB()
+        contentHash, _known = self.getHash(sqlDB, path)
+        data = zlib.compress(text.encode("utf-8"), self.level)
+        now = time.time()
+        with self.getPool().writer():
+            sqlDB.c.execute(
+                "UPDATE text_cache_meta SET value=value+?-COALESCE((SELECT storedSize FROM text_cache WHERE hash=?),0) WHERE name='totalSize'",
+                (len(data), contentHash),
+            )
+            sqlDB.c.execute(
+                "INSERT OR REPLACE INTO text_cache(hash,size,storedSize,lastAccess,data) VALUES (?,?,?,?,?)",
+                (contentHash, len(text), len(data), now, data),
+            )
+            self.evict(sqlDB)
+            self.prune(sqlDB, now)
+
+    def getText(self, path: str, extract: Callable[[], Optional[str]]) -> Optional[str]:
+        """
+        get the text of the given file from the cache or extract and cache it
+
+        Args:
+            path(str): the path of the file
+            extract(Callable): the function to extract the text with on a cache miss
+
+        Returns:
+            str: the text or None if it could not be extracted
+        """
+        if not os.path.isfile(path):
+            return extract()
+        text = self.get(path)
+        if text is None:
+            text = extract()
+            if text is not None:
+                self.put(path, text)
+        return text
+
+    def getEncoding(self, path: str, stat: os.stat_result) -> Optional[str]:
+        """
+        get the detected encoding of the given text file
+
+        Args:
+            path(str): the path of the text file
+            stat(os.stat_result): the current stat result of the file
+
+        Returns:
+            str: the encoding or None if it is unknown or the file changed
+        """
+        sqlDB = self.getSQLDB()
+        row = sqlDB.c.execute(
+            "SELECT encoding FROM text_encoding WHERE path=? AND size=? AND mtime=?",
+            (path, stat.st_size, stat.st_mtime_ns),
+        ).fetchone()
+        encoding = row[0] if row is not None else None
+        return encoding
+
+    def putEncoding(self, path: str, stat: os.stat_result, encoding: str):
+        """
+        remember the detected encoding of the given text file
+
+        Args:
+            path(str): the path of the text file
+            stat(os.stat_result): the stat result of the file the encoding was detected for
+            encoding(str): the encoding
+        """
+        sqlDB = self.getSQLDB()
+        with self.getPool().writer():
+            sqlDB.c.execute(
+                "INSERT OR REPLACE INTO text_encoding(path,size,mtime,encoding) VALUES (?,?,?,?)",
+                (path, stat.st_size, stat.st_mtime_ns, encoding),
+            )
+
+    def invalidate(self, path: str):
+        """
+        forget the given file - its text stays cached for files with the same content
+        """
+        sqlDB = self.getSQLDB()
+        with self.getPool().writer():
+            sqlDB.c.execute("DELETE FROM text_cache_file WHERE path=?", (path,))
+            sqlDB.c.execute("DELETE FROM text_encoding WHERE path=?", (path,))
+
+    def getTotalSize(self, sqlDB: SQLDB) -> int:
+        """
+        get the number of compressed bytes in the cache
+        """
+        row = sqlDB.c.execute(
+            "SELECT value FROM text_cache_meta WHERE name='totalSize'"
+        ).fetchone()
+        return int(row[0])
+
+    def evict(self, sqlDB: SQLDB) -> int:
+        """
+        remove the least recently used texts until the cache fits my maxSize
+        - needs the write lock
+
+        Args:
+            sqlDB(SQLDB): the database connection to use
+
+        Returns:
+            int: the number of evicted texts
+        """
+        total = self.getTotalSize(sqlDB)
+        evicted = []
+        if total > self.maxSize:
+            evictedSize = 0
+            cursor = sqlDB.c.execute(
+                "SELECT hash,storedSize FROM text_cache ORDER BY lastAccess"
+            )
+            for contentHash, storedSize in cursor:
+                if total - evictedSize <= self.maxSize:
+                    break
+                evicted.append((contentHash,))
+                evictedSize += storedSize
+            cursor.close()
+            sqlDB.c.executemany("DELETE FROM text_cache WHERE hash=?", evicted)
+            sqlDB.c.executemany("DELETE FROM text_cache_file WHERE hash=?", evicted)
+            sqlDB.c.execute(
+                "UPDATE text_cache_meta SET value=value-? WHERE name='totalSize'",
+                (evictedSize,),
+            )
+        return len(evicted)
+
+    def prune(self, sqlDB: SQLDB, now: float = None, force: bool = False) -> int:
+        """
+        remove the file and encoding rows of files that were changed or removed
+        and the file rows without a cached text - at most every PRUNE_INTERVAL
+        seconds since every row's file is checked - needs the write lock
+
+        Args:
+            sqlDB(SQLDB): the database connection to use
+            now(float): the current time - default: time.time()
+            force(bool): if True prune regardless of the time of the last pruning
+
+        Returns:
+            int: the number of pruned rows
+        """
+        if now is None:
+            now = time.time()
+        row = sqlDB.c.execute(
+            "SELECT value FROM text_cache_meta WHERE name='lastPrune'"
+        ).fetchone()
+        if not force and now - row[0] < self.PRUNE_INTERVAL:
+            return 0
+        pruned = sqlDB.c.execute(
+            "DELETE FROM text_cache_file WHERE hash NOT IN (SELECT hash FROM text_cache)"
+        ).rowcount
+        for table in ["text_cache_file", "text_encoding"]:
+            stale = []
+            for path, size, mtime in sqlDB.c.execute(
+                f"SELECT path,size,mtime FROM {table}"
+            ).fetchall():
+                try:
+                    stat = os.stat(path)
+                    changed = stat.st_size != size or stat.st_mtime_ns != mtime
+                except OSError:
+                    changed = True
+                if changed:
+                    stale.append((path,))
+            sqlDB.c.executemany(f"DELETE FROM {table} WHERE path=?", stale)
+            pruned += len(stale)
+        sqlDB.c.execute(
+            "UPDATE text_cache_meta SET value=? WHERE name='lastPrune'", (now,)
+        )
+        return pruned
+
+    def getStats(self) -> dict:
+        """
+        get the number of texts and their sizes
+
+        Returns:
+            dict: count, size and storedSize of the cached texts
+        """
+        sqlDB = self.getSQLDB()
+        records = sqlDB.query(
+            "SELECT COUNT(*) AS count,COALESCE(SUM(size),0) AS size,COALESCE(SUM(storedSize),0) AS storedSize FROM text_cache"
+        )
+        return records[0]
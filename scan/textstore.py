@@ -0,0 +1,298 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import weakref
+import zlib
+from typing import Iterable, Optional
+
+from lodstorage.sql import SQLDB
+
+from scan.sqlpool import SQLConnectionPool
+
+
+class TextStore:
+    """
+    zlib compressed store of the (OCR) texts of the documents by url
+
+    keeping the texts out of the document table keeps the metadata rows
+    narrow - the texts are fetched when they are needed
+    """
+
+    CODEC = "zlib"
+
+    def __init__(
+        self,
+        dbFile: str,
+        tableName: str = "document_text",
+        contentTable: str = "document",
+        textColumn: str = "ocrText",
+        level: int = 6,
+    ):
+        """
+        constructor
+
+        Args:
+            dbFile(str): the path to the SQLite database
+            tableName(str): the name of the text table
+            contentTable(str): the name of the table the texts were stored inline in
+            textColumn(str): the name of the inline text column
+            level(int): the zlib compression level
+        """
+        self.dbFile = dbFile
+        self.tableName = tableName
+        self.contentTable = contentTable
+        self.textColumn = textColumn
+        self.level = level
+
+    def encode(self, text: str) -> bytes:
+        """
+        compress the given text
+        """
+        data = zlib.compress(text.encode("utf-8"), self.level)
+        return data
+
+    @staticmethod
+    def decode(data: bytes) -> Optional[str]:
+        """
+        decompress the given data
+        """
+        text = None
+        if data is not None:
+            text = zlib.decompress(data).decode("utf-8")
+        return text
+
+    def getPool(self) -> SQLConnectionPool:
+        """
+        get the connection pool of my database
+        """
+        pool = SQLConnectionPool.getPool(self.dbFile)
+        return pool
+
+    def tableExists(self, sqlDB: SQLDB, tableName: str) -> bool:
+        """
+        check whether the given table exists
+        """
+        records = sqlDB.query(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name=(?)",
+            (tableName,),
+        )
+        return len(records) > 0
+
+    def ensure(self, sqlDB: SQLDB):
+        """
+        make sure my table exists - when it is created the texts
+        stored inline in the content table are moved to it
+
+        Args:
+            sqlDB(SQLDB): the database connection to use
+        """
+        if not self.tableExists(sqlDB, self.tableName):
+            with self.getPool().writeLock:
+                sqlDB.execute(f"""CREATE TABLE IF NOT EXISTS {self.tableName} (
+  url TEXT PRIMARY KEY,
+  codec TEXT,
+  size INTEGER,
+  data BLOB
+)""")
+                self.migrate(sqlDB)
+
+    def migrate(self, sqlDB: SQLDB, batchSize: int = 1000) -> int:
+        """
+        move the texts stored inline in the content table to my table
+
+        Args:
+            sqlDB(SQLDB): the database connection to use
+            batchSize(int): the number of texts to move per transaction
+
+        Returns:
+            int: the number of moved texts
+        """
+        count = 0
+        if self.tableExists(sqlDB, self.contentTable):
+            sqlQuery = f"""SELECT url,{self.textColumn} AS text FROM {self.contentTable}
+WHERE {self.textColumn} IS NOT NULL"""
+            batch = []
+            for record in sqlDB.queryGen(sqlQuery):
+                batch.append((record["url"], record["text"]))
+                if len(batch) >= batchSize:
+                    count += self.putAll(sqlDB, batch)
+                    batch = []
+            count += self.putAll(sqlDB, batch)
+            if count:
+                sqlDB.execute(
+                    f"UPDATE {self.contentTable} SET {self.textColumn}=NULL WHERE {self.textColumn} IS NOT NULL"
+                )
+                sqlDB.c.commit()
+                # give the space of the inline texts back - the checkpoint
+                # moves the vacuumed pages from the write ahead log to the file
+                sqlDB.c.execute("VACUUM")
+                sqlDB.c.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return count
+
+    def putAll(self, sqlDB: SQLDB, items: Iterable) -> int:
+        """
+        store the given texts with the given connection
+
+        Args:
+            sqlDB(SQLDB): the database connection to use
+            items(Iterable): (url, text) tuples - None texts are skipped
+
+        Returns:
+            int: the number of stored texts
+        """
+        rows = [
+            (url, TextStore.CODEC, len(text), self.encode(text))
+            for url, text in items
+            if url and text is not None
+        ]
+        if rows:
+            sqlDB.c.executemany(
+                f"INSERT OR REPLACE INTO {self.tableName}(url,codec,size,data) VALUES (?,?,?,?)",
+                rows,
+            )
+            sqlDB.c.commit()
+        return len(rows)
+
+    def put(self, items: Iterable) -> int:
+        """
+        store the given texts
+
+        Args:
+            items(Iterable): (url, text) tuples - None texts are skipped
+
+        Returns:
+            int: the number of stored texts
+        """
+        with self.getPool().writer() as sqlDB:
+            self.ensure(sqlDB)
+            count = self.putAll(sqlDB, items)
+        return count
+
+    def get(self, url: str) -> Optional[str]:
+        """
+        get the text for the given url
+
+        Args:
+            url(str): the url of the document
+
+        Returns:
+            str: the text or None if there is none
+        """
+        texts = self.getTexts([url])
+        text = texts.get(url)
+        return text
+
+    def getTexts(self, urls: list) -> dict:
+        """
+        get the texts for the given urls
+
+        Args:
+            urls(list): the urls of the documents
+
+        Returns:
+            dict: the texts by url
+        """
+        texts = {}
+        if urls:
+            sqlDB = self.getPool().getSQLDB()
+            self.ensure(sqlDB)
+            for start in range(0, len(urls), 500):
+                chunk = urls[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = sqlDB.c.execute(
+                    f"SELECT url,data FROM {self.tableName} WHERE url IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for url, data in rows:
+                    texts[url] = TextStore.decode(data)
+        return texts
+
+    def delete(self, urls: list):
+        """
+        delete the texts for the given urls
+
+        Args:
+            urls(list): the urls of the documents
+        """
+        if urls:
+            with self.getPool().writer() as sqlDB:
+                if self.tableExists(sqlDB, self.tableName):
+                    sqlDB.c.executemany(
+                        f"DELETE FROM {self.tableName} WHERE url=(?)",
+                        [(url,) for url in urls],
+                    )
+
+    def retain(self, urls: Iterable) -> int:
+        """
+        delete the texts of all but the given urls
+
+        Args:
+            urls(Iterable): the urls of the documents whose texts to keep
+
+        Returns:
+            int: the number of deleted texts
+        """
+        keep = set(urls)
+        with self.getPool().writer() as sqlDB:
+            self.ensure(sqlDB)
+            rows = sqlDB.c.execute(f"SELECT url FROM {self.tableName}").fetchall()
+            obsolete = [(url,) for (url,) in rows if url not in keep]
+            sqlDB.c.executemany(f"DELETE FROM {self.tableName} WHERE url=(?)", obsolete)
+        return len(obsolete)
+
+
+class LazyText:
+    """
+    data descriptor for a text attribute of a document that is loaded
+    on first access from the TextStore the document has been bound to
+
+    the value is kept in the instance's __dict__ under the attribute name
+    so that vars(document) shows whether the text has been loaded - the
+    binding is kept outside of the instance so that the records of the
+    documents are unchanged and unbound documents never touch a database
+    """
+
+    def __init__(self, name: str, keyAttr: str = "url"):
+        """
+        constructor
+
+        Args:
+            name(str): the name of the attribute
+            keyAttr(str): the name of the attribute with the key for the TextStore
+        """
+        self.name = name
+        self.keyAttr = keyAttr
+        # the TextStores of the bound instances by id
+        self.textStores = {}
+
+    def bind(self, obj, textStore: TextStore):
+        """
+        load the text of the given object from the given store on first access
+        - the binding ends when the text has been loaded or the object is collected
+
+        Args:
+            obj: the instance e.g. a Document
+            textStore(TextStore): the store to load the text from
+        """
+        key = id(obj)
+        if key not in self.textStores:
+            weakref.finalize(obj, self.textStores.pop, key, None)
+        self.textStores[key] = textStore
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = obj.__dict__.get(self.name)
+        if value is None and self.textStores:
+            textStore = self.textStores.pop(id(obj), None)
+            key = obj.__dict__.get(self.keyAttr)
+            if textStore is not None and key:
+                value = textStore.get(key)
+                obj.__dict__[self.name] = value
+        return value
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.name] = value
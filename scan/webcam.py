@@ -206,8 +206,7 @@ class ProductWebcamForm(BaseWebcamForm):
         self.amazon = Amazon(self.solution.args.debug)
         self.product = None
         self.gtin = None
-        self.products = Products()
-        self.products.load_from_json()
+        self.products = Products.ofCache()
         self.setup_product_form()
         self.update_product_grid()
 
@@ -242,7 +241,7 @@ class ProductWebcamForm(BaseWebcamForm):
         """
         if self.product:
             self.products.add_product(self.product)
-            self.products.save_to_json()
+            self.products.save()
             self.update_product_grid()
             self.notify(f"Added product: {self.product.title}")
 
@@ -0,0 +1,198 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import threading
+import time
+from typing import Any, Callable
+
+from mwclient.errors import APIError, AssertUserFailedError, LoginError
+from wikibot3rd.smw import SMWClient
+from wikibot3rd.wikiclient import WikiClient
+from wikibot3rd.wikipush import WikiPush
+
+
+class WikiSession:
+    """
+    a logged in wiki client together with the SMW and push clients sharing its site
+    """
+
+    def __init__(self, wikiId: str, wikiClient: WikiClient):
+        """
+        constructor
+
+        Args:
+            wikiId(str): the id of the wiki
+            wikiClient(WikiClient): the logged in client
+        """
+        self.wikiId = wikiId
+        self.wikiClient = wikiClient
+        self.smw = None
+        self.wikiPush = None
+        self.lock = threading.Lock()
+        self.created = time.time()
+        self.lastUsed = self.created
+
+    def getSMW(self) -> SMWClient:
+        """
+        get the semantic mediawiki client for my site
+        """
+        with self.lock:
+            if self.smw is None:
+                self.smw = SMWClient(self.wikiClient.getSite())
+        return self.smw
+
+    def getWikiPush(self) -> WikiPush:
+        """
+        get a WikiPush targeting my wiki that reuses my logged in client
+
+        Raises:
+            Exception: if the client is not logged in
+        """
+        with self.lock:
+            if self.wikiPush is None:
+                if not self.wikiClient.is_logged_in:
+                    raise Exception(f"can't login to target Wiki {self.wikiId}")
+                wikiPush = WikiPush(fromWikiId=None, toWikiId=None)
+                wikiPush.toWikiId = self.wikiId
+                wikiPush.toWiki = self.wikiClient
+                self.wikiPush = wikiPush
+        return self.wikiPush
+
+
+class WikiSessionCache:
+    """
+    thread safe process wide cache of logged in wiki sessions by wikiId
+    """
+
+    # error codes of the MediaWiki API signalling a lost session
+    EXPIRED_CODES = {"assertuserfailed", "assertbotfailed", "notloggedin", "badtoken"}
+
+    def __init__(
+        self,
+        clientFactory: Callable[[str], WikiClient],
+        maxIdle: float = None,
+    ):
+        """
+        constructor
+
+        Args:
+            clientFactory(Callable): creates a logged in WikiClient for a wikiId
+            maxIdle(float): seconds after which an unused session is evicted -
+                None to keep sessions for the lifetime of the process
+        """
+        self.clientFactory = clientFactory
+        self.maxIdle = maxIdle
+        self.sessions = {}
+        # the login locks by wikiId - logins happen outside of the cache lock
+        self.loginLocks = {}
+        self.lock = threading.Lock()
+
+    def get(self, wikiId: str) -> WikiSession:
+        """
+        get the session for the given wikiId - logging in if needed
+
+        Args:
+            wikiId(str): the id of the wiki
+
+        Returns:
+            WikiSession: the logged in session
+        """
+        now = time.time()
+        with self.lock:
+            self.evictIdle(now)
+            session = self.sessions.get(wikiId)
+            if session is not None:
+                session.lastUsed = now
+                return session
+            loginLock = self.loginLocks.setdefault(wikiId, threading.Lock())
+        # only the callers of the same wiki wait for the login
+        with loginLock:
+            with self.lock:
+                session = self.sessions.get(wikiId)
+            if session is None:
+                session = WikiSession(wikiId, self.clientFactory(wikiId))
+                with self.lock:
+                    self.sessions[wikiId] = session
+            session.lastUsed = now
+        return session
+
+    def invalidate(self, wikiId: str, session: WikiSession = None):
+        """
+        drop the session for the given wikiId so that the next get logs in again
+
+        Args:
+            wikiId(str): the id of the wiki
+            session(WikiSession): only drop this session - a session that
+                has already been replaced by another thread is kept
+        """
+        with self.lock:
+            if session is None or self.sessions.get(wikiId) is session:
+                self.sessions.pop(wikiId, None)
+
+    def evictIdle(self, now: float = None) -> int:
+        """
+        evict the sessions that have not been used for maxIdle seconds
+
+        Args:
+            now(float): the current time - default: time.time()
+
+        Returns:
+            int: the number of evicted sessions
+        """
+        evicted = 0
+        if self.maxIdle is not None:
+            if now is None:
+                now = time.time()
+            for wikiId, session in list(self.sessions.items()):
+                if now - session.lastUsed > self.maxIdle:
+                    del self.sessions[wikiId]
+                    evicted += 1
+        return evicted
+
+    def clear(self):
+        """
+        drop all sessions
+        """
+        with self.lock:
+            self.sessions.clear()
+
+    @classmethod
+    def isExpired(cls, ex: Exception) -> bool:
+        """
+        check whether the given exception signals a lost login session
+
+        Args:
+            ex(Exception): the exception to check
+
+        Returns:
+            bool: True if a new login might fix the problem
+        """
+        expired = isinstance(ex, (AssertUserFailedError, LoginError))
+        if isinstance(ex, APIError):
+            expired = ex.code in cls.EXPIRED_CODES
+        return expired
+
+    def run(self, wikiId: str, action: Callable[[WikiSession], Any]) -> Any:
+        """
+        run the given action with the session for the given wikiId
+        and retry it once with a fresh login if the session expired
+
+        Args:
+            wikiId(str): the id of the wiki
+            action(Callable): the action to run with the session
+
+        Returns:
+            Any: the result of the action
+        """
+        session = self.get(wikiId)
+        try:
+            result = action(session)
+        except Exception as ex:
+            if not WikiSessionCache.isExpired(ex):
+                raise ex
+            self.invalidate(wikiId, session)
+            result = action(self.get(wikiId))
+        return result
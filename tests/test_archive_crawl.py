@@ -0,0 +1,210 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import shutil
+import tempfile
+
+from ngwidgets.basetest import Basetest
+
+from scan.dms import (
+    Archive,
+    ArchiveManager,
+    DMSStorage,
+    Document,
+    DocumentManager,
+    FolderManager,
+    OcrPool,
+)
+
+
+class TestArchiveCrawl(Basetest):
+    """
+    test crawling filesystem archives
+    """
+
+    def setUp(self, debug=False, profile=True):
+        """
+        create a small year/month archive tree
+        """
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.base_dir = tempfile.mkdtemp(prefix="scan2wiki_archive_")
+        self.cache_dir = tempfile.mkdtemp(prefix="scan2wiki_cache_")
+        DMSStorage.cacheRootDir = self.cache_dir
+        self.expected_docs = 0
+        for year in ["2023", "2024"]:
+            for month in ["01", "02", "03"]:
+                month_dir = os.path.join(self.base_dir, year, month)
+                os.makedirs(month_dir)
+                for i in range(3):
+                    path = os.path.join(month_dir, f"scan_{year}_{month}_{i}.pdf")
+                    with open(path, "wb") as pdf_file:
+                        pdf_file.write(b"%PDF-1.4\n")
+                    self.expected_docs += 1
+        # hidden directories and other files are ignored
+        os.makedirs(os.path.join(self.base_dir, "2024", ".ocr"))
+        with open(os.path.join(self.base_dir, "2024", "01", "notes.txt"), "w") as f:
+            f.write("notes")
+        self.archive = Archive(
+            name="test-scan",
+            server="localhost",
+            url=f"http://localhost{self.base_dir}",
+        )
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        DMSStorage.cacheRootDir = None
+        shutil.rmtree(self.base_dir)
+        shutil.rmtree(self.cache_dir)
+
+    def touch_dir(self, path: str):
+        """
+        make sure the modification time of the given directory changes
+        """
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+    def test_parallel_crawl(self):
+        """
+        test that the parallel crawl finds the same folders and documents
+        in the same order as the sequential crawl
+        """
+        results = {}
+        for max_workers in [1, 4]:
+            foldersByPath, documentList = self.archive.getFoldersAndDocuments(
+                max_workers=max_workers
+            )
+            results[max_workers] = (
+                list(foldersByPath.keys()),
+                [doc.url for doc in documentList],
+            )
+            # 2 years and 6 months
+            self.assertEqual(8, len(foldersByPath))
+            self.assertEqual(self.expected_docs, len(documentList))
+            month_path = f"{self.base_dir}/2024/02"
+            self.assertEqual(3, foldersByPath[month_path].fileCount)
+        self.assertEqual(results[1], results[4])
+
+    def test_symlinks(self):
+        """
+        test that symbolic links to directories are not followed
+        """
+        outside_dir = tempfile.mkdtemp(prefix="scan2wiki_outside_")
+        try:
+            with open(os.path.join(outside_dir, "outside.pdf"), "wb") as pdf_file:
+                pdf_file.write(b"%PDF-1.4\n")
+            os.symlink(outside_dir, os.path.join(self.base_dir, "2023", "outside"))
+            # a cycle back to the root of the archive
+            os.symlink(self.base_dir, os.path.join(self.base_dir, "2024", "01", "loop"))
+            foldersByPath, documentList = self.archive.getFoldersAndDocuments(
+                max_workers=2
+            )
+            self.assertEqual(8, len(foldersByPath))
+            self.assertEqual(self.expected_docs, len(documentList))
+        finally:
+            shutil.rmtree(outside_dir)
+
+    def test_incremental_collect(self):
+        """
+        test that an incremental collect only touches changed folders
+        """
+        stats = ArchiveManager.collectIncremental(self.archive, debug=self.debug)
+        self.assertEqual(8, stats["changed folders"])
+        self.assertEqual(self.expected_docs, stats["upserted documents"])
+        # nothing changed
+        stats = ArchiveManager.collectIncremental(self.archive, debug=self.debug)
+        self.assertEqual(0, stats["changed folders"])
+        self.assertEqual(8, stats["unchanged folders"])
+        self.assertEqual(0, stats["upserted documents"])
+        # add a file in one month, delete one in another and remove a month
+        added_dir = os.path.join(self.base_dir, "2023", "02")
+        with open(os.path.join(added_dir, "added.pdf"), "wb") as pdf_file:
+            pdf_file.write(b"%PDF-1.4\n")
+        self.touch_dir(added_dir)
+        deleted_dir = os.path.join(self.base_dir, "2024", "03")
+        os.remove(os.path.join(deleted_dir, "scan_2024_03_0.pdf"))
+        self.touch_dir(deleted_dir)
+        shutil.rmtree(os.path.join(self.base_dir, "2023", "03"))
+        self.touch_dir(os.path.join(self.base_dir, "2023"))
+        stats = ArchiveManager.collectIncremental(self.archive, debug=self.debug)
+        self.assertEqual(3, stats["changed folders"])
+        self.assertEqual(1, stats["removed folders"])
+        self.assertEqual(1, stats["upserted documents"])
+        self.assertEqual(1, stats["deleted documents"])
+        dm = DocumentManager.getInstance()
+        self.assertEqual(self.expected_docs + 1 - 1 - 3, len(dm.documents))
+
+    def test_incremental_ocr(self):
+        """
+        test that an incremental collect only gets the OCR texts of upserted documents
+        """
+        month_dir = os.path.join(self.base_dir, "2023", "01")
+        ArchiveManager.collectIncremental(self.archive, withOcr=True, max_workers=2)
+        for name, text in [("scan_2023_01_0", "changed"), ("added", "added")]:
+            with open(os.path.join(month_dir, f"{name}.txt"), "w") as f:
+                f.write(f"OCR text {text}")
+        with open(os.path.join(month_dir, "added.pdf"), "wb") as pdf_file:
+            pdf_file.write(b"%PDF-1.4\n")
+        self.touch_dir(month_dir)
+        stats = ArchiveManager.collectIncremental(
+            self.archive, withOcr=True, max_workers=2
+        )
+        self.assertEqual(1, stats["upserted documents"])
+        dm = DocumentManager.getInstance()
+        texts = {doc.name: doc.ocrText for doc in dm.documents}
+        self.assertEqual("OCR text added", texts["added.pdf"])
+        # the unchanged document of the changed folder keeps its text
+        self.assertNotEqual("OCR text changed", texts["scan_2023_01_0.pdf"])
+
+    def test_batched_collect(self):
+        """
+        test that a collect streams the documents to the storage in batches
+        """
+        for _run in range(2):
+            stats = ArchiveManager.addFilesAndFoldersForArchive(
+                self.archive, store=True, debug=self.debug, batchSize=4
+            )
+            self.assertEqual(8, stats["folders"])
+            self.assertEqual(self.expected_docs, stats["documents"])
+            # 18 documents in 5 batches and 8 folders in 2 batches
+            self.assertEqual(7, stats["batches"])
+            dm = DocumentManager.getInstance()
+            self.assertEqual(self.expected_docs, len(dm.documents))
+            # a second collect replaces the rows
+            fm = FolderManager.getInstance()
+            self.assertEqual(8, len(fm.folders))
+
+    def test_ocr_pool(self):
+        """
+        test extracting the OCR texts with a process pool
+        """
+        for root, _dirs, files in os.walk(self.base_dir):
+            for file in files:
+                if file.endswith(".pdf"):
+                    basename = os.path.splitext(file)[0]
+                    with open(os.path.join(root, f"{basename}.txt"), "w") as f:
+                        f.write(f"OCR text of {basename}")
+        results = {}
+        for ocr_workers in [1, 3]:
+            stats = ArchiveManager.addFilesAndFoldersForArchive(
+                self.archive,
+                withOcr=True,
+                store=True,
+                debug=self.debug,
+                ocr_workers=ocr_workers,
+                ocr_chunksize=2,
+            )
+            self.assertEqual(self.expected_docs, stats["documents"])
+            dm = DocumentManager.getInstance()
+            results[ocr_workers] = {doc.url: doc.ocrText for doc in dm.documents}
+        for url, ocrText in results[3].items():
+            self.assertTrue(ocrText.startswith("OCR text of scan_"))
+            self.assertEqual(results[1][url], ocrText)
+        # a file without OCR text does not stop the collect
+        missing = Document(fullpath=f"{self.base_dir}/missing.pdf", ocrText="?")
+        with OcrPool(max_workers=2) as ocrPool:
+            ocrPool.addOcrTextsToDocuments([missing])
+        self.assertIsNone(missing.ocrText)
@@ -0,0 +1,87 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import shutil
+import tempfile
+from datetime import datetime
+
+from lodstorage.sql import SQLDB
+from ngwidgets.basetest import Basetest
+
+from scan.dms import DMSStorage, Document, DocumentManager
+from scan.entity import EntityManager
+
+
+class TestBulkStore(Basetest):
+    """
+    test the bulk insert path of the EntityManager
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.cache_dir = tempfile.mkdtemp(prefix="scan2wiki_cache_")
+        DMSStorage.cacheRootDir = self.cache_dir
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        DMSStorage.cacheRootDir = None
+        shutil.rmtree(self.cache_dir)
+
+    def getDocuments(self, count: int, offset: int = 0) -> list:
+        """
+        get the given number of documents
+        """
+        documents = []
+        for index in range(offset, offset + count):
+            doc = Document(
+                archiveName="test-scan",
+                folderPath=f"/scan/{index % 12}",
+                name=f"scan_{index}.pdf",
+                url=f"http://localhost/scan/scan_{index}.pdf",
+                size=index,
+                lastModified=datetime(2024, 1, 1, 12, 0, index % 60),
+            )
+            documents.append(doc)
+        return documents
+
+    def test_bulk_store(self):
+        """
+        test storing many documents in batches
+        """
+        dm = DocumentManager(mode="sql")
+        dm.documents = self.getDocuments(20000)
+        dm.store(batchSize=5000)
+        key = (Document, "document", "url")
+        self.assertIn(key, EntityManager.entityInfoCache)
+        # append and replace with the cached entity info
+        dm.documents = self.getDocuments(100, offset=19950)
+        dm.store(append=True, replace=True)
+        sqlDB = SQLDB(dm.getCacheFile())
+        journal_mode = sqlDB.c.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual("wal", journal_mode)
+        count = sqlDB.query("SELECT COUNT(*) AS count FROM document")[0]["count"]
+        self.assertEqual(20050, count)
+        record = sqlDB.query(
+            "SELECT * FROM document WHERE url=(?)",
+            ("http://localhost/scan/scan_42.pdf",),
+        )[0]
+        self.assertEqual(42, record["size"])
+        self.assertEqual(datetime(2024, 1, 1, 12, 0, 42), record["lastModified"])
+        self.assertIsNone(record["ocrText"])
+
+    def test_append_to_legacy_table(self):
+        """
+        test appending to a table that has fewer columns than the samples
+        """
+        dm = DocumentManager(mode="sql")
+        sqlDB = SQLDB(dm.getCacheFile())
+        sqlDB.execute("""CREATE TABLE document(archiveName TEXT, folderPath TEXT,
+pageTitle TEXT, url TEXT PRIMARY KEY, name TEXT, ocrText TEXT)""")
+        sqlDB.close()
+        dm.documents = self.getDocuments(10)
+        dm.store(append=True, replace=True)
+        dm = DocumentManager.getInstance()
+        self.assertEqual(10, len(dm.documents))
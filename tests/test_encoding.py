@@ -0,0 +1,84 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import shutil
+import tempfile
+
+from ngwidgets.basetest import Basetest
+
+from scan.dms import DMSStorage, Document
+from scan.encoding import TextFileDecoder
+from scan.textcache import TextCache
+
+
+class TestTextFileDecoder(Basetest):
+    """
+    test the cached encoding detection of text files
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.cache_dir = tempfile.mkdtemp(prefix="scan2wiki_cache_")
+        DMSStorage.cacheRootDir = self.cache_dir
+        TextFileDecoder.encodings.clear()
+        self.textCache = TextCache(os.path.join(self.cache_dir, "textcache.db"))
+        self.text = "Rechnung\nHerrn Jürgen Müller\nGroßstraße 5\n"
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        DMSStorage.closeSqlDB()
+        DMSStorage.cacheRootDir = None
+        TextFileDecoder.encodings.clear()
+        shutil.rmtree(self.cache_dir)
+
+    def writeFile(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.cache_dir, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_legacy_encoding(self):
+        """
+        test that the encoding of a legacy file is detected once and remembered
+        """
+        path = self.writeFile(
+            "scan.txt", self.text.replace("\n", "\r\n").encode("cp1252")
+        )
+        decoder = TextFileDecoder(self.textCache)
+        self.assertEqual(self.text, decoder.read(path))
+        encoding = self.textCache.getEncoding(path, os.stat(path))
+        self.assertIsNotNone(encoding)
+        self.assertEqual(self.text.encode("cp1252"), self.text.encode(encoding))
+        # a new process only has the persistent cache
+        TextFileDecoder.encodings.clear()
+        self.assertEqual(self.text, decoder.read(path))
+        self.assertEqual(1, len(TextFileDecoder.encodings))
+        self.assertEqual("Rechnung\nHerrn Jürgen Müller\n", decoder.readHead(path, 2))
+        # the UTF-8 files need no memory
+        utf8 = self.writeFile("utf8.txt", self.text.encode("utf-8"))
+        self.assertEqual(self.text, decoder.read(utf8))
+        self.assertIsNone(self.textCache.getEncoding(utf8, os.stat(utf8)))
+
+    def test_prefix_not_representative(self):
+        """
+        test a legacy file whose prefix is plain ASCII
+        """
+        content = b"x" * (TextFileDecoder.PREFIX_SIZE + 10) + self.text.encode("cp1252")
+        path = self.writeFile("long.txt", content)
+        text = TextFileDecoder(self.textCache).read(path)
+        self.assertTrue(text.endswith(self.text))
+
+    def test_normalize(self):
+        """
+        test keeping the UTF-8 text of legacy files in the text cache
+        """
+        path = self.writeFile("scan.txt", self.text.encode("cp1252"))
+        decoder = TextFileDecoder(self.textCache, normalize=True)
+        self.assertEqual(self.text, decoder.read(path))
+        self.assertEqual(self.text, self.textCache.get(path, onlyKnown=True))
+        doc = Document.ofPath(os.path.join(self.cache_dir, "scan.pdf"))
+        self.assertEqual(self.text, doc.getOcrTextFromPath(self.cache_dir))
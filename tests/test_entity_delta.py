@@ -0,0 +1,122 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import shutil
+import tempfile
+
+from ngwidgets.basetest import Basetest
+
+from scan.dms import DMSStorage, Document, DocumentManager
+from scan.sqlpool import SQLConnectionPool
+
+
+class TestEntityDelta(Basetest):
+    """
+    test storing only the changed entities
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.cache_dir = tempfile.mkdtemp(prefix="scan2wiki_cache_")
+        DMSStorage.cacheRootDir = self.cache_dir
+        dm = DocumentManager(mode="sql")
+        for index in range(100):
+            doc = Document(
+                archiveName="test-scan",
+                folderPath="/scan/2024",
+                name=f"scan_{index}.pdf",
+                url=f"http://localhost/scan/scan_{index}.pdf",
+                ocrText=f"Rechnung {index}",
+            )
+            dm.documents.append(doc)
+        dm.store()
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        DMSStorage.closeSqlDB()
+        DMSStorage.cacheRootDir = None
+        shutil.rmtree(self.cache_dir)
+
+    def traceStatements(self, dm: DocumentManager) -> list:
+        """
+        trace the SQL statements of the current thread's connection
+        """
+        statements = []
+        pool = SQLConnectionPool.getPool(dm.getCacheFile())
+        pool.getConnection().set_trace_callback(statements.append)
+        return statements
+
+    def test_delta_store(self):
+        """
+        test that inserted, modified and deleted documents are stored as delta
+        """
+        dm = DocumentManager.getInstance()
+        self.assertTrue(dm.isTracked())
+        self.assertEqual([], dm.getChanges()["modified"])
+        # loading the text lazily is not a modification
+        self.assertEqual("Rechnung 1", dm.documents[1].ocrText)
+        self.assertEqual([], dm.getChanges()["modified"])
+        dm.documents[2].pageTitle = "Scan 2"
+        # re-OCR
+        dm.documents[3].ocrText = "Quittung 3"
+        del dm.documents[4]
+        dm.documents.append(
+            Document(
+                archiveName="test-scan",
+                folderPath="/scan/2024",
+                name="new.pdf",
+                url="http://localhost/scan/new.pdf",
+                ocrText="Lieferschein",
+            )
+        )
+        changes = dm.getChanges()
+        self.assertEqual(["new.pdf"], [r["name"] for r in changes["inserted"]])
+        self.assertEqual(
+            ["scan_2.pdf", "scan_3.pdf"], [r["name"] for r in changes["modified"]]
+        )
+        self.assertEqual(["http://localhost/scan/scan_4.pdf"], changes["deleted"])
+        statements = self.traceStatements(dm)
+        dm.store()
+        documentWrites = [
+            sql
+            for sql in statements
+            if sql.startswith(("INSERT", "DELETE", "DROP", "CREATE"))
+            and " document " in f"{sql} ".replace("(", " ")
+        ]
+        self.assertEqual(4, len(documentWrites), documentWrites)
+        self.assertEqual(
+            {"inserted": [], "modified": [], "deleted": []}, dm.getChanges()
+        )
+        self.assertEqual(100, dm.getMeta()["rowCount"])
+        dm = DocumentManager.getInstance()
+        self.assertEqual(100, len(dm.documents))
+        docs = {doc.name: doc for doc in dm.documents}
+        self.assertEqual("Scan 2", docs["scan_2.pdf"].pageTitle)
+        self.assertEqual("Quittung 3", docs["scan_3.pdf"].ocrText)
+        self.assertEqual("Rechnung 2", docs["scan_2.pdf"].ocrText)
+        self.assertNotIn("scan_4.pdf", docs)
+        self.assertEqual(1, len(dm.search("Quittung")))
+        self.assertEqual(1, len(dm.search("Lieferschein")))
+        # the unloaded text of the modified document is kept in the index
+        self.assertEqual(1, len(dm.search("Rechnung 2")))
+        self.assertEqual(0, len(dm.search("Rechnung 4")))
+
+    def test_store_records(self):
+        """
+        test that attributes missing from the samples are stored
+        """
+        dm = DocumentManager.getInstance()
+        dm.documents[0].checksum = "abc"
+        records = dm.getStoreRecords(dm.documents[:2])
+        self.assertEqual("abc", records[0]["checksum"])
+        self.assertNotIn("fields", records[0])
+        # the JSON cache keeps all attributes of the records
+        jm = DocumentManager(mode="json")
+        jm.documents = dm.documents[:2]
+        jm.store()
+        lod = DocumentManager(mode="json").fromStore(setList=False)
+        self.assertEqual("abc", lod[0]["checksum"])
+        self.assertEqual(2, len(lod))
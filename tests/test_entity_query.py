@@ -0,0 +1,187 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import shutil
+import tempfile
+from datetime import datetime
+
+from lodstorage.sql import SQLDB
+from ngwidgets.basetest import Basetest
+
+from scan.dms import DMSStorage, Document, DocumentManager, Folder, FolderManager
+from scan.entity import LazyEntityList
+from scan.sqlpool import SQLConnectionPool
+
+
+class TestEntityQuery(Basetest):
+    """
+    test the SQL query API of the EntityManager
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.cache_dir = tempfile.mkdtemp(prefix="scan2wiki_cache_")
+        DMSStorage.cacheRootDir = self.cache_dir
+        self.dm = DocumentManager(mode="sql")
+        for index in range(30):
+            doc = Document(
+                archiveName="test-scan" if index < 20 else "other-scan",
+                folderPath=f"/scan/{2020 + index % 3}",
+                name=f"scan_{index:02d}.pdf",
+                url=f"http://localhost/scan/scan_{index:02d}.pdf",
+                size=index * 10,
+                lastModified=datetime(2024, 1, 1 + index),
+                ocrText=f"text {index}",
+            )
+            self.dm.documents.append(doc)
+        self.dm.store()
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        DMSStorage.cacheRootDir = None
+        shutil.rmtree(self.cache_dir)
+
+    def test_query(self):
+        """
+        test equality, range, prefix, order and paging filters
+        """
+        docs = self.dm.query(
+            equals={"archiveName": "test-scan", "folderPath": "/scan/2021"}
+        )
+        self.assertEqual(7, len(docs))
+        self.assertIsInstance(docs[0], Document)
+        docs = self.dm.query(
+            ranges={"size": (100, 150)},
+            orderBy="-size",
+            limit=2,
+            offset=1,
+        )
+        self.assertEqual(["scan_14.pdf", "scan_13.pdf"], [doc.name for doc in docs])
+        records = self.dm.queryLoD(
+            prefixes={"name": "scan_2"},
+            ranges={"lastModified": (datetime(2024, 1, 25), None)},
+            columns=["name"],
+            orderBy="name",
+        )
+        self.assertEqual(
+            [{"name": f"scan_{index}.pdf"} for index in range(24, 30)], records
+        )
+        self.assertEqual(10, self.dm.count(equals={"archiveName": "other-scan"}))
+        self.assertEqual(
+            3,
+            self.dm.count(
+                equals={"name": ["scan_01.pdf", "scan_02.pdf", "x", "scan_03.pdf"]}
+            ),
+        )
+        with self.assertRaises(ValueError):
+            self.dm.query(equals={"name or 1=1": "x"})
+
+    def test_indexes(self):
+        """
+        test that the filters run on the automatically created indexes
+        """
+        fm = FolderManager(mode="sql")
+        fm.folders.append(Folder(archiveName="test-scan", path="/scan/2021"))
+        fm.store()
+        self.assertEqual(
+            1, len(fm.query(equals={"archiveName": "test-scan", "path": "/scan/2021"}))
+        )
+        sqlDB = SQLDB(self.dm.getCacheFile())
+        plan = sqlDB.c.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM document WHERE archiveName=? AND folderPath=?",
+            ("test-scan", "/scan/2021"),
+        ).fetchall()
+        self.assertIn("idx_document_archiveName_folderPath", str(plan))
+        indexes = sqlDB.query("SELECT name FROM sqlite_master WHERE type='index'")
+        self.assertIn(
+            "idx_folder_archiveName_path", [record["name"] for record in indexes]
+        )
+
+    def test_lazy_list(self):
+        """
+        test paging the entities on demand
+        """
+        dm = DocumentManager.getInstance(lazy=True)
+        documents = dm.documents
+        self.assertIsInstance(documents, LazyEntityList)
+        documents.pageSize = 4
+        documents.maxPages = 2
+        self.assertEqual(30, len(documents))
+        self.assertEqual(0, len(documents.pages))
+        self.assertEqual("scan_05.pdf", documents[5].name)
+        self.assertEqual("scan_29.pdf", documents[-1].name)
+        self.assertEqual(
+            ["scan_08.pdf", "scan_10.pdf"], [doc.name for doc in documents[8:12:2]]
+        )
+        names = [doc.name for doc in documents]
+        self.assertEqual([f"scan_{index:02d}.pdf" for index in range(30)], names)
+        # only the last pages are kept and entities are constructed on access
+        self.assertEqual(2, len(documents.pages))
+        records, entities = documents.getPage(0)
+        self.assertEqual([None] * 4, entities)
+        with self.assertRaises(IndexError):
+            documents[30]
+        other = dm.fromStoreLazy(equals={"archiveName": "other-scan"})
+        self.assertEqual(10, len(other))
+        self.assertEqual("scan_20.pdf", other[0].name)
+        # the pages continue after the last rowid of the page before
+        statements = []
+        pool = SQLConnectionPool.getPool(dm.getCacheFile())
+        pool.getConnection().set_trace_callback(statements.append)
+        documents = dm.fromStoreLazy(pageSize=4, ranges={"size": (0, None)})
+        names = [doc.name for doc in documents]
+        pool.getConnection().set_trace_callback(None)
+        self.assertEqual([f"scan_{index:02d}.pdf" for index in range(30)], names)
+        pages = [sql for sql in statements if "LIMIT" in sql]
+        self.assertEqual(8, len(pages))
+        for sql in pages[1:]:
+            self.assertIn("rowid>=", sql)
+            self.assertTrue(sql.endswith("OFFSET 0"), sql)
+
+    def test_meta(self):
+        """
+        test the metadata maintained by storing and deleting
+        """
+        meta = self.dm.getMeta()
+        self.assertEqual(30, meta["rowCount"])
+        self.assertEqual("Document", meta["entityName"])
+        self.assertIsInstance(meta["lastStored"], datetime)
+        self.assertEqual(12, len(meta["schemaVersion"]))
+        self.assertTrue(self.dm.isCached())
+        self.dm.deleteDocuments(["http://localhost/scan/scan_00.pdf", "unknown"])
+        self.assertEqual(29, self.dm.getMeta()["rowCount"])
+        # appended rows replacing existing ones are not counted twice
+        self.dm.documents = self.dm.documents[:2]
+        self.dm.store(append=True, replace=True)
+        self.assertEqual(30, self.dm.getMeta()["rowCount"])
+        # only the new keys of a replacing batch are added
+        records = self.dm.getLoD(limit_to_sample_fields=True)[:2]
+        newRecord = {**records[0], "url": "http://localhost/scan/new.pdf"}
+        self.dm.storeLoD(records + [newRecord, newRecord], append=True, replace=True)
+        self.assertEqual(31, self.dm.getMeta()["rowCount"])
+        self.assertEqual(31, self.dm.count())
+
+        # a failing metadata update rolls back the last batch of rows
+        def failingStoreMeta(*_args, **_kwargs):
+            raise Exception("meta failed")
+
+        self.dm.storeMeta = failingStoreMeta
+        failedRecord = {**records[0], "url": "http://localhost/scan/failed.pdf"}
+        with self.assertRaises(Exception):
+            self.dm.storeLoD([failedRecord], append=True, replace=True)
+        del self.dm.storeMeta
+        sqlDB = SQLDB(self.dm.getCacheFile())
+        rows = sqlDB.query("SELECT COUNT(*) AS count FROM document")
+        sqlDB.close()
+        self.assertEqual(31, rows[0]["count"])
+        self.assertEqual(31, self.dm.getMeta()["rowCount"])
+        # a table stored by a former version gets its metadata on first access
+        sqlDB = SQLDB(self.dm.getCacheFile())
+        sqlDB.execute("DROP TABLE entity_meta")
+        sqlDB.close()
+        fm = FolderManager(mode="sql")
+        self.assertFalse(fm.isCached())
+        self.assertEqual(31, self.dm.getMeta()["rowCount"])
@@ -0,0 +1,118 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import fitz
+from ngwidgets.basetest import Basetest
+
+from scan.dms import DMSStorage
+from scan.extract import BatchExtractor
+from scan.extract_cmd import main
+
+
+class TestBatchExtract(Basetest):
+    """
+    test the resumable batch text extraction
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.cache_dir = tempfile.mkdtemp(prefix="scan2wiki_cache_")
+        self.archive_dir = tempfile.mkdtemp(prefix="scan2wiki_archive_")
+        DMSStorage.cacheRootDir = self.cache_dir
+        for folder in ["2024", "2025", ".ocr"]:
+            os.makedirs(os.path.join(self.archive_dir, folder))
+            for index in range(3):
+                pdf = fitz.open()
+                pdf.new_page().insert_text((72, 72), f"Rechnung {folder} {index}")
+                pdf.save(os.path.join(self.archive_dir, folder, f"scan_{index}.pdf"))
+                pdf.close()
+        with open(os.path.join(self.archive_dir, "2025", "broken.pdf"), "wb") as f:
+            f.write(b"no pdf")
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        DMSStorage.closeSqlDB()
+        DMSStorage.cacheRootDir = None
+        shutil.rmtree(self.cache_dir)
+        shutil.rmtree(self.archive_dir)
+
+    def test_resume(self):
+        """
+        test that an interrupted run resumes where it stopped
+        """
+        extractor = BatchExtractor([self.archive_dir], max_workers=2, chunksize=1)
+        self.assertEqual(7, len(list(extractor.iterFiles())))
+        # simulate an interruption after the first two files
+        stop = 2
+
+        def interrupt(stats, _result):
+            if stats.files == stop:
+                raise KeyboardInterrupt()
+
+        # a sequential run checkpoints the first two files in order
+        sequential = BatchExtractor([self.archive_dir], max_workers=1)
+        self.assertEqual(extractor.checkpointPath, sequential.checkpointPath)
+        with self.assertRaises(KeyboardInterrupt):
+            sequential.run(progress=interrupt)
+        self.assertEqual(2, len(extractor.readCheckpoint()))
+        stats = extractor.run()
+        self.assertEqual(2, stats.skipped)
+        self.assertEqual(5, stats.files)
+        self.assertEqual(1, stats.failures)
+        self.assertEqual(4, stats.pages)
+        self.assertEqual(6, DMSStorage.getTextCache().getStats()["count"])
+        stats = extractor.run(retryFailures=True)
+        self.assertEqual(1, stats.files)
+
+    def test_resume_interleaved(self):
+        """
+        test resuming with interleaved checkpointed files
+        that do not fit into the window of submitted chunks
+        """
+        os.makedirs(os.path.join(self.archive_dir, "2026"))
+        for index in range(23):
+            pdf = fitz.open()
+            pdf.new_page().insert_text((72, 72), f"Rechnung 2026 {index}")
+            pdf.save(os.path.join(self.archive_dir, "2026", f"scan_{index:02d}.pdf"))
+            pdf.close()
+        extractor = BatchExtractor([self.archive_dir], max_workers=2, chunksize=1)
+        paths = list(extractor.iterFiles())
+        self.assertEqual(30, len(paths))
+        self.assertLess(extractor.window, len(paths))
+        os.makedirs(os.path.dirname(extractor.checkpointPath), exist_ok=True)
+        with open(extractor.checkpointPath, "w", encoding="utf-8") as checkpoint:
+            for path in paths[1::2]:
+                checkpoint.write(json.dumps({"path": path, "ok": True}) + "\n")
+        stats = extractor.run()
+        self.assertEqual(15, stats.skipped)
+        self.assertEqual(15, stats.files)
+
+    def test_extract_cmd(self):
+        """
+        test the command line
+        """
+        checkpoint = os.path.join(self.cache_dir, "checkpoint.jsonl")
+        argv = [self.archive_dir, "-w", "1", "-q", "--checkpoint", checkpoint]
+        self.assertEqual(1, main(argv))
+        with open(checkpoint) as f:
+            results = [json.loads(line) for line in f]
+        self.assertEqual(7, len(results))
+        self.assertEqual(
+            ["broken.pdf"],
+            [
+                os.path.basename(result["path"])
+                for result in results
+                if not result["ok"]
+            ],
+        )
+        self.assertEqual(1, main(argv + ["--restart"]))
+        with open(checkpoint) as f:
+            self.assertEqual(7, len(f.readlines()))
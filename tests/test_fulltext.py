@@ -0,0 +1,134 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import shutil
+import tempfile
+
+from ngwidgets.basetest import Basetest
+
+from scan.dms import DMSStorage, Document, DocumentManager
+from scan.fulltext import FullTextIndex
+from scan.sqlpool import SQLConnectionPool
+from scan.textstore import TextStore
+
+
+class TestFullText(Basetest):
+    """
+    test the FTS5 full text index of the documents
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.cache_dir = tempfile.mkdtemp(prefix="scan2wiki_cache_")
+        DMSStorage.cacheRootDir = self.cache_dir
+        self.dm = DocumentManager.getInstance()
+        texts = {
+            "aldi": "Kassenbon ALDI SÜD Rechnung Milch <b>Brot</b>",
+            "declaration": "Universal Declaration of Human Rights",
+            "exam": "Requirements Engineering Prüfung",
+        }
+        for name, text in texts.items():
+            doc = Document(
+                archiveName="test-scan",
+                folderPath="/scan/2021",
+                name=f"{name}.pdf",
+                pageTitle=name,
+                url=f"http://localhost/scan/2021/{name}.pdf",
+                ocrText=text,
+            )
+            self.dm.documents.append(doc)
+        self.dm.store(append=True, replace=True)
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        DMSStorage.cacheRootDir = None
+        shutil.rmtree(self.cache_dir)
+
+    def test_match_query(self):
+        """
+        test converting search texts to FTS5 MATCH expressions
+        """
+        self.assertEqual(
+            '"ALDI" AND "Rechn"*', FullTextIndex.toMatchQuery("ALDI Rechn*")
+        )
+        self.assertEqual('"say" AND """hi"""', FullTextIndex.toMatchQuery('say "hi"'))
+        self.assertEqual("", FullTextIndex.toMatchQuery("  * "))
+
+    def test_search(self):
+        """
+        test searching the OCR text
+        """
+        results = self.dm.search("rechn*")
+        self.assertEqual(1, len(results))
+        result = results[0]
+        self.assertEqual("aldi.pdf", result["name"])
+        self.assertIn("<mark>Rechnung</mark>", result["snippet"])
+        # OCR text is escaped
+        self.assertIn(
+            "&lt;b&gt;<mark>Brot</mark>&lt;/b&gt;", self.dm.search("brot")[0]["snippet"]
+        )
+        # diacritics are ignored
+        self.assertEqual(1, len(self.dm.search("Prufung")))
+        self.assertEqual(0, len(self.dm.search("aldi", archiveName="other-scan")))
+
+    def test_search_page(self):
+        """
+        test that only the texts of the requested page are decoded
+        """
+        for index in range(30):
+            doc = Document(
+                archiveName="test-scan",
+                folderPath="/scan/2022",
+                name=f"bon_{index}.pdf",
+                url=f"http://localhost/scan/2022/bon_{index}.pdf",
+                ocrText="Rechnung " * (index + 1),
+            )
+            self.dm.documents.append(doc)
+        self.dm.store(append=True, replace=True)
+        decoded = []
+
+        def decode(data):
+            decoded.append(data)
+            return TextStore.decode(data)
+
+        sqlDB = self.dm.fullTextIndex.getPool().getSQLDB()
+        sqlDB.c.create_function(
+            FullTextIndex.DECODE_FUNCTION, 1, decode, deterministic=True
+        )
+        first = self.dm.search("rechnung", limit=5)
+        self.assertEqual(5, len(first))
+        self.assertLessEqual(len(decoded), 10)
+        second = self.dm.search("rechnung", limit=5, offset=5)
+        ranks = [record["rank"] for record in first + second]
+        self.assertEqual(sorted(ranks), ranks)
+        urls = {record["url"] for record in first + second}
+        self.assertEqual(10, len(urls))
+
+    def test_sync(self):
+        """
+        test that the index follows updates and deletes
+        """
+        url = "http://localhost/scan/2021/aldi.pdf"
+        doc = self.dm.documents[0]
+        doc.ocrText = "Kassenbon LIDL"
+        self.dm.documents = [doc]
+        self.dm.store(append=True, replace=True)
+        self.assertEqual(0, len(self.dm.search("süd")))
+        self.assertEqual(1, len(self.dm.search("lidl")))
+        self.dm.deleteDocuments([url])
+        self.assertEqual(0, len(self.dm.search("lidl")))
+        # the index matches its content and keeps no copy of the texts
+        with SQLConnectionPool.getPool(self.dm.getCacheFile()).writer() as sqlDB:
+            sqlDB.c.execute(
+                "INSERT INTO document_fts(document_fts,rank) VALUES ('integrity-check',1)"
+            )
+            tables = sqlDB.query(
+                "SELECT name FROM sqlite_master WHERE name='document_fts_content' AND type='table'"
+            )
+        self.assertEqual([], tables)
+        # a lost index is rebuilt from the document table
+        self.assertEqual(2, self.dm.fullTextIndex.rebuild())
+        self.assertEqual(1, len(self.dm.search("human rights")))
@@ -0,0 +1,161 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import queue
+import shutil
+import tempfile
+
+import fitz
+from ngwidgets.basetest import Basetest
+
+from scan.dms import DMSStorage
+from scan.inbox import InboxDelta, InboxIndex
+from scan.scans import ScanRowCache, Scans
+
+
+class TestInboxIndex(Basetest):
+    """
+    test the live index of the scan inbox
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.cache_dir = tempfile.mkdtemp(prefix="scan2wiki_cache_")
+        self.inbox_dir = tempfile.mkdtemp(prefix="scan2wiki_inbox_")
+        DMSStorage.cacheRootDir = self.cache_dir
+        for index in range(3):
+            self.addScan(f"scan_{index}.pdf", f"Rechnung {index}")
+        self.inbox = InboxIndex(Scans(self.inbox_dir))
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        self.inbox.stop()
+        DMSStorage.closeSqlDB()
+        DMSStorage.cacheRootDir = None
+        shutil.rmtree(self.cache_dir)
+        shutil.rmtree(self.inbox_dir)
+
+    def addScan(self, name: str, text: str) -> str:
+        path = os.path.join(self.inbox_dir, name)
+        pdf = fitz.open()
+        pdf.new_page().insert_text((72, 72), text)
+        pdf.save(path)
+        pdf.close()
+        return path
+
+    def test_events(self):
+        """
+        test applying file system events as row deltas
+        """
+        self.inbox.load()
+        lod = self.inbox.get_rows()
+        self.assertEqual(3, len(lod))
+        subscriber = self.inbox.subscribe()
+        path = self.addScan("scan_new.pdf", "Lieferschein")
+        delta = self.inbox.on_event("created", path)
+        self.assertEqual(4, delta.add[0]["#"])
+        self.assertIn("Lieferschein", delta.add[0]["textHead"])
+        self.assertIs(delta, subscriber.get_nowait())
+        delta.apply_to(lod)
+        self.assertEqual(4, lod[0]["#"])
+        # a text file updates the row of its document
+        with open(os.path.join(self.inbox_dir, "scan_new.txt"), "w") as f:
+            f.write("Lieferschein korrigiert")
+        delta = self.inbox.on_event("modified", f.name)
+        self.assertEqual([4], [row["#"] for row in delta.update])
+        self.assertIn("korrigiert", delta.update[0]["textHead"])
+        moved = os.path.join(self.inbox_dir, "scan_moved.pdf")
+        os.rename(os.path.join(self.inbox_dir, "scan_1.pdf"), moved)
+        delta = self.inbox.on_event("moved", moved.replace("moved", "1"), moved)
+        self.assertEqual(1, len(delta.remove))
+        self.assertEqual(5, delta.add[0]["#"])
+        os.remove(path)
+        delta = self.inbox.on_event("deleted", path)
+        self.assertEqual([{"#": 4}], delta.remove)
+        for delta in [subscriber.get_nowait() for _i in range(3)]:
+            delta.apply_to(lod)
+        self.assertEqual(
+            sorted(row["#"] for row in self.inbox.get_rows()),
+            sorted(row["#"] for row in lod),
+        )
+        # files outside the inbox and of other types are ignored
+        self.assertTrue(self.inbox.on_event("created", "/tmp/other/x.pdf").is_empty())
+        self.assertTrue(
+            self.inbox.on_event("created", f"{self.inbox_dir}/notes.doc").is_empty()
+        )
+
+    def test_row_cache(self):
+        """
+        test that the rows of events are taken from the row cache
+        """
+        row_cache = ScanRowCache(os.path.join(self.cache_dir, "rows.db"))
+        self.inbox = InboxIndex(Scans(self.inbox_dir, row_cache=row_cache))
+        self.inbox.load()
+        path = self.addScan("scan_new.pdf", "Lieferschein")
+        delta = self.inbox.on_event("created", path)
+        self.assertEqual(1, len(delta.add))
+        self.assertIn("scan_new.pdf", row_cache.getRows(self.inbox_dir))
+        # repeated events of an unchanged file do not change the row
+        self.assertTrue(self.inbox.on_event("modified", path).is_empty())
+        self.assertTrue(self.inbox.on_event("closed", path).is_empty())
+
+    def test_watcher(self):
+        """
+        test that a new scan is noticed by the watcher
+        """
+        self.inbox.start()
+        subscriber = self.inbox.subscribe()
+        self.addScan("scan_live.pdf", "Kassenbon")
+        delta = subscriber.get(timeout=5)
+        self.assertIsInstance(delta, InboxDelta)
+        names = [row["name"] for row in delta.add + delta.update]
+        self.assertTrue(any("scan_live.pdf" in name for name in names))
+        self.assertEqual(4, len(self.inbox.get_rows()))
+        self.inbox.stop()
+        with self.assertRaises(queue.Empty):
+            self.addScan("scan_late.pdf", "Kassenbon")
+            while True:
+                subscriber.get(timeout=0.5)
+
+    def test_query(self):
+        """
+        test paging, sorting and filtering the rows of the inbox
+        """
+        for index, name in enumerate(["b.pdf", "a.pdf", "c.pdf"]):
+            path = self.addScan(name, f"Beleg {index}" * (index + 1))
+            os.utime(path, (1000 + index, 1000 + index))
+        self.inbox.load()
+        page = self.inbox.query(limit=2, sort_by="name", descending=False)
+        self.assertEqual(6, page.total)
+        self.assertEqual(3, page.pages)
+        self.assertEqual(2, len(page.rows))
+        self.assertIn("a.pdf", page.rows[0]["name"])
+        page = self.inbox.query(offset=4, limit=4, sort_by="name", descending=True)
+        self.assertEqual(2, len(page.rows))
+        self.assertIn("a.pdf", page.rows[-1]["name"])
+        # the oldest scan is last in the default order
+        page = self.inbox.query()
+        self.assertIn("b.pdf", page.rows[-1]["name"])
+        sizes = [row["size"] for row in self.inbox.query(sort_by="size").rows]
+        self.assertEqual(sorted(sizes, reverse=True), sizes)
+        # filter by file name and text head
+        self.assertEqual(3, self.inbox.query(filter_text="SCAN_").total)
+        page = self.inbox.query(filter_text="beleg 2")
+        self.assertEqual(1, page.total)
+        self.assertIn("c.pdf", page.rows[0]["name"])
+        self.assertEqual(1, self.inbox.query(filter_text="nothing").pages)
+        # the rows are copies
+        page.rows[0]["size"] = -1
+        self.assertNotEqual(-1, self.inbox.query(filter_text="beleg 2").rows[0]["size"])
+        # new scans show up in the sorted order
+        path = self.addScan("0.pdf", "Quittung")
+        self.inbox.on_event("created", path)
+        page = self.inbox.query(limit=1, sort_by="name", descending=False)
+        self.assertEqual(7, page.total)
+        self.assertIn("0.pdf", page.rows[0]["name"])
+        with self.assertRaises(ValueError):
+            self.inbox.query(sort_by="textHead")
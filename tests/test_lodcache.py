@@ -0,0 +1,125 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from datetime import date, datetime
+
+from ngwidgets.basetest import Basetest
+
+from scan.dms import DMSStorage, Document, DocumentManager
+from scan.lodcache import LoDFile
+from scan.product import Product, Products
+
+
+class TestLoDCache(Basetest):
+    """
+    test the binary LoD file cache
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.cache_dir = tempfile.mkdtemp(prefix="scan2wiki_cache_")
+        DMSStorage.cacheRootDir = self.cache_dir
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        DMSStorage.cacheRootDir = None
+        shutil.rmtree(self.cache_dir)
+
+    def test_lod_file(self):
+        """
+        test writing and streaming records
+        """
+        lod = [
+            {"name": "a", "size": 1, "lastModified": datetime(2024, 5, 1, 12, 30, 5)},
+            {"name": "b", "day": date(2024, 5, 2), "pair": (1, 2), "ratio": 0.5},
+            {"name": "c", "size": None, "tags": ["x", "y"], "raw": b"\x00"},
+        ]
+        path = os.path.join(self.cache_dir, "test.lod")
+        lodFile = LoDFile(path, batchSize=2)
+        self.assertEqual(3, lodFile.write(lod))
+        self.assertTrue(LoDFile.isLoDFile(path))
+        self.assertFalse(os.path.isfile(f"{path}.tmp"))
+        self.assertEqual(lod, lodFile.read())
+        records = lodFile.iterRecords()
+        self.assertEqual("a", next(records)["name"])
+        records.close()
+        # a failing writer keeps the former file
+        with self.assertRaises(ValueError):
+            with lodFile.writer() as writer:
+                writer.add({"name": "d"})
+                writer.add({"name": "e", "value": lambda: None})
+        self.assertEqual(lod, lodFile.read())
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 1)
+        with self.assertRaises(ValueError):
+            lodFile.read()
+
+    def test_binary_entity_cache(self):
+        """
+        test the binary cache of an entity manager compared to the JSON cache
+        """
+        documents = []
+        for index in range(20000):
+            doc = Document(
+                archiveName="test-scan",
+                folderPath=f"/scan/{index % 12}",
+                name=f"scan_{index}.pdf",
+                url=f"http://localhost/scan/scan_{index}.pdf",
+                size=index,
+                lastModified=datetime(2024, 1, 1, 12, 0, index % 60),
+            )
+            documents.append(doc)
+        timings = {}
+        for mode in ["json", "binary"]:
+            dm = DocumentManager(mode=mode)
+            dm.documents.extend(documents)
+            cacheFile = dm.store()
+            dm = DocumentManager(mode=mode)
+            start = time.time()
+            # the JSON cache returns the datetimes as ISO strings
+            lod = dm.fromStore(setList=mode == "binary")
+            timings[mode] = time.time() - start
+            self.assertEqual(20000, len(lod))
+            if self.debug:
+                print(
+                    f"{mode}: {os.path.getsize(cacheFile)} bytes {timings[mode]:.3f} s"
+                )
+        self.assertTrue(cacheFile.endswith("document-documents.lod"))
+        self.assertEqual(20000, len(dm.documents))
+        doc = dm.documents[42]
+        self.assertEqual(datetime(2024, 1, 1, 12, 0, 42), doc.lastModified)
+        self.assertEqual(42, doc.size)
+        self.assertEqual(lod[42]["lastModified"], doc.lastModified)
+
+    def test_products_cache(self):
+        """
+        test the binary cache of the products
+        """
+        yaml_path = os.path.join(self.cache_dir, "products.yaml")
+        lod_path = os.path.join(self.cache_dir, "products.lod")
+        products = Products()
+        products.add_product(
+            Product(
+                title="Milch",
+                price="1.09 €",
+                asin="B000000001",
+                gtin="4000000000001",
+                details={"brand": "ja!"},
+            )
+        )
+        products.save(yaml_path=yaml_path, lod_path=lod_path)
+        loaded = Products.ofCache(yaml_path=yaml_path, lod_path=lod_path)
+        self.assertEqual(products.products, loaded.products)
+        self.assertIn("4000000000001", loaded.products_by_gtin)
+        # an outdated cache is refreshed from the YAML file
+        os.remove(lod_path)
+        loaded = Products.ofCache(yaml_path=yaml_path, lod_path=lod_path)
+        self.assertEqual(products.products, loaded.products)
+        self.assertTrue(os.path.isfile(lod_path))
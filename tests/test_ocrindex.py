@@ -0,0 +1,73 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import shutil
+import tempfile
+
+from ngwidgets.basetest import Basetest
+
+from scan.dms import Document
+from scan.ocrindex import OcrDirectoryIndex
+
+
+class TestOcrDirectoryIndex(Basetest):
+    """
+    test the cached index of the OCR text files of a directory
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.archive_dir = tempfile.mkdtemp(prefix="scan2wiki_archive_")
+        self.ocr_dir = os.path.join(self.archive_dir, ".ocr")
+        os.makedirs(self.ocr_dir)
+        OcrDirectoryIndex.clear()
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        OcrDirectoryIndex.clear()
+        shutil.rmtree(self.archive_dir)
+
+    def writeText(self, dirPath: str, name: str, text: str):
+        with open(os.path.join(dirPath, name), "w") as f:
+            f.write(text)
+
+    def touch(self, dirPath: str):
+        """
+        make sure the modification time of the directory changes
+        """
+        stat = os.stat(dirPath)
+        os.utime(dirPath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+
+    def test_multi_page(self):
+        """
+        test reading the text of page files
+        """
+        for page in [1, 2, 3, 5]:
+            self.writeText(self.ocr_dir, f"scan_p{page:03d}.txt", f"page {page}\n")
+        self.writeText(self.archive_dir, "single.txt", "single page")
+        doc = Document.ofPath(os.path.join(self.archive_dir, "scan.pdf"))
+        self.assertIsNone(doc.getOcrTextFromPath(self.archive_dir))
+        text = doc.getOcrTextFromPath(self.ocr_dir, withMultiPage=True)
+        self.assertEqual("page 1\npage 2\npage 3\n", text)
+        self.assertIsNone(doc.getOcrTextFromPath(self.ocr_dir, withMultiPage=False))
+        single = Document.ofPath(os.path.join(self.archive_dir, "single.pdf"))
+        self.assertEqual("single page", single.getOcrTextFromPath(self.archive_dir))
+        self.assertEqual("page 1", doc.readTextHead(max_lines=1))
+
+    def test_invalidation(self):
+        """
+        test that the index is reused until the directory changes
+        """
+        self.writeText(self.ocr_dir, "scan_p001.txt", "page 1\n")
+        index = OcrDirectoryIndex.getIndex(self.ocr_dir)
+        self.assertIs(index, OcrDirectoryIndex.getIndex(self.ocr_dir))
+        self.assertEqual({}, OcrDirectoryIndex.getIndex(self.archive_dir + "/missing"))
+        self.writeText(self.ocr_dir, "scan_p002.txt", "page 2\n")
+        self.touch(self.ocr_dir)
+        pageFiles = OcrDirectoryIndex.getPageFiles(self.ocr_dir, "scan")
+        self.assertEqual(2, len(pageFiles))
+        self.assertIsNot(index, OcrDirectoryIndex.getIndex(self.ocr_dir))
@@ -0,0 +1,134 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import fitz
+from ngwidgets.basetest import Basetest
+
+from scan.dms import DMSStorage, Document
+from scan.pdf import PDFExtractor
+
+
+class TestPDFPages(Basetest):
+    """
+    test the page wise and parallel PDF text extraction
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.tmp_dir = tempfile.mkdtemp(prefix="scan2wiki_pdf_")
+        self.cache_dir = tempfile.mkdtemp(prefix="scan2wiki_cache_")
+        DMSStorage.cacheRootDir = self.cache_dir
+        self.pdf_path = os.path.join(self.tmp_dir, "contract.pdf")
+        self.page_count = 40
+        doc = fitz.open()
+        for index in range(self.page_count):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Vertrag Seite {index + 1}")
+            page.insert_text((72, 96), "Mietsache")
+        doc.save(self.pdf_path)
+        doc.close()
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        PDFExtractor.closeExecutor()
+        DMSStorage.closeSqlDB()
+        DMSStorage.cacheRootDir = None
+        shutil.rmtree(self.tmp_dir)
+        shutil.rmtree(self.cache_dir)
+
+    def test_page_texts(self):
+        """
+        test streaming the page texts
+        """
+        texts = list(PDFExtractor.iterPageTexts(self.pdf_path))
+        self.assertEqual(self.page_count, len(texts))
+        self.assertIn("Seite 1", texts[0])
+        self.assertEqual(texts[5:7], PDFExtractor.extractPages(self.pdf_path, 5, 7))
+
+    def test_parallel_extraction(self):
+        """
+        test that the parallel extraction gives the sequential text
+        """
+        sequential = PDFExtractor.getPDFText(
+            self.pdf_path, useCache=False, max_workers=1
+        )
+        parallel = PDFExtractor.getPDFText(self.pdf_path, useCache=False, max_workers=3)
+        self.assertEqual(sequential, parallel)
+        self.assertIn("Vertrag Seite 40", parallel)
+        self.assertLess(parallel.index("Seite 9\n"), parallel.index("Seite 10\n"))
+        # the processes are shared by the extractions
+        executor = PDFExtractor.executor
+        self.assertIsNotNone(executor)
+        # the text is cached with the same base name
+        PDFExtractor.getPDFText(self.pdf_path, max_workers=3)
+        self.assertIs(executor, PDFExtractor.executor)
+        with open(os.path.join(self.tmp_dir, "contract.txt"), encoding="utf-8") as f:
+            self.assertEqual(sequential, f.read())
+
+    def test_concurrent_extraction(self):
+        """
+        test that concurrent extractions with different page counts share the pool
+        """
+        large_path = os.path.join(self.tmp_dir, "manual.pdf")
+        doc = fitz.open()
+        for index in range(70):
+            doc.new_page().insert_text((72, 72), f"Handbuch Seite {index + 1}")
+        doc.save(large_path)
+        doc.close()
+        jobs = [(self.pdf_path, 2), (large_path, 7)] * 4
+        expected = {
+            path: PDFExtractor.getPDFText(path, useCache=False, max_workers=1)
+            for path in [self.pdf_path, large_path]
+        }
+        with ThreadPoolExecutor(max_workers=len(jobs)) as threads:
+            texts = list(
+                threads.map(
+                    lambda job: PDFExtractor.getPDFText(
+                        job[0], useCache=False, max_workers=job[1]
+                    ),
+                    jobs,
+                )
+            )
+        for (path, _workers), text in zip(jobs, texts):
+            self.assertEqual(expected[path], text)
+        executor = PDFExtractor.executor
+        PDFExtractor.getPDFText(large_path, useCache=False, max_workers=16)
+        self.assertIs(executor, PDFExtractor.executor)
+
+    def test_text_head(self):
+        """
+        test the bounded extraction of the head of the text
+        """
+        self.assertEqual(
+            "Vertrag Seite 1", PDFExtractor.getTextHead(self.pdf_path, max_lines=1)
+        )
+        self.assertEqual(
+            "Vertrag Seite 1\nMietsache\nVertrag Seite 2",
+            PDFExtractor.getTextHead(self.pdf_path, max_lines=3),
+        )
+        self.assertEqual(
+            "Vertrag", PDFExtractor.getTextHead(self.pdf_path, max_chars=7)
+        )
+        head = PDFExtractor.getTextHead(self.pdf_path, max_pages=2)
+        self.assertEqual(2, head.count("Mietsache"))
+        doc = Document()
+        doc.fromFile(self.tmp_dir, "contract.pdf", local=True)
+        self.assertEqual("Vertrag Seite 1\nMietsache", doc.get_text_head(2))
+        # the head is neither kept nor cached
+        self.assertIsNone(doc.ocrText)
+        self.assertEqual(0, DMSStorage.getTextCache().getStats()["count"])
+        # the text of an unchanged file is taken from the cache
+        doc.getOcrText()
+        doc.ocrText = None
+        self.assertEqual(
+            "Vertrag Seite 1\nMietsache\nVertrag Seite 2\nMietsache",
+            doc.get_text_head(4),
+        )
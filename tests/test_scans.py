@@ -6,10 +6,25 @@ Created on 2023-11-14
 
 import os
 import shutil
+import tempfile
 
 from ngwidgets.basetest import Basetest
 
-from scan.scans import Scans
+from scan.scans import ScanRowCache, Scans
+
+
+class CountingScans(Scans):
+    """
+    Scans counting the computed rows
+    """
+
+    def __init__(self, scandir: str, row_cache: ScanRowCache = None):
+        super().__init__(scandir, row_cache=row_cache)
+        self.computed = []
+
+    def get_file_row(self, path: str, index: int, entry=None, entries_by_name=None):
+        self.computed.append(path)
+        return super().get_file_row(path, index, entry, entries_by_name)
 
 
 class TestScans(Basetest):
@@ -62,3 +77,49 @@ class TestScans(Basetest):
         path = "test_file_2.txt"
         scans.delete(path)
         self.assertFalse(os.path.exists(os.path.join(self.test_dir, path)))
+
+    def test_get_file_row_from_dir_entry(self):
+        """
+        Test that rows based on scandir entries match rows based on file names.
+        """
+        scans = Scans(self.test_dir)
+        entries_by_name = scans.get_entries_by_name()
+        for index, path in enumerate(scans.get_valid_files([".txt"])):
+            row = scans.get_file_row(path, index)
+            entry_row = scans.get_file_row(
+                path,
+                index,
+                entry=entries_by_name[path],
+                entries_by_name=entries_by_name,
+            )
+            self.assertEqual(row, entry_row)
+
+    def test_row_cache(self):
+        """
+        Test that only the rows of new or changed files are computed.
+        """
+        cache_dir = tempfile.mkdtemp(prefix="scan2wiki_cache_")
+        try:
+            db_file = os.path.join(cache_dir, "dms.db")
+            scans = CountingScans(self.test_dir, row_cache=ScanRowCache(db_file))
+            rows = scans.get_scan_files(allowed_extensions=[".txt"])
+            self.assertEqual(3, len(scans.computed))
+            self.assertEqual(rows, scans.get_scan_files(allowed_extensions=[".txt"]))
+            self.assertEqual(3, len(scans.computed))
+            path = os.path.join(self.test_dir, "test_file_0.txt")
+            with open(path, "a") as f:
+                f.write(" changed")
+            os.remove(os.path.join(self.test_dir, "test_file_1.txt"))
+            rows = scans.get_scan_files(allowed_extensions=[".txt"])
+            self.assertEqual(2, len(rows))
+            self.assertEqual(["test_file_0.txt"], scans.computed[3:])
+            self.assertEqual([1, 2], sorted(row["#"] for row in rows))
+            # a restart reads the rows from the database
+            restarted = CountingScans(self.test_dir, row_cache=ScanRowCache(db_file))
+            self.assertEqual(
+                rows, restarted.get_scan_files(allowed_extensions=[".txt"])
+            )
+            self.assertEqual([], restarted.computed)
+        finally:
+            ScanRowCache(db_file).getPool().close()
+            shutil.rmtree(cache_dir)
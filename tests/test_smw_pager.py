@@ -0,0 +1,130 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from mwclient import Site
+from ngwidgets.basetest import Basetest
+from wikibot3rd.smw import SMWClient
+
+from scan.dms import Archive
+from scan.smw_pager import SMWPager
+
+
+class AskApiHandler(BaseHTTPRequestHandler):
+    """
+    stand-in for the Semantic MediaWiki ask API serving OCRDocument pages
+    """
+
+    pageCount = 2345
+    # the server side cap of the number of results per request
+    maxLimit = 400
+    requests = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        query = params["query"][0]
+        offset = int(re.search(r"\|offset=(\d+)", query).group(1))
+        limit = int(re.search(r"\|limit=(\d+)", query).group(1))
+        limit = min(limit, AskApiHandler.maxLimit)
+        AskApiHandler.requests.append((offset, limit))
+        results = {}
+        for index in range(offset, min(offset + limit, AskApiHandler.pageCount)):
+            page = f"Scan {index:05d}"
+            timestamp = str(1600000000 + index)
+            results[page] = {
+                "printouts": {
+                    "Category": [{"fulltext": f"Category:{2020 + index % 3}"}],
+                    "lastModified": [{"timestamp": timestamp}],
+                    "created": [{"timestamp": timestamp}],
+                },
+                "fulltext": page,
+            }
+        printrequests = [
+            {"label": "page", "key": "", "redi": "", "typeid": "_wpg", "mode": 2},
+            {"label": "Category", "key": "", "redi": "", "typeid": "_wpg", "mode": 1},
+            {
+                "label": "lastModified",
+                "key": "",
+                "redi": "",
+                "typeid": "_dat",
+                "mode": 1,
+            },
+            {"label": "created", "key": "", "redi": "", "typeid": "_dat", "mode": 1},
+        ]
+        response = {"query": {"printrequests": printrequests, "results": results}}
+        if offset + limit < AskApiHandler.pageCount:
+            response["query-continue-offset"] = offset + limit
+        body = json.dumps(response).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestSMWPager(Basetest):
+    """
+    test paging Semantic MediaWiki ask queries against a local stand-in API
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        AskApiHandler.requests = []
+        self.server = ThreadingHTTPServer(("localhost", 0), AskApiHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        host = f"localhost:{self.server.server_port}"
+        site = Site(host, path="/", scheme="http", do_init=False, force_login=False)
+        self.smw = SMWClient(site)
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_pager(self):
+        """
+        test that all records are fetched in order with a capped page size
+        """
+        pager = SMWPager(self.smw, pageSize=500, max_workers=4, debug=self.debug)
+        pages = [
+            record["page"]
+            for record in pager.iterRecords("{{#ask: [[Category:OCRDocument]]}}")
+        ]
+        expected = [f"Scan {index:05d}" for index in range(AskApiHandler.pageCount)]
+        self.assertEqual(expected, pages)
+        # after the first page the pager adapts to the capped page size
+        self.assertIn((2000, 400), AskApiHandler.requests)
+
+    def test_wiki_archive(self):
+        """
+        test collecting the documents and folders of a wiki archive
+        """
+        archive = Archive(name="test-wiki", server="localhost", wikiid="test")
+        foldersAndDocuments = archive.iterWikiFoldersAndDocuments(
+            smw=self.smw, pageSize=300, max_workers=3
+        )
+        documents = []
+        folders = []
+        for folder, folderDocuments in foldersAndDocuments:
+            documents.extend(folderDocuments)
+            if folder is not None:
+                folders.append(folder)
+        self.assertEqual(AskApiHandler.pageCount, len(documents))
+        self.assertEqual(3, len(folders))
+        self.assertEqual(AskApiHandler.pageCount, sum(f.fileCount for f in folders))
+        doc = documents[1]
+        self.assertEqual("2021", doc.folderPath)
+        self.assertEqual("Scan 00001", doc.name)
+        self.assertTrue(doc.url.endswith("/index.php/Scan_00001"))
@@ -0,0 +1,104 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ngwidgets.basetest import Basetest
+
+from scan.dms import DMSStorage, Document, DocumentManager
+from scan.sqlpool import SQLConnectionPool
+
+
+class TestSQLConnectionPool(Basetest):
+    """
+    test the per thread SQLite connections
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.cache_dir = tempfile.mkdtemp(prefix="scan2wiki_cache_")
+        DMSStorage.cacheRootDir = self.cache_dir
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        DMSStorage.closeSqlDB()
+        DMSStorage.cacheRootDir = None
+        shutil.rmtree(self.cache_dir)
+
+    def getDocuments(self, count: int, offset: int = 0) -> list:
+        """
+        get the given number of documents
+        """
+        documents = []
+        for index in range(offset, offset + count):
+            doc = Document(
+                archiveName="test-scan",
+                folderPath=f"/scan/{index % 10}",
+                name=f"scan_{index}.pdf",
+                url=f"http://localhost/scan/scan_{index}.pdf",
+            )
+            documents.append(doc)
+        return documents
+
+    def test_thread_connections(self):
+        """
+        test that each thread reuses its own connection
+        """
+        pool = DMSStorage.getPool()
+        self.assertIs(pool, SQLConnectionPool.getPool(pool.dbFile))
+        connection = pool.getConnection()
+        self.assertIs(connection, DMSStorage.getSqlDB().c)
+        mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual("wal", mode)
+        other = []
+        thread = threading.Thread(target=lambda: other.append(pool.getConnection()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(connection, other[0])
+        self.assertEqual(2, len(pool.connections))
+        pool.close()
+        self.assertEqual(0, len(pool.connections))
+        self.assertIsNot(connection, pool.getConnection())
+        # the connection of the ended thread is not reopened
+        self.assertEqual(1, len(pool.connections))
+
+    def test_concurrent_reads_while_writing(self):
+        """
+        test that readers are not locked out by a running bulk store
+        """
+        dm = DocumentManager(mode="sql")
+        dm.documents = self.getDocuments(100)
+        dm.store()
+        done = threading.Event()
+
+        def write():
+            try:
+                for offset in range(100, 5100, 1000):
+                    dm.documents = self.getDocuments(1000, offset)
+                    dm.store(append=True, batchSize=100)
+            finally:
+                done.set()
+
+        def read(_index):
+            reader = DocumentManager(mode="sql")
+            counts = []
+            while not done.is_set() or not counts:
+                counts.append(reader.count(equals={"archiveName": "test-scan"}))
+                reader.queryLoD(equals={"folderPath": "/scan/3"}, columns=["url"])
+            return counts
+
+        writer = threading.Thread(target=write)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            writer.start()
+            results = list(executor.map(read, range(4)))
+        writer.join()
+        for counts in results:
+            self.assertEqual(sorted(counts), counts)
+            self.assertGreaterEqual(counts[0], 100)
+        self.assertEqual(5100, dm.count())
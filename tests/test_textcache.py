@@ -0,0 +1,165 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import shutil
+import tempfile
+
+import fitz
+from ngwidgets.basetest import Basetest
+
+from scan.dms import DMSStorage, Document
+from scan.textcache import TextCache
+
+
+class TestTextCache(Basetest):
+    """
+    test the central content addressed text cache
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.cache_dir = tempfile.mkdtemp(prefix="scan2wiki_cache_")
+        self.archive_dir = tempfile.mkdtemp(prefix="scan2wiki_archive_")
+        DMSStorage.cacheRootDir = self.cache_dir
+        self.extractions = []
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        DMSStorage.closeSqlDB()
+        DMSStorage.cacheRootDir = None
+        shutil.rmtree(self.cache_dir)
+        shutil.rmtree(self.archive_dir)
+
+    def writeFile(self, name: str, content: str) -> str:
+        path = os.path.join(self.archive_dir, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def extract(self, path: str):
+        """
+        get an extraction function that records its calls
+        """
+
+        def extract():
+            self.extractions.append(path)
+            with open(path) as f:
+                return f.read().upper()
+
+        return extract
+
+    def test_text_cache(self):
+        """
+        test hits, stale entries and content addressing
+        """
+        textCache = TextCache(os.path.join(self.cache_dir, "textcache.db"))
+        path = self.writeFile("a.pdf", "rechnung")
+        self.assertEqual("RECHNUNG", textCache.getText(path, self.extract(path)))
+        self.assertEqual("RECHNUNG", textCache.getText(path, self.extract(path)))
+        self.assertEqual(1, len(self.extractions))
+        # a copy with the same content is a hit
+        copy = self.writeFile("copy.pdf", "rechnung")
+        self.assertEqual("RECHNUNG", textCache.getText(copy, self.extract(copy)))
+        self.assertEqual(1, len(self.extractions))
+        # a changed file is stale
+        self.writeFile("a.pdf", "lieferschein")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+        self.assertEqual("LIEFERSCHEIN", textCache.getText(path, self.extract(path)))
+        self.assertEqual(2, len(self.extractions))
+        stats = textCache.getStats()
+        self.assertEqual(2, stats["count"])
+        self.assertEqual(len("RECHNUNGLIEFERSCHEIN"), stats["size"])
+
+    def test_eviction(self):
+        """
+        test that the least recently used texts are evicted
+        """
+        textCache = TextCache(os.path.join(self.cache_dir, "textcache.db"))
+        paths = [self.writeFile(f"{i}.pdf", f"{i}" * 2000) for i in range(3)]
+        for path in paths:
+            textCache.getText(path, self.extract(path))
+        storedSize = textCache.getStats()["storedSize"]
+        # update the access time on every hit
+        textCache.ACCESS_RESOLUTION = 0
+        textCache.get(paths[0])
+        textCache.maxSize = storedSize
+        extra = self.writeFile("extra.pdf", "x" * 3000)
+        textCache.getText(extra, self.extract(extra))
+        self.assertIsNotNone(textCache.get(paths[0]))
+        self.assertIsNone(textCache.get(paths[1]))
+        self.assertLessEqual(textCache.getStats()["storedSize"], storedSize)
+        # the running total follows the stored texts
+        sqlDB = textCache.getSQLDB()
+        self.assertEqual(
+            textCache.getStats()["storedSize"], textCache.getTotalSize(sqlDB)
+        )
+
+    def test_access_and_prune(self):
+        """
+        test that hits do not write and that the rows of removed files are pruned
+        """
+        textCache = TextCache(os.path.join(self.cache_dir, "textcache.db"))
+        path = self.writeFile("a.pdf", "rechnung")
+        textCache.getText(path, self.extract(path))
+        sqlDB = textCache.getSQLDB()
+        query = "SELECT lastAccess FROM text_cache"
+        lastAccess = sqlDB.c.execute(query).fetchone()[0]
+        self.assertEqual("RECHNUNG", textCache.get(path))
+        self.assertEqual(lastAccess, sqlDB.c.execute(query).fetchone()[0])
+        # replacing a text keeps the running total
+        textCache.put(path, "RECHNUNG 2")
+        self.assertEqual(
+            textCache.getStats()["storedSize"], textCache.getTotalSize(sqlDB)
+        )
+        txt = self.writeFile("a.txt", "rechnung")
+        textCache.putEncoding(txt, os.stat(txt), "utf-8")
+        os.remove(path)
+        os.remove(txt)
+        with textCache.getPool().writer():
+            self.assertEqual(0, textCache.prune(sqlDB))
+            self.assertEqual(2, textCache.prune(sqlDB, force=True))
+        for table in ["text_cache_file", "text_encoding"]:
+            count = sqlDB.c.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            self.assertEqual(0, count)
+
+    def test_text_services(self):
+        """
+        test that the configured text cache and decoder are only created once per cache root
+        """
+        textCache = DMSStorage.getTextCache()
+        self.assertIs(textCache, DMSStorage.getTextCache())
+        self.assertIs(DMSStorage.getTextDecoder(), DMSStorage.getTextDecoder())
+        self.assertIs(textCache, DMSStorage.getTextDecoder().textCache)
+        other_dir = tempfile.mkdtemp(prefix="scan2wiki_cache_")
+        try:
+            DMSStorage.cacheRootDir = other_dir
+            self.assertEqual(other_dir, DMSStorage.getTextServices()[0])
+        finally:
+            DMSStorage.cacheRootDir = self.cache_dir
+            shutil.rmtree(other_dir)
+
+    def test_document_ocr_text(self):
+        """
+        test that the document text is cached centrally without writing to the archive
+        """
+        path = os.path.join(self.archive_dir, "scan.pdf")
+        pdf = fitz.open()
+        pdf.new_page().insert_text((72, 72), "Kassenbon Milch")
+        pdf.save(path)
+        pdf.close()
+        doc = Document()
+        doc.fromFile(self.archive_dir, "scan.pdf", local=True, withOcr=True)
+        self.assertIn("Kassenbon", doc.ocrText)
+        self.assertEqual(["scan.pdf"], os.listdir(self.archive_dir))
+        self.assertEqual(1, DMSStorage.getTextCache().getStats()["count"])
+        # a text file added later takes precedence over the cached PDF text
+        self.writeFile("scan.txt", "NEW SIDECAR TEXT")
+        self.assertEqual("NEW SIDECAR TEXT", doc.getOcrText())
+        self.assertEqual("NEW SIDECAR TEXT", doc.readTextHead(max_lines=1))
+        os.remove(os.path.join(self.archive_dir, "scan.txt"))
+        self.assertIn("Kassenbon", doc.getOcrText())
@@ -0,0 +1,134 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import shutil
+import tempfile
+
+from lodstorage.sql import SQLDB
+from ngwidgets.basetest import Basetest
+
+from scan.dms import DMSStorage, Document, DocumentManager
+
+
+class TestTextStore(Basetest):
+    """
+    test keeping the OCR texts in a separate compressed store
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.cache_dir = tempfile.mkdtemp(prefix="scan2wiki_cache_")
+        DMSStorage.cacheRootDir = self.cache_dir
+        self.text = "Kassenbon ALDI SÜD Rechnung Milch Brot\n" * 100
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        DMSStorage.cacheRootDir = None
+        shutil.rmtree(self.cache_dir)
+
+    def getDocument(self, index: int) -> Document:
+        doc = Document(
+            archiveName="test-scan",
+            folderPath="/scan/2021",
+            name=f"scan_{index}.pdf",
+            url=f"http://localhost/scan/2021/scan_{index}.pdf",
+            ocrText=f"{index}: {self.text}",
+        )
+        return doc
+
+    def test_lazy_text(self):
+        """
+        test that the texts are stored compressed and loaded on access
+        """
+        dm = DocumentManager(mode="sql")
+        dm.documents = [self.getDocument(index) for index in range(3)]
+        dm.store()
+        sqlDB = SQLDB(dm.getCacheFile())
+        inline = sqlDB.query(
+            "SELECT COUNT(*) AS count FROM document WHERE ocrText IS NOT NULL"
+        )
+        self.assertEqual(0, inline[0]["count"])
+        stored = sqlDB.query("SELECT size,LENGTH(data) AS length FROM document_text")
+        self.assertEqual(3, len(stored))
+        for record in stored:
+            self.assertLess(record["length"] * 10, record["size"])
+        dm = DocumentManager.getInstance()
+        doc = dm.documents[1]
+        self.assertIsNone(vars(doc)["ocrText"])
+        self.assertEqual(f"1: {self.text}", doc.ocrText)
+        self.assertIsNotNone(vars(doc)["ocrText"])
+        self.assertEqual(3, len(dm.search("rechnung", archiveName="test-scan")))
+        # only the documents of the manager load their texts
+        self.assertIsNone(Document(url=dm.documents[2].url).ocrText)
+        dm.deleteDocuments([doc.url])
+        self.assertIsNone(dm.textStore.get(doc.url))
+
+    def test_missing_text(self):
+        """
+        test that a document without a stored text keeps a None ocrText
+        """
+        dm = DocumentManager(mode="sql")
+        doc = self.getDocument(0)
+        doc.ocrText = None
+        dm.documents = [doc]
+        dm.store()
+        dm = DocumentManager.getInstance()
+        doc = dm.documents[0]
+        self.assertIsNone(doc.ocrText)
+        self.assertNotIn(id(doc), Document.ocrText.textStores)
+
+    def test_migrate_inline_texts(self):
+        """
+        test that texts stored inline by former versions are moved
+        """
+        dm = DocumentManager(mode="sql")
+        sqlDB = SQLDB(dm.getCacheFile())
+        entityInfo = dm.getEntityInfo(sqlDB)
+        sqlDB.createTable4EntityInfo(entityInfo, withCreate=True)
+        sqlDB.c.execute(
+            "INSERT INTO document(url,name,ocrText) VALUES (?,?,?)",
+            ("http://localhost/old.pdf", "old.pdf", "inline text"),
+        )
+        sqlDB.c.executemany(
+            "INSERT INTO document(url,name,ocrText) VALUES (?,?,?)",
+            [
+                (f"http://localhost/{index}.pdf", f"{index}.pdf", self.text * 10)
+                for index in range(100)
+            ],
+        )
+        sqlDB.c.commit()
+        sqlDB.close()
+        inlineSize = os.path.getsize(dm.getCacheFile())
+        self.assertEqual("inline text", dm.textStore.get("http://localhost/old.pdf"))
+        sqlDB = SQLDB(dm.getCacheFile())
+        inline = sqlDB.query("SELECT DISTINCT ocrText FROM document")
+        self.assertEqual([{"ocrText": None}], inline)
+        # the file shrinks since the compressed texts need less space
+        self.assertLess(os.path.getsize(dm.getCacheFile()) * 10, inlineSize)
+
+    def test_store_keeps_unloaded_texts(self):
+        """
+        test that storing documents whose texts have not been loaded keeps the texts
+        """
+        dm = DocumentManager(mode="sql")
+        dm.documents = [self.getDocument(index) for index in range(3)]
+        dm.store()
+        # a lazy list is read only
+        with self.assertRaises(Exception):
+            DocumentManager.getInstance(lazy=True).store()
+        dm = DocumentManager.getInstance()
+        self.assertEqual(f"0: {self.text}", dm.textStore.get(dm.documents[0].url))
+        self.assertEqual(3, len(dm.search("rechnung")))
+        # a full store of a changed list keeps the texts that are not loaded
+        dm.documents[1].name = "renamed.pdf"
+        dm.documents = dm.documents[:2]
+        dm.store(delta=False)
+        dm = DocumentManager.getInstance()
+        self.assertEqual(f"1: {self.text}", dm.documents[1].ocrText)
+        self.assertEqual("renamed.pdf", dm.documents[1].name)
+        self.assertEqual(2, len(dm.search("rechnung")))
+        self.assertIsNone(dm.textStore.get(self.getDocument(2).url))
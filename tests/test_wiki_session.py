@@ -0,0 +1,112 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from mwclient.errors import APIError, AssertUserFailedError
+from ngwidgets.basetest import Basetest
+
+from scan.wiki_session import WikiSessionCache
+
+
+class LoginCounter:
+    """
+    client factory counting the logins
+    """
+
+    def __init__(self):
+        self.logins = 0
+        self.lock = threading.Lock()
+
+    def login(self, wikiId: str):
+        with self.lock:
+            self.logins += 1
+            return f"{wikiId}-client-{self.logins}"
+
+
+class TestWikiSession(Basetest):
+    """
+    test the cache of logged in wiki sessions
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.counter = LoginCounter()
+        self.cache = WikiSessionCache(clientFactory=self.counter.login)
+
+    def test_shared_session(self):
+        """
+        test that concurrent callers share a single login per wiki
+        """
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = list(
+                executor.map(
+                    lambda i: self.cache.get(f"wiki{i % 2}").wikiClient, range(100)
+                )
+            )
+        self.assertEqual(2, self.counter.logins)
+        self.assertEqual(2, len(set(clients)))
+        self.assertEqual(50, len([c for c in clients if c.startswith("wiki0-")]))
+
+    def test_login_outside_lock(self):
+        """
+        test that a slow login does not block the sessions of other wikis
+        """
+        loggingIn = threading.Event()
+        release = threading.Event()
+
+        def login(wikiId: str):
+            if wikiId == "slow":
+                loggingIn.set()
+                release.wait(10)
+            return self.counter.login(wikiId)
+
+        self.cache.clientFactory = login
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            slow = [executor.submit(self.cache.get, "slow") for _i in range(2)]
+            self.assertTrue(loggingIn.wait(10))
+            fast = executor.submit(self.cache.get, "fast")
+            self.assertEqual("fast-client-1", fast.result(timeout=5).wikiClient)
+            release.set()
+            sessions = [future.result(timeout=10) for future in slow]
+        self.assertIs(sessions[0], sessions[1])
+        self.assertEqual(2, self.counter.logins)
+
+    def test_relogin(self):
+        """
+        test that an expired session is replaced by a fresh login
+        """
+        used = []
+
+        def action(session):
+            used.append(session.wikiClient)
+            if len(used) == 1:
+                raise AssertUserFailedError()
+            return "done"
+
+        self.assertEqual("done", self.cache.run("wiki", action))
+        self.assertEqual(["wiki-client-1", "wiki-client-2"], used)
+
+        # other errors are not retried
+        def failing_action(session):
+            raise APIError("permissiondenied", "not allowed", {})
+
+        with self.assertRaises(APIError):
+            self.cache.run("wiki", failing_action)
+        self.assertEqual(2, self.counter.logins)
+        self.assertTrue(WikiSessionCache.isExpired(APIError("badtoken", "", {})))
+
+    def test_idle_eviction(self):
+        """
+        test that idle sessions are evicted
+        """
+        self.cache.maxIdle = 60
+        session = self.cache.get("wiki")
+        self.assertIs(session, self.cache.get("wiki"))
+        session.lastUsed -= 61
+        self.assertIsNot(session, self.cache.get("wiki"))
+        self.assertEqual(2, self.counter.logins)